@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+AI Yolu Benchmark'ı - Dosya adlandırma yolunun gecikme ve verimini ölçer
+
+Varsayılan olarak süreç içinde mock_gemini_server başlatır; böylece API
+anahtarı ve ağ olmadan, tekrarlanabilir koşullarda ölçüm yapılır. --base-url
+ile çalışan başka bir sunucu (veya gerçek API için boş değer) kullanılabilir.
+Token kullanımı ve önbellek geçici bir klasöre yazılır; benchmark gerçek
+günlük bütçeyi tüketmez, sahte isimler gerçek önbelleğe karışmaz.
+
+Kullanım:
+    python ai_benchmark.py --mode async --files 200 --concurrency 8 --error-rate 0.05
+    python ai_benchmark.py --mode sync --concurrency 4 --latency uniform --latency-ms 500
+    python ai_benchmark.py --mode batch --files 100
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import concurrent.futures
+from typing import List, Tuple, Dict, Any
+
+from mock_gemini_server import start_mock_server, add_behavior_arguments, behavior_from_args
+
+MODES = ('sync', 'async', 'batch')
+
+SAMPLE_VENDORS = ('Turkcell', 'Vodafone', 'Migros', 'Enerjisa', 'İGDAŞ', 'Trendyol')
+SAMPLE_TYPES = ('Fatura', 'Rapor', 'Sözleşme', 'Sunum', 'Makbuz')
+
+
+def build_items(count: int, unique: bool) -> List[Tuple[str, str, str]]:
+    """(anahtar, içerik, dosya türü) biçiminde sentetik dosyalar üretir"""
+    items = []
+    for index in range(count):
+        variant = index if unique else index % 10
+        doc_type = SAMPLE_TYPES[variant % len(SAMPLE_TYPES)]
+        vendor = SAMPLE_VENDORS[variant % len(SAMPLE_VENDORS)]
+        content = (
+            f"{vendor} A.Ş.\n{doc_type} No: {variant:06d}\n"
+            f"Tarih: {1 + variant % 28:02d}.{1 + variant % 12:02d}.2024\n"
+            f"Toplam tutar: {100 + variant * 7},50 TL\n"
+            + "Açıklama satırı hizmet bedeli ve vergiler.\n" * 20
+        )
+        items.append((f"dosya_{index}", content, 'pdf'))
+    return items
+
+
+def percentile(samples: List[float], p: float):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+
+def run_sync(renamer, items, concurrency: int) -> Tuple[List[float], int]:
+    """generate_filename'i thread havuzuyla çağırır"""
+    def call(item):
+        _, content, file_type = item
+        started = time.perf_counter()
+        name = renamer.generate_filename(content, file_type)
+        return time.perf_counter() - started, bool(name)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, items))
+    return [latency for latency, _ in results], sum(ok for _, ok in results)
+
+
+def run_async(client, items) -> Tuple[List[float], int]:
+    """Tüm istekleri AsyncAIClient'a bir kerede gönderir, tamamlanma sürelerini ölçer"""
+    latencies = []
+    succeeded = [0]
+    lock = threading.Lock()
+    futures = []
+    for _, content, file_type in items:
+        started = time.perf_counter()
+        future = client.submit(content, file_type)
+
+        def on_done(done, started=started):
+            elapsed = time.perf_counter() - started
+            ok = not done.cancelled() and done.exception() is None and bool(done.result())
+            with lock:
+                latencies.append(elapsed)
+                succeeded[0] += ok
+
+        future.add_done_callback(on_done)
+        futures.append(future)
+    concurrent.futures.wait(futures)
+    return latencies, succeeded[0]
+
+
+def run_batch(renamer, items) -> Tuple[List[float], int]:
+    """generate_filenames_batch ile toplu istekler; gecikme tüm çağrı içindir"""
+    started = time.perf_counter()
+    names = renamer.generate_filenames_batch(items)
+    elapsed = time.perf_counter() - started
+    return [elapsed], sum(1 for name in names.values() if name)
+
+
+def format_ms(seconds) -> str:
+    return f"{seconds * 1000:.0f} ms" if seconds is not None else "-"
+
+
+def print_report(args, elapsed: float, latencies: List[float], succeeded: int, extra: Dict[str, Any]):
+    print("\n=== AI Benchmark Sonucu ===")
+    print(f"Mod: {args.mode}  Dosya: {args.files}  Eşzamanlılık: {args.concurrency}")
+    print(f"Toplam süre: {elapsed:.2f} sn  Verim: {args.files / elapsed:.1f} dosya/sn" if elapsed else "Toplam süre: -")
+    print(f"Başarılı: {succeeded}/{args.files}")
+    if args.mode != 'batch':
+        print(f"Gecikme p50: {format_ms(percentile(latencies, 50))}  "
+              f"p95: {format_ms(percentile(latencies, 95))}  "
+              f"p99: {format_ms(percentile(latencies, 99))}  "
+              f"max: {format_ms(max(latencies) if latencies else None)}")
+    for key, value in extra.items():
+        print(f"{key}: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI dosya adlandırma yolu benchmark'ı")
+    parser.add_argument('--mode', choices=MODES, default='async', help='Ölçülecek yol')
+    parser.add_argument('--files', type=int, default=100, help='Gönderilecek dosya sayısı')
+    parser.add_argument('--concurrency', type=int, default=4, help='Eşzamanlı istek sayısı')
+    parser.add_argument('--client-rpm', type=int, default=100000, help='İstemci tarafı dakikalık istek sınırı')
+    parser.add_argument('--duplicates', action='store_true', help='Aynı içerikleri tekrarla (birleştirme/önbellek etkisi)')
+    parser.add_argument('--use-cache', action='store_true', help='AI önbelleğini açık bırak')
+    parser.add_argument('--batch-window', type=float, default=0.3, help='Async modda toplu istek penceresi, sn (0: kapalı)')
+    parser.add_argument('--base-url', default=None, help='Kullanılacak sunucu (verilmezse yerel sahte sunucu başlatılır)')
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url is None:
+        server = start_mock_server(behavior=behavior_from_args(args))
+        args.base_url = server.base_url
+        print(f"Sahte Gemini sunucusu: {server.base_url}")
+
+    # Ayarlar AIFileRenamer oluşturulurken ortamdan okunur
+    os.environ['GEMINI_BASE_URL'] = args.base_url
+    os.environ.setdefault('GEMINI_API_KEY', 'mock')
+    os.environ['AI_MAX_IN_FLIGHT'] = str(args.concurrency)
+    os.environ['AI_REQUESTS_PER_MINUTE'] = str(args.client_rpm)
+    os.environ['AI_BATCH_WINDOW'] = str(args.batch_window)
+    if not args.use_cache:
+        os.environ['AI_CACHE_ENABLED'] = 'false'
+    scratch_dir = tempfile.TemporaryDirectory(prefix='ai_benchmark_')
+    os.environ['AI_USAGE_FILE'] = os.path.join(scratch_dir.name, 'ai_usage.json')
+    os.environ['AI_CACHE_FILE'] = os.path.join(scratch_dir.name, 'ai_cache.sqlite3')
+
+    from ai_renamer import AIFileRenamer, AsyncAIClient
+
+    renamer = AIFileRenamer()
+    if not renamer.is_available():
+        print("AI renamer kullanılamıyor (google-genai yüklü mü?)")
+        sys.exit(1)
+
+    items = build_items(args.files, unique=not args.duplicates)
+    extra = {}
+    client = None
+
+    started = time.perf_counter()
+    if args.mode == 'sync':
+        latencies, succeeded = run_sync(renamer, items, args.concurrency)
+    elif args.mode == 'async':
+        client = AsyncAIClient(renamer)
+        client.start()
+        started = time.perf_counter()
+        latencies, succeeded = run_async(client, items)
+    else:
+        latencies, succeeded = run_batch(renamer, items)
+    elapsed = time.perf_counter() - started
+
+    if client is not None:
+        stats = client.get_latency_stats()
+        extra['API çağrısı gecikmesi (p50/p99)'] = f"{format_ms(stats['p50'])} / {format_ms(stats['p99'])}"
+        extra['Tekrar denenen istek'] = stats['retried']
+        extra['Birleştirilen istek'] = stats['coalesced']
+        extra['Zaman aşımı / yedek istek / yedek kazandı'] = f"{stats['timed_out']} / {stats['hedged']} / {stats['hedge_wins']}"
+        client.stop()
+    extra['Devre kesici'] = renamer.breaker.get_state()
+    usage = renamer.usage.get_summary()
+    extra['Token (girdi/çıktı)'] = f"{usage['input_tokens']} / {usage['output_tokens']}"
+    if renamer.get_cache_stats():
+        extra['Önbellek'] = renamer.get_cache_stats()
+    if server is not None:
+        extra['Sunucu'] = server.behavior.get_stats()
+        server.shutdown()
+    if renamer.cache is not None:
+        renamer.cache.close()
+    scratch_dir.cleanup()
+
+    print_report(args, elapsed, latencies, succeeded, extra)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+AI Öneri Önbelleği - Aynı içerik için Gemini'ye tekrar sorulmasını önler
+
+İki katmanlıdır: bellekte LRU ve diskte SQLite. Anahtar, normalize edilmiş
+prompt kesiti + dosya türü + model adının SHA-256 özetidir; böylece tekrar
+indirilen, kopyalanan veya atlanıp tekrar gelen dosyalar API'ye gitmez.
+"""
+
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Disk temizliği her bu kadar yazmada bir çalışır
+EVICTION_INTERVAL = 100
+
+
+def make_cache_key(snippet: str, file_type: str, model: str) -> str:
+    """Kesiti normalize edip (küçük harf, tek boşluk) önbellek anahtarı üretir"""
+    normalized = ' '.join(snippet.lower().split())
+    return hashlib.sha256(f"{model}\0{file_type.lower()}\0{normalized}".encode('utf-8')).hexdigest()
+
+
+class SuggestionCache:
+    """Bellek LRU + SQLite disk deposu, TTL ve boyut sınırlı"""
+
+    def __init__(self, db_path: Path, ttl_seconds: float, max_entries: int, memory_entries: int):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.logger = logging.getLogger(__name__)
+
+        self._memory = OrderedDict()  # anahtar -> (isim, oluşturulma zamanı)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestions ("
+                "key TEXT PRIMARY KEY, name TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_suggestions_accessed ON suggestions(accessed)")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"AI önbellek veritabanı açılamadı, sadece bellek kullanılacak: {e}")
+            self._conn = None
+
+    def get(self, key: str) -> Optional[str]:
+        """Önbellekteki ismi döndürür; yoksa veya süresi dolmuşsa None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                name, created = entry
+                if now - created <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return name
+                del self._memory[key]
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT name, created FROM suggestions WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and now - row[1] <= self.ttl_seconds:
+                        self._conn.execute("UPDATE suggestions SET accessed = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, row[0], row[1])
+                        self.disk_hits += 1
+                        return row[0]
+                except sqlite3.Error as e:
+                    self.logger.error(f"AI önbellek okuma hatası: {e}")
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, name: str):
+        """İsmi iki katmana da yazar"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, name, now)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO suggestions (key, name, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, name, now, now)
+                )
+                self._conn.commit()
+                self._writes += 1
+                if self._writes % EVICTION_INTERVAL == 0:
+                    self._evict(now)
+            except sqlite3.Error as e:
+                self.logger.error(f"AI önbellek yazma hatası: {e}")
+
+    def _remember(self, key: str, name: str, created: float):
+        """Bellek katmanına ekler, LRU sınırını uygular (kilit altında çağrılır)"""
+        self._memory[key] = (name, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        """Süresi dolan kayıtları ve boyut sınırını aşan en eski erişilenleri siler"""
+        self._conn.execute("DELETE FROM suggestions WHERE created < ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM suggestions WHERE key IN ("
+            "SELECT key FROM suggestions ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    def clear(self):
+        """Tüm önbelleği temizler"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM suggestions")
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """İsabet sayaçlarını ve oranını döndürür"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            disk_entries = None
+            if self._conn is not None:
+                try:
+                    disk_entries = self._conn.execute("SELECT COUNT(*) FROM suggestions").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_entries': disk_entries
+            }
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+AI Ön Getirme - Dosya kararlı hale gelirken AI isim önerisini önceden ister
+
+Dosya izleyici yeni dosyayı görür görmez (kararlılık beklemesinden önce)
+start() çağrılır. Arka planda dosyanın ilk kısmı (ör. PDF'in ilk sayfası)
+çıkarılır ve AI isteği gönderilir; böylece kararlılık beklemesi, tam içerik
+çıkarma ve AI isteği üst üste biner. on_file_event take() ile hazır (veya
+yoldaki) sonucu alır. Dosya silinir ya da yeniden adlandırılırsa cancel()
+ile spekülatif iş iptal edilir.
+"""
+
+import time
+import logging
+import threading
+import concurrent.futures
+from pathlib import Path
+from typing import Optional, Dict
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Kısmi çıkarma başarısız olursa (dosya hâlâ yazılıyor) tekrar deneme sayısı
+EXTRACT_ATTEMPTS = 3
+
+
+class PrefetchEntry:
+    """Bir dosya için devam eden spekülatif iş"""
+
+    def __init__(self):
+        self.created = time.time()
+        self.cancelled = False
+        self.suggestion_future: Optional[concurrent.futures.Future] = None
+
+
+class SpeculativePrefetcher:
+    """Dosya başına en fazla bir spekülatif AI isteği yürütür"""
+
+    def __init__(self, content_extractor, ai_renamer):
+        self.config = Config()
+        self.content_extractor = content_extractor
+        self.ai_renamer = ai_renamer
+        self.logger = logging.getLogger(__name__)
+
+        self.enabled = self.config.AI_PREFETCH_ENABLED and self.config.AI_RENAME_ENABLED
+        self.max_chars = self.config.AI_PREFETCH_MAX_CHARS
+        # Sahipsiz kalan kayıtlar (dosya hiç işlenmediyse) bu süreden sonra atılır
+        self.entry_ttl = self.config.PENDING_FILE_TIMEOUT * 2
+
+        self._entries: Dict[str, PrefetchEntry] = {}
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.config.AI_PREFETCH_WORKERS,
+            thread_name_prefix="ai-prefetch"
+        )
+
+        self.started = 0
+        self.used = 0
+        self.cancelled = 0
+
+    def start(self, file_path: Path):
+        """Dosya için spekülatif çıkarma + AI isteğini başlatır (zaten varsa bir şey yapmaz)"""
+        if not self.enabled or not self.ai_renamer.ai_renamer.is_available():
+            return
+        if not self.content_extractor.is_supported(file_path):
+            return
+
+        key = str(file_path)
+        with self._lock:
+            self._evict_stale()
+            if key in self._entries:
+                return
+            entry = PrefetchEntry()
+            self._entries[key] = entry
+            self.started += 1
+
+        self.logger.debug(f"AI ön getirme başlatıldı: {file_path.name}")
+        self._executor.submit(self._run, file_path, entry)
+
+    def _run(self, file_path: Path, entry: PrefetchEntry):
+        """Kısmi içeriği çıkarır ve AI isteğini gönderir (ön getirme thread'inde)"""
+        try:
+            for attempt in range(EXTRACT_ATTEMPTS):
+                if entry.cancelled or not file_path.exists():
+                    return
+                result = self.content_extractor.extract_content(file_path, max_chars=self.max_chars)
+                if result['success']:
+                    break
+                # Dosya henüz tamamlanmamış olabilir (ör. PDF/zip sonu yazılmadı)
+                time.sleep(self.config.FILE_STABILITY_CHECK_INTERVAL)
+            else:
+                self.logger.debug(f"AI ön getirme için içerik çıkarılamadı: {file_path.name}")
+                return
+
+            with self._lock:
+                if entry.cancelled:
+                    return
+                entry.suggestion_future = self.ai_renamer.request_ai_name_suggestion(file_path, result['content'])
+            self.logger.debug(f"AI ön getirme isteği gönderildi: {file_path.name} ({len(result['content'])} karakter)")
+        except Exception as e:
+            self.logger.error(f"AI ön getirme hatası ({file_path.name}): {e}")
+
+    def take(self, file_path: Path) -> Optional[concurrent.futures.Future]:
+        """
+        Dosya için başlatılmış AI isteğini devralır
+
+        Returns:
+            request_ai_name_suggestion Future'ı; ön getirme yoksa veya henüz
+            istek gönderilmediyse None (çağıran normal isteği başlatır)
+        """
+        with self._lock:
+            entry = self._entries.pop(str(file_path), None)
+            if entry is None:
+                return None
+            if entry.suggestion_future is None:
+                # Çıkarma hâlâ sürüyor; tam içerikle yapılacak istek daha iyi
+                entry.cancelled = True
+                return None
+            self.used += 1
+        self.logger.info(f"Ön getirilen AI önerisi kullanılıyor: {file_path.name}")
+        return entry.suggestion_future
+
+    def cancel(self, file_path: Path):
+        """Dosya silindi veya yeniden adlandırıldı: spekülatif işi iptal eder"""
+        with self._lock:
+            entry = self._entries.pop(str(file_path), None)
+            if entry is None:
+                return
+            entry.cancelled = True
+            if entry.suggestion_future is not None:
+                entry.suggestion_future.cancel()
+            self.cancelled += 1
+        self.logger.debug(f"AI ön getirme iptal edildi: {file_path.name}")
+
+    def _evict_stale(self):
+        """Süresi geçen sahipsiz kayıtları atar (kilit altında çağrılır)"""
+        now = time.time()
+        for key in [key for key, entry in self._entries.items() if now - entry.created > self.entry_ttl]:
+            self._entries.pop(key).cancelled = True
+
+    def get_stats(self) -> Dict[str, int]:
+        """Ön getirme sayaçlarını döndürür"""
+        with self._lock:
+            return {
+                'started': self.started,
+                'used': self.used,
+                'cancelled': self.cancelled,
+                'pending': len(self._entries)
+            }
+
+    def shutdown(self):
+        """Bekleyen işleri iptal eder ve thread havuzunu kapatır"""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.cancelled = True
+            self._entries.clear()
+        self._executor.shutdown(wait=False)
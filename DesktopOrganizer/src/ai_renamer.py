@@ -4,9 +4,27 @@ AI Dosya Adlandırma Modülü - Gemini AI ile akıllı dosya adlandırma
 """
 
 import os
+import re
+import json
+import time
+import asyncio
+import hashlib
 import logging
+import threading
+import concurrent.futures
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, List
+
+from config import Config
+from snippet_selector import (
+    select_snippet, estimate_tokens, extract_keywords, split_segments,
+    DATE_RE, COMPANY_RE, DOC_TYPE_RE, WORD_RE
+)
+from ai_cache import SuggestionCache, make_cache_key
+from ai_usage import UsageTracker
+from name_index import get_name_index
+from metrics import observe_stage, count_error
+import tracing
 
 # .env dosyasını yükle
 try:
@@ -24,49 +42,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-class AIFileRenamer:
-    """Gemini AI kullanarak dosya adlandırma sınıfı"""
-    
-    def __init__(self):
-        self.api_key = os.environ.get("GEMINI_API_KEY")
-        self.model = "gemini-2.0-flash"
-        
-        if not GEMINI_AVAILABLE:
-            logger.error("google-genai paketi yüklü değil. 'pip install google-genai' ile yükleyin.")
-            self.available = False
-            return
-            
-        if not self.api_key:
-            logger.error("GEMINI_API_KEY çevre değişkeni ayarlanmamış.")
-            self.available = False
-            return
-            
-        try:
-            self.client = genai.Client(api_key=self.api_key)
-            self.available = True
-            logger.info("Gemini AI client başarıyla başlatıldı")
-        except Exception as e:
-            logger.error(f"Gemini AI client başlatma hatası: {e}")
-            self.available = False
-    
-    def generate_filename(self, content: str, file_type: str) -> Optional[str]:
-        """
-        Dosya içeriğine göre akıllı dosya adı önerir
-        
-        Args:
-            content: Dosya içeriği
-            file_type: Dosya türü (pdf, docx, vb.)
-            
-        Returns:
-            Önerilen dosya adı veya None
-        """
-        if not self.available:
-            logger.warning("AI renamer kullanılamıyor")
-            return None
-            
-        try:
-            # System instruction için prompt hazırla
-            system_prompt = """Sen bir akıllı dosya adlandırma asistanısın. Kullanıcıdan bir dosyanın içeriğini alacaksın ve bu içeriğe göre uygun, anlaşılır ve düzenli bir dosya adı önereceksin.
+# System instruction (her çağrıda yeniden oluşturulmaz)
+SYSTEM_PROMPT = """Sen bir akıllı dosya adlandırma asistanısın. Kullanıcıdan bir dosyanın içeriğini alacaksın ve bu içeriğe göre uygun, anlaşılır ve düzenli bir dosya adı önereceksin.
 
 GÖREVIN:
 - Dosya içeriğini analiz et
@@ -101,50 +78,630 @@ DOSYA TÜRLERİNE GÖRE ÖNERİLER:
 
 Sadece önerilen dosya adını yaz, başka açıklama yapma."""
 
-            # User prompt hazırla
-            user_prompt = f"""DOSYA İÇERİĞİ:
-{content[:2000]}  
+# Toplu istekler için ek talimat: tek JSON yanıtında dosya başına bir isim
+BATCH_INSTRUCTION = """
 
-DOSYA TÜRÜ: {file_type}
+TOPLU MOD:
+Birden fazla dosya "### DOSYA <id>" başlıklarıyla gelecek. Her dosya için yukarıdaki
+kurallara göre bir isim öner ve SADECE şu biçimde JSON döndür:
+[{"id": "<id>", "name": "<önerilen_isim>"}, ...]"""
 
-Yukarıdaki dosya içeriğine göre uygun bir dosya adı öner."""
+# Tekli yanıt için ayrılan çıktı tokenı (hız sınırlayıcı tahmini)
+SINGLE_OUTPUT_TOKENS = 100
 
-            # API çağrısı
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text=user_prompt)]
-                )
+# Gecikme istatistikleri için saklanan en fazla örnek
+LATENCY_SAMPLE_LIMIT = 1000
+
+# Toplu yanıtta dosya başına ayrılan çıktı tokenı ve sabit prompt payı
+BATCH_OUTPUT_TOKENS_PER_FILE = 40
+BATCH_PROMPT_OVERHEAD_TOKENS = 30
+
+# Yerel adlandırıcı: belge türü kelimesi -> isim öneki (system prompt kurallarıyla aynı)
+DOC_TYPE_PREFIXES = {
+    'fatura': 'fatura', 'e-fatura': 'fatura', 'e-arşiv': 'fatura', 'invoice': 'fatura',
+    'makbuz': 'makbuz', 'receipt': 'makbuz', 'dekont': 'dekont',
+    'rapor': 'rapor', 'report': 'rapor',
+    'sözleşme': 'sozlesme', 'contract': 'sozlesme', 'agreement': 'sozlesme',
+    'teklif': 'teklif', 'proposal': 'teklif',
+    'özgeçmiş': 'ozgecmis', 'resume': 'ozgecmis', 'cv': 'ozgecmis',
+    'sertifika': 'sertifika', 'certificate': 'sertifika', 'diploma': 'diploma',
+    'ödev': 'odev', 'assignment': 'odev',
+    'sunum': 'sunum', 'presentation': 'sunum',
+    'tutanak': 'tutanak', 'dilekçe': 'dilekce', 'poliçe': 'police', 'policy': 'police',
+    'beyanname': 'beyanname', 'bordro': 'bordro', 'ekstre': 'ekstre', 'statement': 'ekstre',
+}
+
+# Belge türü metinde geçmezse dosya türünden çıkarılan önek
+FILE_TYPE_PREFIXES = {
+    'ppt': 'sunum', 'pptx': 'sunum', 'odp': 'sunum',
+    'jpg': 'gorsel', 'jpeg': 'gorsel', 'png': 'gorsel', 'bmp': 'gorsel',
+    'tiff': 'gorsel', 'tif': 'gorsel', 'gif': 'gorsel', 'webp': 'gorsel',
+}
+
+# Tarihi konudan önemli bulunan önekler ("fatura_sirket_YYYY-MM-DD")
+VENDOR_PREFIXES = frozenset(('fatura', 'makbuz', 'dekont', 'ekstre', 'police', 'teklif'))
+
+# Şirket unvanlarındaki ayırt edici olmayan kelimeler
+GENERIC_COMPANY_WORDS = frozenset("""
+ve ticaret sanayi sanayii iletişim hizmetleri hizmet limited anonim şirketi dış pazarlama
+teknoloji teknolojileri bilişim elektronik yatırım danışmanlık turizm inşaat gıda
+""".split())
+
+MONTHS = {
+    'ocak': 1, 'şubat': 2, 'mart': 3, 'nisan': 4, 'mayıs': 5, 'haziran': 6,
+    'temmuz': 7, 'ağustos': 8, 'eylül': 9, 'ekim': 10, 'kasım': 11, 'aralık': 12,
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8,
+    'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+NUMERIC_DATE_RE = re.compile(r'(\d{1,4})[./-](\d{1,2})[./-](\d{1,4})')
+TEXT_DATE_RE = re.compile(r'(\d{1,2})?\s*([^\W\d_]+)\s+(\d{1,2})?,?\s*((?:19|20)\d{2})', re.UNICODE)
+ASCII_TABLE = str.maketrans({'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
+                             'â': 'a', 'î': 'i', 'û': 'u', '\u0307': None})
+
+
+def turkish_lower(text: str) -> str:
+    """Türkçe İ/I harflerini doğru küçülten lower()"""
+    return text.replace('İ', 'i').replace('I', 'ı').lower()
+
+
+class LocalNameGenerator:
+    """
+    API'ye gitmeden, system prompt'taki kurallarla dosya adı üreten yerel adlandırıcı.
+    
+    Belge türü, tarih ve şirket adı önceden derlenmiş regex'lerle, konu ise
+    TF-IDF anahtar kelimeleriyle bulunur; birkaç milisaniyede sonuç verir.
+    """
+    
+    def __init__(self, keyword_count: int = 2):
+        self.keyword_count = keyword_count
+    
+    def generate(self, content: str, file_type: str) -> Optional[str]:
+        """
+        İçerikten "onek_konu_YYYY-MM-DD" biçiminde ham isim üretir
+        
+        Args:
+            content: Dosya içeriği
+            file_type: Dosya türü (pdf, docx, vb.)
+            
+        Returns:
+            Temizlenmemiş isim veya hiçbir ipucu bulunamazsa None
+        """
+        if not content or not content.strip():
+            return None
+        
+        prefix = self._find_prefix(content, file_type)
+        date = self._find_date(content)
+        
+        if prefix == 'ozgecmis':
+            subject = self._find_person_name(content) or self._find_subject(content, prefix)
+            date = None
+        elif prefix in VENDOR_PREFIXES:
+            subject = self._find_vendor(content) or self._find_subject(content, prefix)
+        else:
+            subject = self._find_subject(content, prefix)
+        
+        parts = [part for part in (prefix, subject, date) if part]
+        if not parts or parts == [date]:
+            return None
+        return self._to_ascii('_'.join(parts))
+    
+    def _find_prefix(self, content: str, file_type: str) -> Optional[str]:
+        """Metindeki ilk belge türü kelimesini veya dosya türünü öneke çevirir"""
+        match = DOC_TYPE_RE.search(content)
+        if match:
+            return DOC_TYPE_PREFIXES.get(match.group(0).lower())
+        return FILE_TYPE_PREFIXES.get(file_type.lower())
+    
+    def _find_date(self, content: str) -> Optional[str]:
+        """İlk geçerli tarihi YYYY-MM-DD biçiminde döndürür"""
+        for match in DATE_RE.finditer(content):
+            date = self._normalize_date(match.group(0))
+            if date:
+                return date
+        return None
+    
+    def _normalize_date(self, text: str) -> Optional[str]:
+        numeric = NUMERIC_DATE_RE.fullmatch(text)
+        if numeric:
+            first, month, last = numeric.groups()
+            year, day = (first, last) if len(first) == 4 else (last, first)
+        else:
+            textual = TEXT_DATE_RE.fullmatch(text)
+            if not textual:
+                return None
+            day_before, month_name, day_after, year = textual.groups()
+            month = MONTHS.get(month_name.lower())
+            day = day_before or day_after
+            if month is None or day is None:
+                return None
+        year, month, day = int(year), int(month), int(day)
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return None
+        return f"{year:04d}-{month:02d}-{day:02d}"
+    
+    def _find_vendor(self, content: str) -> Optional[str]:
+        """Şirket unvanının (A.Ş., Ltd., Inc. ...) önündeki ayırt edici kelimeleri döndürür"""
+        for match in COMPANY_RE.finditer(content):
+            line_start = content.rfind('\n', 0, match.start()) + 1
+            words = content[line_start:match.start()].split()[-5:]
+            # Unvandan geriye doğru büyük harfle başlayan kelime dizisi şirket adıdır
+            name_words = []
+            for word in reversed(words):
+                if not word[:1].isupper():
+                    break
+                name_words.insert(0, word)
+            distinctive = [
+                turkish_lower(w) for w in name_words
+                if WORD_RE.fullmatch(w) and turkish_lower(w) not in GENERIC_COMPANY_WORDS
             ]
+            if distinctive:
+                return '_'.join(distinctive[:2])
+        return None
+    
+    def _find_person_name(self, content: str) -> Optional[str]:
+        """Özgeçmişin ilk satırlarındaki 2-3 kelimelik ad soyad satırını döndürür"""
+        for segment in split_segments(content[:2000])[:5]:
+            words = segment.split()
+            if 2 <= len(words) <= 3 and all(WORD_RE.fullmatch(w) and w[0].isupper() for w in words):
+                if not DOC_TYPE_RE.search(segment):
+                    return '_'.join(turkish_lower(w) for w in words)
+        return None
+    
+    def _find_subject(self, content: str, prefix: Optional[str]) -> Optional[str]:
+        """Önekle tekrar etmeyen baskın anahtar kelimeleri metindeki sırasıyla birleştirir"""
+        keywords = [
+            keyword for keyword in extract_keywords(content, self.keyword_count + 4)
+            if not DOC_TYPE_RE.fullmatch(keyword)
+            and not (prefix and self._to_ascii(keyword).startswith(prefix))
+        ][:self.keyword_count]
+        lowered = content.lower()
+        keywords.sort(key=lambda keyword: lowered.find(keyword))
+        return '_'.join(keywords) or None
+    
+    def _to_ascii(self, text: str) -> str:
+        return turkish_lower(text).translate(ASCII_TABLE)
+
+
+class CircuitBreaker:
+    """
+    Art arda hatalarda AI isteklerini bir süre durduran devre kesici.
+    
+    closed: istekler serbest; failure_threshold art arda hatada open olur.
+    open: cooldown boyunca istek yapılmaz (çağıran yerel isme düşer).
+    half_open: cooldown sonrası tek deneme isteğine izin verilir; başarılıysa
+    closed, başarısızsa tekrar open olur. Senkron ve async yollar ortak kullanır.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """İstek yapılabilir mi; open iken False döner"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("AI devre kesici yarı açık: deneme isteğine izin veriliyor")
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+    
+    def release_probe(self):
+        """Sonucu kaydedilmeden biten isteğin (ör. iptal) deneme hakkını geri verir"""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("AI devre kesici kapandı: istekler tekrar başarılı")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    logger.warning(
+                        f"AI devre kesici açıldı ({self.consecutive_failures} art arda hata), "
+                        f"{self.cooldown:.0f} sn boyunca AI isteği yapılmayacak"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Devre kesici durumunu döndürür"""
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'retry_in': retry_in
+            }
+
+
+class AIFileRenamer:
+    """Gemini AI kullanarak dosya adlandırma sınıfı"""
+    
+    def __init__(self):
+        self.config = Config()
+        self.api_key = os.environ.get("GEMINI_API_KEY")
+        self.model = "gemini-2.0-flash"
+        self.prompt_token_budget = self.config.AI_PROMPT_TOKEN_BUDGET
+        self.batch_token_budget = self.config.AI_BATCH_TOKEN_BUDGET
+        self.batch_max_files = self.config.AI_BATCH_MAX_FILES
+        self.local_generator = LocalNameGenerator()
+        self.request_timeout = self.config.AI_REQUEST_TIMEOUT
+        self.breaker = CircuitBreaker(self.config.AI_BREAKER_FAILURE_THRESHOLD, self.config.AI_BREAKER_COOLDOWN)
+        self.usage = UsageTracker(self.config.AI_USAGE_FILE, self.config.AI_DAILY_TOKEN_BUDGET)
+        self.system_prompt_tokens = estimate_tokens(SYSTEM_PROMPT)
+        
+        # Aynı içerik için önceki önerileri tekrar kullan
+        self.cache = None
+        if self.config.AI_CACHE_ENABLED:
+            self.cache = SuggestionCache(
+                self.config.AI_CACHE_FILE,
+                ttl_seconds=self.config.AI_CACHE_TTL_DAYS * 86400,
+                max_entries=self.config.AI_CACHE_MAX_ENTRIES,
+                memory_entries=self.config.AI_CACHE_MEMORY_ENTRIES
+            )
+        
+        if not GEMINI_AVAILABLE:
+            logger.error("google-genai paketi yüklü değil. 'pip install google-genai' ile yükleyin.")
+            self.available = False
+            return
+            
+        if not self.api_key:
+            logger.error("GEMINI_API_KEY çevre değişkeni ayarlanmamış.")
+            self.available = False
+            return
             
-            generate_content_config = types.GenerateContentConfig(
+        try:
+            # Her isteğe süre sınırı (ms); yerel test/benchmark sunucusu varsa ona yönlendir
+            http_options = {'timeout': int(self.request_timeout * 1000)}
+            if self.config.GEMINI_BASE_URL:
+                http_options['base_url'] = self.config.GEMINI_BASE_URL
+                logger.info(f"Gemini istekleri {self.config.GEMINI_BASE_URL} adresine yönlendiriliyor")
+            self.client = genai.Client(api_key=self.api_key, http_options=types.HttpOptions(**http_options))
+            self.generate_config = types.GenerateContentConfig(
                 response_mime_type="text/plain",
-                system_instruction=[types.Part.from_text(text=system_prompt)],
+                system_instruction=[types.Part.from_text(text=SYSTEM_PROMPT)],
                 temperature=0.3,  # Daha tutarlı sonuçlar için düşük temperature
                 max_output_tokens=100  # Kısa cevap için limit
             )
-            
-            # Stream yerine tek seferde al
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=contents,
-                config=generate_content_config
+            self.batch_system_instruction = [types.Part.from_text(text=SYSTEM_PROMPT + BATCH_INSTRUCTION)]
+            self.batch_response_schema = types.Schema(
+                type=types.Type.ARRAY,
+                items=types.Schema(
+                    type=types.Type.OBJECT,
+                    properties={
+                        'id': types.Schema(type=types.Type.STRING),
+                        'name': types.Schema(type=types.Type.STRING),
+                    },
+                    required=['id', 'name']
+                )
             )
+            self.available = True
+            logger.info("Gemini AI client başarıyla başlatıldı")
+        except Exception as e:
+            logger.error(f"Gemini AI client başlatma hatası: {e}")
+            self.available = False
+    
+    def generate_filename(self, content: str, file_type: str) -> Optional[str]:
+        """
+        Dosya içeriğine göre akıllı dosya adı önerir
+        
+        Args:
+            content: Dosya içeriği
+            file_type: Dosya türü (pdf, docx, vb.)
             
-            if response.text:
-                suggested_name = response.text.strip()
-                # Temizle ve doğrula
-                suggested_name = self._clean_filename(suggested_name)
-                logger.info(f"AI önerisi: {suggested_name}")
-                return suggested_name
-            else:
-                logger.warning("AI'dan boş cevap geldi")
+        Returns:
+            Önerilen dosya adı veya None
+        """
+        if not self.available:
+            logger.warning("AI renamer kullanılamıyor")
+            return None
+            
+        try:
+            # İçeriğin en bilgilendirici kısmını token bütçesine sığdır
+            snippet = select_snippet(content, self.prompt_token_budget)
+            
+            cached_name = self.get_cached_name(snippet, file_type)
+            if cached_name:
+                return cached_name
+            
+            if self.usage.is_budget_exhausted():
+                return None
+            if not self.breaker.allow_request():
+                logger.info("AI devre kesici açık, istek yapılmadı")
                 return None
+            
+            # Stream yerine tek seferde al
+            started = time.perf_counter()
+            try:
+                with tracing.span('ai_call', file_type=file_type, model=self.model, mode='sync'):
+                    response = self.client.models.generate_content(
+                        model=self.model,
+                        contents=self.build_contents(snippet, file_type),
+                        config=self.generate_config
+                    )
+            except Exception:
+                self.breaker.record_failure()
+                self.usage.record(file_type, 0, 0, time.perf_counter() - started, success=False)
+                count_error('ai_call')
+                raise
+            except BaseException:
+                self.breaker.release_probe()  # Ör. KeyboardInterrupt: ne başarı ne hata
+                raise
+            self.breaker.record_success()
+            self.record_usage(file_type, snippet, response, time.perf_counter() - started)
+            observe_stage('ai_call', time.perf_counter() - started, file_type)
+            
+            suggested_name = self.parse_response(response)
+            self.store_cached_name(snippet, file_type, suggested_name)
+            return suggested_name
                 
         except Exception as e:
             logger.error(f"AI dosya adı üretme hatası: {e}")
             return None
     
+    def generate_local_filename(self, content: str, file_type: str) -> Optional[str]:
+        """
+        API kullanmadan yerel kurallarla dosya adı önerir (AI yoksa veya yavaşsa)
+        
+        Returns:
+            Temizlenmiş dosya adı veya None
+        """
+        try:
+            suggested_name = self.local_generator.generate(content, file_type)
+        except Exception as e:
+            logger.error(f"Yerel dosya adı üretme hatası: {e}")
+            return None
+        if not suggested_name:
+            return None
+        suggested_name = self._clean_filename(suggested_name)
+        logger.info(f"Yerel isim önerisi: {suggested_name}")
+        return suggested_name or None
+    
+    def estimate_input_tokens(self, snippet: str) -> int:
+        """Tekli istek için yaklaşık girdi tokenı (system prompt dahil)"""
+        return estimate_tokens(snippet) + self.system_prompt_tokens + BATCH_PROMPT_OVERHEAD_TOKENS
+    
+    def record_usage(self, file_type: str, snippet: str, response, latency: float):
+        """Tekli isteğin token ve gecikmesini kaydeder"""
+        self.usage.record_response(
+            file_type, response, latency,
+            estimated_input=self.estimate_input_tokens(snippet),
+            estimated_output=estimate_tokens(getattr(response, 'text', None) or '')
+        )
+    
+    def get_cached_name(self, snippet: str, file_type: str) -> Optional[str]:
+        """Aynı kesit, dosya türü ve model için önbellekteki öneriyi döndürür"""
+        if self.cache is None:
+            return None
+        cached_name = self.cache.get(make_cache_key(snippet, file_type, self.model))
+        if cached_name:
+            logger.info(f"AI önerisi önbellekten: {cached_name}")
+        return cached_name
+    
+    def store_cached_name(self, snippet: str, file_type: str, suggested_name: Optional[str]):
+        """Başarılı öneriyi önbelleğe yazar (boş sonuçlar saklanmaz)"""
+        if self.cache is not None and suggested_name:
+            self.cache.put(make_cache_key(snippet, file_type, self.model), suggested_name)
+    
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Önbellek isabet sayaçlarını döndürür (önbellek kapalıysa None)"""
+        return self.cache.get_stats() if self.cache is not None else None
+    
+    def build_contents(self, snippet: str, file_type: str) -> list:
+        """Tekli istek için kullanıcı mesajını hazırlar"""
+        user_prompt = f"""DOSYA İÇERİĞİ:
+{snippet}
+
+DOSYA TÜRÜ: {file_type}
+
+Yukarıdaki dosya içeriğine göre uygun bir dosya adı öner."""
+        
+        return [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=user_prompt)]
+            )
+        ]
+    
+    def parse_response(self, response) -> Optional[str]:
+        """API yanıtından temizlenmiş dosya adını çıkarır"""
+        if response.text:
+            suggested_name = response.text.strip()
+            # Temizle ve doğrula
+            suggested_name = self._clean_filename(suggested_name)
+            logger.info(f"AI önerisi: {suggested_name}")
+            return suggested_name
+        else:
+            logger.warning("AI'dan boş cevap geldi")
+            return None
+    
+    def generate_filenames_batch(self, items: List[Tuple[str, str, str]]) -> Dict[str, Optional[str]]:
+        """
+        Birden fazla dosya için isimleri toplu isteklerle üretir.
+        
+        Dosyalar token bütçesine (AI_BATCH_TOKEN_BUDGET) ve dosya sayısı sınırına
+        (AI_BATCH_MAX_FILES) göre gruplara ayrılır; her grup tek bir yapılandırılmış
+        istekle gönderilir. Yanıtta bulunmayan veya geçersiz olan dosyalar tekli
+        isteklerle tekrar denenir; kota aşımı veya aşırı yük (429/503) durumunda
+        tekli isteklere dönülmez, kalan dosyalar None kalır.
+        
+        Args:
+            items: (anahtar, içerik, dosya türü) listesi
+            
+        Returns:
+            {anahtar: önerilen dosya adı veya None}
+        """
+        results = {key: None for key, _, _ in items}
+        if not self.available:
+            logger.warning("AI renamer kullanılamıyor")
+            return results
+        
+        # Kesitleri bir kez seç, token maliyetini hesapla
+        prepared = []
+        for key, content, file_type in items:
+            snippet = select_snippet(content, self.prompt_token_budget)
+            cached_name = self.get_cached_name(snippet, file_type)
+            if cached_name:
+                results[key] = cached_name
+                continue
+            prepared.append((key, snippet, file_type, estimate_tokens(snippet) + BATCH_PROMPT_OVERHEAD_TOKENS))
+        
+        failed = []
+        for batch in self._plan_batches(prepared):
+            if len(batch) == 1:
+                # Tek dosyalık grupta toplu biçime gerek yok
+                failed.append(batch[0])
+                continue
+            names = self._request_batch(batch)
+            if names is None:
+                # Sunucu yüklüyken aynı dosyaları tek tek göndermek yükü katlar
+                logger.warning("AI kotası/aşırı yük: kalan dosyalar için istek yapılmayacak")
+                return results
+            for key, snippet, file_type, _ in batch:
+                if names.get(key):
+                    results[key] = names[key]
+                    self.store_cached_name(snippet, file_type, names[key])
+                else:
+                    failed.append((key, snippet, file_type, 0))
+        
+        # Toplu yanıtta eksik kalanlar için tekli istek
+        if failed:
+            logger.info(f"{len(failed)} dosya için tekli AI isteğine dönülüyor")
+        for key, snippet, file_type, _ in failed:
+            results[key] = self.generate_filename(snippet, file_type)
+        
+        return results
+    
+    def _plan_batches(self, prepared: List[Tuple[str, str, str, int]]) -> List[List[Tuple[str, str, str, int]]]:
+        """Dosyaları girdi token bütçesine ve dosya sayısı sınırına göre gruplar"""
+        batches = []
+        current = []
+        current_tokens = 0
+        for item in prepared:
+            cost = item[3]
+            if current and (current_tokens + cost > self.batch_token_budget or len(current) >= self.batch_max_files):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(item)
+            current_tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _request_batch(self, batch: List[Tuple[str, str, str, int]]) -> Optional[Dict[str, str]]:
+        """
+        Bir grup dosyayı tek istekte gönderir ve yanıtı dosya başına isimlere ayırır.
+        
+        Returns:
+            {anahtar: temizlenmiş isim}; hata durumunda boş sözlük,
+            kota aşımı veya aşırı yükte (429/503) None (tekli isteğe dönülmemeli)
+        """
+        # Yanıttaki kimlikler kısa sıra numaralarıdır, anahtarlara geri eşlenir
+        id_to_key = {str(index): item[0] for index, item in enumerate(batch, start=1)}
+        sections = [
+            f"### DOSYA {index}\nDOSYA TÜRÜ: {file_type}\nDOSYA İÇERİĞİ:\n{snippet}"
+            for index, (_, snippet, file_type, _) in enumerate(batch, start=1)
+        ]
+        user_prompt = '\n\n'.join(sections) + "\n\nHer dosya için uygun bir dosya adı öner."
+        
+        if self.usage.is_budget_exhausted():
+            return {}
+        if not self.breaker.allow_request():
+            logger.info("AI devre kesici açık, toplu istek yapılmadı")
+            return {}
+        
+        started = time.perf_counter()
+        try:
+            batch_config = types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=self.batch_response_schema,
+                system_instruction=self.batch_system_instruction,
+                temperature=0.3,
+                max_output_tokens=BATCH_OUTPUT_TOKENS_PER_FILE * len(batch) + 20
+            )
+            with tracing.span('ai_call', files=len(batch), model=self.model, mode='batch'):
+                response = self.client.models.generate_content(
+                    model=self.model,
+                    contents=[types.Content(role="user", parts=[types.Part.from_text(text=user_prompt)])],
+                    config=batch_config
+                )
+        except Exception as e:
+            self.breaker.record_failure()
+            self.usage.record('toplu', 0, 0, time.perf_counter() - started, success=False)
+            count_error('ai_call')
+            logger.error(f"Toplu AI isteği hatası ({len(batch)} dosya): {e}")
+            return None if getattr(e, 'code', None) in (429, 503) else {}
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        
+        # Toplu isteğin tokenları dosyalara girdi maliyetleri oranında paylaştırılır
+        latency = time.perf_counter() - started
+        observe_stage('ai_call', latency, 'toplu')
+        total_cost = sum(item[3] for item in batch) or 1
+        estimated_input = total_cost + self.system_prompt_tokens
+        estimated_output = estimate_tokens(response.text or '')
+        for _, _, file_type, cost in batch:
+            self.usage.record_response(file_type, response, latency, estimated_input, estimated_output,
+                                       share=cost / total_cost)
+        
+        try:
+            entries = json.loads(response.text or '[]')
+        except ValueError as e:
+            logger.error(f"Toplu AI yanıtı çözümlenemedi ({len(batch)} dosya): {e}")
+            return {}
+        
+        names = {}
+        if not isinstance(entries, list):
+            logger.warning("Toplu AI yanıtı beklenen biçimde değil")
+            return names
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            key = id_to_key.get(str(entry.get('id', '')).strip())
+            name = self._clean_filename(str(entry.get('name') or ''))
+            if key is not None and name:
+                names[key] = name
+        logger.info(f"Toplu AI önerisi: {len(names)}/{len(batch)} dosya adlandırıldı")
+        return names
+    
     def _clean_filename(self, filename: str) -> str:
         """
         Dosya adını temizler ve güvenli hale getirir
@@ -184,11 +741,428 @@ Yukarıdaki dosya içeriğine göre uygun bir dosya adı öner."""
         return self.available
 
 
+class TokenBucket:
+    """
+    İstek/dakika ve token/dakika sınırlarını birlikte uygulayan token kovası.
+    
+    Kovalar sürekli dolar; acquire() yeterli kapasite birikene kadar bekler.
+    Sadece AsyncAIClient'ın olay döngüsü içinden kullanılır.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.request_capacity = float(requests_per_minute)
+        self.token_capacity = float(tokens_per_minute)
+        self.request_level = self.request_capacity
+        self.token_level = self.token_capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.request_level = min(self.request_capacity, self.request_level + elapsed * self.request_rate)
+        self.token_level = min(self.token_capacity, self.token_level + elapsed * self.token_rate)
+    
+    async def acquire(self, tokens: int):
+        """Bir istek ve verilen kadar token için kapasite ayırır"""
+        tokens = min(tokens, self.token_capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.request_level >= 1 and self.token_level >= tokens:
+                    self.request_level -= 1
+                    self.token_level -= tokens
+                    return
+                wait_for_request = (1 - self.request_level) / self.request_rate if self.request_level < 1 else 0
+                wait_for_tokens = (tokens - self.token_level) / self.token_rate if self.token_level < tokens else 0
+                await asyncio.sleep(max(wait_for_request, wait_for_tokens, 0.01))
+
+
+class _InflightRequest:
+    """Devam eden istek ve onu bekleyenlerin sayısı"""
+    
+    __slots__ = ('task', 'waiters')
+    
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncAIClient:
+    """
+    AIFileRenamer için asyncio tabanlı, eşzamanlılık sınırlı istemci.
+    
+    Kendi olay döngüsünü arka plan thread'inde çalıştırır; senkron kod submit()
+    ile istek gönderip concurrent.futures.Future alır ve sonucu sadece ihtiyaç
+    duyduğunda bekler. Aynı içerik için eşzamanlı istekler tek API çağrısında
+    birleştirilir; kısa bir pencere (AI_BATCH_WINDOW) içinde gelen farklı
+    dosyalar ise tek toplu istekle gönderilir (ör. aynı anda gelen 50 fatura).
+    """
+    
+    def __init__(self, renamer: AIFileRenamer):
+        self.renamer = renamer
+        self.config = renamer.config
+        self.max_in_flight = self.config.AI_MAX_IN_FLIGHT
+        self.max_retries = self.config.AI_MAX_RETRIES
+        self.hedge_enabled = self.config.AI_HEDGE_ENABLED
+        self.hedge_delay = self.config.AI_HEDGE_DELAY
+        self.batch_window = self.config.AI_BATCH_WINDOW
+        self.logger = logging.getLogger(__name__)
+        
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._semaphore = None
+        self._bucket = None
+        self._inflight = {}  # içerik anahtarı -> _InflightRequest (birleştirme için)
+        self._batch_pending = {}  # içerik anahtarı -> (kesit, dosya türü, asyncio.Future)
+        self._batch_timer = None
+        self._latencies = []
+        self._stats_lock = threading.Lock()
+        self.coalesced_requests = 0
+        self.retried_requests = 0
+        self.timed_out_requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.batched_requests = 0
+    
+    def start(self):
+        """Olay döngüsü thread'ini (bir kez) başlatır"""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            
+            def run():
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_in_flight)
+                self._bucket = TokenBucket(self.config.AI_REQUESTS_PER_MINUTE, self.config.AI_TOKENS_PER_MINUTE)
+                ready.set()
+                loop.run_forever()
+            
+            self._thread = threading.Thread(target=run, name="ai-async-client", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            self.logger.info(f"Async AI istemcisi başlatıldı (en fazla {self.max_in_flight} eşzamanlı istek)")
+    
+    def stop(self):
+        """Olay döngüsünü durdurur"""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+    
+    def submit(self, content: str, file_type: str) -> concurrent.futures.Future:
+        """
+        Senkron koddan isim isteği gönderir
+        
+        Returns:
+            Sonucu (önerilen isim veya None) taşıyan Future
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self.generate_filename(content, file_type), self._loop)
+    
+    async def generate_filename(self, content: str, file_type: str) -> Optional[str]:
+        """
+        Dosya içeriğine göre isim önerir (asenkron)
+        
+        Aynı kesit ve dosya türü için devam eden bir istek varsa onun sonucu beklenir.
+        """
+        if not self.renamer.is_available():
+            return None
+        
+        snippet = select_snippet(content, self.renamer.prompt_token_budget)
+        cached_name = self.renamer.get_cached_name(snippet, file_type)
+        if cached_name:
+            return cached_name
+        key = hashlib.sha256(f"{file_type}\0{snippet}".encode('utf-8')).hexdigest()
+        
+        entry = self._inflight.get(key)
+        if entry is not None:
+            self.coalesced_requests += 1
+            self.logger.debug("Aynı içerik için devam eden AI isteğine bağlanıldı")
+        else:
+            entry = _InflightRequest(asyncio.ensure_future(self._queue_request(key, snippet, file_type)))
+            self._inflight[key] = entry
+            entry.task.add_done_callback(lambda _: self._inflight.get(key) is entry and self._inflight.pop(key))
+        
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        finally:
+            entry.waiters -= 1
+            # Son bekleyen de vazgeçtiyse (ör. dosya silindi) ücretli çağrı yapılmasın
+            if entry.waiters == 0 and not entry.task.done():
+                entry.task.cancel()
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+    
+    async def _queue_request(self, key: str, snippet: str, file_type: str) -> Optional[str]:
+        """İsteği toplu istekte birleştirilmek üzere pencere sonuna kadar sıraya alır"""
+        if self.batch_window <= 0 or self.renamer.batch_max_files < 2:
+            return await self._request(snippet, file_type)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch_pending[key] = (snippet, file_type, future)
+        if len(self._batch_pending) >= self.renamer.batch_max_files:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(self.batch_window, self._flush_batch)
+        try:
+            return await future
+        finally:
+            # Pencere dolmadan iptal edildiyse sıradan çıkar
+            pending = self._batch_pending.get(key)
+            if pending is not None and pending[2] is future:
+                del self._batch_pending[key]
+    
+    def _flush_batch(self):
+        """Sıradaki istekleri gönderir: tek istek normal yoldan, birden fazlası toplu"""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        items = list(self._batch_pending.items())
+        self._batch_pending.clear()
+        if not items:
+            return
+        
+        if len(items) == 1:
+            _, (snippet, file_type, future) = items[0]
+            self._forward_request(snippet, file_type, future)
+            return
+        asyncio.ensure_future(self._request_batch(items))
+    
+    def _forward_request(self, snippet: str, file_type: str, future: asyncio.Future):
+        """Dosyayı normal (tekli) yoldan ister, sonucu bekleyen Future'a aktarır"""
+        task = asyncio.ensure_future(self._request(snippet, file_type))
+        task.add_done_callback(lambda done: _copy_outcome(done, future))
+        # Bekleyen kalmadıysa API çağrısı da iptal edilir
+        future.add_done_callback(lambda done: done.cancelled() and task.cancel())
+    
+    async def _request_batch(self, items: List[Tuple[str, Tuple[str, str, asyncio.Future]]]):
+        """
+        Pencerede biriken dosyaları toplu isteklerle (ayrı thread'de) adlandırır.
+        
+        Her alt grup hız sınırından ayrı geçer; yanıtta eksik kalanlar tekli yola
+        (_request: hız sınırı, geri çekilme) devredilir. 429/503 durumunda kimse
+        tekrar denenmez.
+        """
+        futures = {key: future for key, (_, _, future) in items}
+        prepared = [
+            (key, snippet, file_type, estimate_tokens(snippet) + BATCH_PROMPT_OVERHEAD_TOKENS)
+            for key, (snippet, file_type, _) in items
+        ]
+        fallback = []
+        try:
+            for batch in self.renamer._plan_batches(prepared):
+                # Pencere içinde vazgeçilen dosyalar gönderilmez
+                batch = [item for item in batch if not futures[item[0]].done()]
+                if len(batch) < 2:
+                    fallback.extend(batch)
+                    continue
+                self.batched_requests += 1
+                self.logger.info(f"{len(batch)} dosya için toplu AI isteği gönderiliyor")
+                estimated_tokens = self.renamer.system_prompt_tokens + sum(
+                    cost + BATCH_OUTPUT_TOKENS_PER_FILE for _, _, _, cost in batch
+                )
+                with tracing.span('ai_rate_limit', tokens=estimated_tokens):
+                    await self._bucket.acquire(estimated_tokens)
+                async with self._semaphore:
+                    names = await asyncio.get_running_loop().run_in_executor(
+                        None, self.renamer._request_batch, batch
+                    )
+                if names is None:
+                    self.logger.warning("AI kotası/aşırı yük: toplu istekteki dosyalar tekrar denenmeyecek")
+                    fallback = []
+                    break
+                for key, snippet, file_type, _ in batch:
+                    if names.get(key):
+                        self.renamer.store_cached_name(snippet, file_type, names[key])
+                        if not futures[key].done():
+                            futures[key].set_result(names[key])
+                    else:
+                        fallback.append((key, snippet, file_type, 0))
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            self.logger.error(f"Toplu AI isteği hatası ({len(items)} dosya): {e!r}")
+        
+        forwarded = set()
+        for key, snippet, file_type, _ in fallback:
+            if not futures[key].done():
+                self._forward_request(snippet, file_type, futures[key])
+                forwarded.add(key)
+        for key, future in futures.items():
+            if key not in forwarded and not future.done():
+                future.set_result(None)
+    
+    async def _request(self, snippet: str, file_type: str) -> Optional[str]:
+        """Hız sınırı, eşzamanlılık sınırı, süre sınırı ve devre kesici altında isim ister"""
+        estimated_tokens = self.renamer.estimate_input_tokens(snippet) + SINGLE_OUTPUT_TOKENS
+        breaker = self.renamer.breaker
+        
+        for attempt in range(self.max_retries + 1):
+            if self.renamer.usage.is_budget_exhausted():
+                return None
+            if not breaker.allow_request():
+                self.logger.info("AI devre kesici açık, istek yapılmadı")
+                return None
+            try:
+                if self.hedge_enabled:
+                    response = await self._hedged_call(snippet, file_type, estimated_tokens)
+                else:
+                    response = await self._call_once(snippet, file_type, estimated_tokens)
+            except Exception as e:
+                breaker.record_failure()
+                # Kota aşımı (429), geçici sunucu hatası veya zaman aşımı: üstel geri çekilme ile tekrar dene
+                code = 'timeout' if isinstance(e, asyncio.TimeoutError) else getattr(e, 'code', None)
+                if code in (429, 500, 503, 'timeout') and attempt < self.max_retries:
+                    self.retried_requests += 1
+                    delay = 2 ** attempt
+                    self.logger.warning(f"AI isteği başarısız ({code}), {delay} sn sonra tekrar denenecek")
+                    await asyncio.sleep(delay)
+                    continue
+                self.logger.error(f"Async AI dosya adı üretme hatası: {e!r}")
+                return None
+            except BaseException:
+                # İptal (ör. ön getirme vazgeçildi): yarı açık deneme hakkı kilitli kalmasın
+                breaker.release_probe()
+                raise
+            breaker.record_success()
+            suggested_name = self.renamer.parse_response(response)
+            self.renamer.store_cached_name(snippet, file_type, suggested_name)
+            return suggested_name
+        return None
+    
+    async def _call_once(self, snippet: str, file_type: str, estimated_tokens: int):
+        """Tek API çağrısı; request_timeout içinde yanıt gelmezse asyncio.TimeoutError"""
+        with tracing.span('ai_rate_limit', tokens=estimated_tokens):
+            await self._bucket.acquire(estimated_tokens)
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                with tracing.span('ai_call', file_type=file_type, model=self.renamer.model, mode='async'):
+                    response = await asyncio.wait_for(
+                        self.renamer.client.aio.models.generate_content(
+                            model=self.renamer.model,
+                            contents=self.renamer.build_contents(snippet, file_type),
+                            config=self.renamer.generate_config
+                        ),
+                        timeout=self.renamer.request_timeout
+                    )
+            except asyncio.CancelledError:
+                # Yedekli çağrıda kaybeden istek; sonucu bilinmediği için sayılmaz
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timed_out_requests += 1
+                self.renamer.usage.record(file_type, 0, 0, time.perf_counter() - started, success=False)
+                count_error('ai_call')
+                raise
+            finally:
+                self._record_latency(time.perf_counter() - started)
+            self.renamer.record_usage(file_type, snippet, response, time.perf_counter() - started)
+            observe_stage('ai_call', time.perf_counter() - started, file_type)
+            return response
+    
+    async def _hedged_call(self, snippet: str, file_type: str, estimated_tokens: int):
+        """
+        Kuyruk gecikmesini kırpmak için yedekli çağrı: ilk istek hedge gecikmesi
+        içinde dönmezse aynı istek bir kez daha gönderilir, önce başarılı olan alınır.
+        """
+        primary = asyncio.ensure_future(self._call_once(snippet, file_type, estimated_tokens))
+        done, _ = await asyncio.wait({primary}, timeout=self._hedge_delay())
+        if done:
+            return primary.result()
+        
+        self.hedged_requests += 1
+        self.logger.debug("AI isteği gecikti, yedek istek gönderiliyor")
+        hedge = asyncio.ensure_future(self._call_once(snippet, file_type, estimated_tokens))
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _hedge_delay(self) -> float:
+        """Yeterli ölçüm varsa p95 gecikme, yoksa AI_HEDGE_DELAY"""
+        with self._stats_lock:
+            samples = sorted(self._latencies)
+        if len(samples) >= 20:
+            return samples[int(0.95 * (len(samples) - 1))]
+        return self.hedge_delay
+    
+    def _record_latency(self, seconds: float):
+        with self._stats_lock:
+            self._latencies.append(seconds)
+            if len(self._latencies) > LATENCY_SAMPLE_LIMIT:
+                del self._latencies[:len(self._latencies) - LATENCY_SAMPLE_LIMIT]
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Son isteklerin gecikme yüzdeliklerini (saniye) döndürür"""
+        with self._stats_lock:
+            samples = sorted(self._latencies)
+        
+        def percentile(p):
+            if not samples:
+                return None
+            return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+        
+        return {
+            'count': len(samples),
+            'p50': percentile(50),
+            'p95': percentile(95),
+            'p99': percentile(99),
+            'max': samples[-1] if samples else None,
+            'coalesced': self.coalesced_requests,
+            'retried': self.retried_requests,
+            'timed_out': self.timed_out_requests,
+            'hedged': self.hedged_requests,
+            'hedge_wins': self.hedge_wins,
+            'batched': self.batched_requests,
+            'in_flight': len(self._inflight)
+        }
+
+
+def _copy_outcome(task: asyncio.Future, future: asyncio.Future):
+    """Biten görevin sonucunu (veya hatasını) bekleyen Future'a aktarır"""
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
 class SmartFileRenamer:
     """Dosya yeniden adlandırma işlemlerini yöneten sınıf"""
     
     def __init__(self):
         self.ai_renamer = AIFileRenamer()
+        self.async_client = AsyncAIClient(self.ai_renamer)
+        self.name_index = get_name_index()
         self.logger = logging.getLogger(__name__)
     
     def rename_file_with_ai(self, file_path: Path, content: str, file_type: str) -> Tuple[bool, Path]:
@@ -215,20 +1189,11 @@ class SmartFileRenamer:
                 self.logger.warning("AI'dan dosya adı önerisi alınamadı")
                 return False, file_path
             
-            # Yeni dosya yolunu oluştur
+            # Yeni dosya adını oluştur
             new_filename = suggested_name + file_path.suffix
-            new_file_path = file_path.parent / new_filename
-            
-            # Eğer aynı isimde dosya varsa numaralandır
-            counter = 1
-            while new_file_path.exists() and new_file_path != file_path:
-                base_name = suggested_name
-                new_filename = f"{base_name}_{counter}{file_path.suffix}"
-                new_file_path = file_path.parent / new_filename
-                counter += 1
             
             # Dosyayı yeniden adlandır
-            if new_file_path != file_path:
+            if new_filename != file_path.name:
                 # Dosyanın hala var olup olmadığını kontrol et
                 if not file_path.exists():
                     self.logger.warning(f"Dosya bulunamadı: {file_path}")
@@ -238,8 +1203,9 @@ class SmartFileRenamer:
                 max_attempts = 3
                 for attempt in range(max_attempts):
                     try:
-                        file_path.rename(new_file_path)
-                        self.logger.info(f"Dosya AI ile yeniden adlandırıldı: {file_path.name} -> {new_filename}")
+                        # Aynı isimde dosya varsa indeksten sıradaki numara alınır, üzerine yazılmaz
+                        new_file_path = self.name_index.rename(file_path, new_filename)
+                        self.logger.info(f"Dosya AI ile yeniden adlandırıldı: {file_path.name} -> {new_file_path.name}")
                         return True, new_file_path
                     except (FileExistsError, PermissionError, FileNotFoundError) as e:
                         if attempt < max_attempts - 1:
@@ -262,27 +1228,57 @@ class SmartFileRenamer:
         return {
             'available': self.ai_renamer.is_available(),
             'api_key_set': bool(os.environ.get("GEMINI_API_KEY")),
-            'gemini_installed': GEMINI_AVAILABLE
+            'gemini_installed': GEMINI_AVAILABLE,
+            'latency': self.async_client.get_latency_stats(),
+            'cache': self.ai_renamer.get_cache_stats(),
+            'circuit_breaker': self.ai_renamer.breaker.get_state(),
+            'usage': self.ai_renamer.usage.get_summary()
+        }
+    
+    def shutdown(self):
+        """Async istemciyi durdurur ve kullanım verisini diske yazar"""
+        self.async_client.stop()
+        self.ai_renamer.usage.save()
+    
+    def get_local_name_suggestion(self, file_path: Path, content: str) -> Dict[str, Any]:
+        """
+        API'ye gitmeden yerel kurallarla isim önerisi al (birkaç milisaniye)
+        
+        Returns:
+            {'success': bool, 'suggested_name': str, 'error': str, 'source': 'local'}
+        """
+        file_type = file_path.suffix.lower().lstrip('.')
+        suggested_name = self.ai_renamer.generate_local_filename(content, file_type) if content else None
+        if suggested_name:
+            return {
+                'success': True,
+                'suggested_name': suggested_name + file_path.suffix,
+                'error': None,
+                'source': 'local'
+            }
+        return {
+            'success': False,
+            'suggested_name': None,
+            'error': 'Yerel isim önerisi üretilemedi',
+            'source': 'local'
         }
     
     def get_ai_name_suggestion(self, file_path: Path, content: str) -> Dict[str, Any]:
         """
         GUI için AI isim önerisi al (dosyayı yeniden adlandırmadan)
         
+        AI kullanılamazsa veya öneri alınamazsa yerel öneriye düşülür.
+        
         Args:
             file_path: Dosya yolu
             content: Dosya içeriği
             
         Returns:
-            {'success': bool, 'suggested_name': str, 'error': str}
+            {'success': bool, 'suggested_name': str, 'error': str, 'source': 'ai' | 'local'}
         """
         try:
             if not self.ai_renamer.is_available():
-                return {
-                    'success': False,
-                    'suggested_name': None,
-                    'error': 'AI renamer kullanılamıyor'
-                }
+                return self.get_local_name_suggestion(file_path, content)
             
             file_type = file_path.suffix.lower().lstrip('.')
             suggested_name = self.ai_renamer.generate_filename(content, file_type)
@@ -293,21 +1289,91 @@ class SmartFileRenamer:
                 return {
                     'success': True,
                     'suggested_name': full_suggested_name,
-                    'error': None
+                    'error': None,
+                    'source': 'ai'
                 }
             else:
-                return {
-                    'success': False,
-                    'suggested_name': None,
-                    'error': 'AI\'dan öneri alınamadı'
-                }
+                return self.get_local_name_suggestion(file_path, content)
                 
         except Exception as e:
             self.logger.error(f"AI öneri alma hatası: {e}")
+            return self.get_local_name_suggestion(file_path, content)
+    
+    def request_ai_name_suggestion(self, file_path: Path, content: str) -> concurrent.futures.Future:
+        """
+        AI isim önerisini arka planda ister, beklemeden döner
+        
+        Returns:
+            get_ai_name_suggestion ile aynı biçimde sözlük taşıyan Future
+        """
+        result_future = concurrent.futures.Future()
+        
+        if not self.ai_renamer.is_available():
+            result_future.set_result({
+                'success': False,
+                'suggested_name': None,
+                'error': 'AI renamer kullanılamıyor'
+            })
+            return result_future
+        
+        file_type = file_path.suffix.lower().lstrip('.')
+        
+        def on_done(future):
+            # Sonuç beklenmeden iptal edildiyse (ör. dosya silindi) yapacak bir şey yok
+            if result_future.done():
+                return
+            try:
+                suggested_name = future.result()
+            except concurrent.futures.CancelledError:
+                result_future.cancel()
+                return
+            except Exception as e:
+                self.logger.error(f"AI öneri alma hatası: {e}")
+                result_future.set_result({'success': False, 'suggested_name': None, 'error': str(e)})
+                return
+            if suggested_name:
+                result_future.set_result({
+                    'success': True,
+                    'suggested_name': suggested_name + file_path.suffix,
+                    'error': None,
+                    'source': 'ai'
+                })
+            else:
+                result_future.set_result({
+                    'success': False,
+                    'suggested_name': None,
+                    'error': 'AI\'dan öneri alınamadı'
+                })
+        
+        request_future = self.async_client.submit(content, file_type)
+        request_future.add_done_callback(on_done)
+        # Dış Future iptal edilirse olay döngüsündeki bekleme de iptal edilir
+        result_future.add_done_callback(lambda future: future.cancelled() and request_future.cancel())
+        return result_future
+    
+    def wait_ai_name_suggestion(self, future: concurrent.futures.Future, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        request_ai_name_suggestion ile başlatılan isteğin sonucunu bekler
+        
+        Args:
+            future: request_ai_name_suggestion dönüşü
+            timeout: En fazla bekleme süresi (saniye)
+            
+        Returns:
+            {'success': bool, 'suggested_name': str, 'error': str}
+        """
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.CancelledError:
             return {
                 'success': False,
                 'suggested_name': None,
-                'error': str(e)
+                'error': 'AI önerisi iptal edildi'
+            }
+        except concurrent.futures.TimeoutError:
+            self.logger.warning(f"AI önerisi {timeout} sn içinde gelmedi")
+            return {
+                'success': False,
+                'suggested_name': None,
+                'error': 'AI önerisi zaman aşımına uğradı'
             }
-
-
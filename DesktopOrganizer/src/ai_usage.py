@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+AI Kullanım Takibi - Gemini çağrılarının token ve gecikme muhasebesi
+
+Her çağrının girdi/çıktı token sayısı (yanıttaki usage_metadata, yoksa
+tahmin) ve gecikmesi gün ve dosya türü bazında toplanır ve
+data/ai_usage.json dosyasında saklanır. Günlük token bütçesi dolduğunda
+is_budget_exhausted() True döner; renamer AI'ya gitmeyip yerel isme düşer.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Diske yazma sıklığı: bu kadar kayıtta veya bu kadar saniyede bir
+SAVE_EVERY_RECORDS = 20
+SAVE_INTERVAL_SECONDS = 30.0
+
+# Dosyada saklanan en fazla gün
+MAX_DAYS_KEPT = 90
+
+
+def _empty_counters() -> Dict[str, Any]:
+    return {'calls': 0, 'errors': 0, 'input_tokens': 0, 'output_tokens': 0, 'latency_total': 0.0}
+
+
+class UsageTracker:
+    """Gün ve dosya türü bazında token/gecikme sayaçları, günlük bütçe kontrolü"""
+
+    def __init__(self, usage_file: Path, daily_token_budget: int = 0):
+        self.usage_file = Path(usage_file)
+        self.daily_token_budget = daily_token_budget  # 0: sınırsız
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._last_save = time.monotonic()
+        self._budget_warned_for = None
+        self.days = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        """Kayıtlı kullanım verisini yükler"""
+        try:
+            if self.usage_file.exists():
+                with open(self.usage_file, 'r', encoding='utf-8') as f:
+                    return json.load(f).get('days', {})
+        except Exception as e:
+            self.logger.error(f"AI kullanım verisi yüklenirken hata: {e}")
+        return {}
+
+    def record(self, file_type: str, input_tokens: int, output_tokens: int, latency: float, success: bool = True):
+        """
+        Bir API çağrısını kaydeder
+
+        Args:
+            file_type: Dosya türü (pdf, docx, ...)
+            input_tokens: Girdi (prompt) tokenı
+            output_tokens: Çıktı tokenı
+            latency: Çağrı süresi (saniye)
+            success: Çağrı başarılı mı
+        """
+        today = date.today().isoformat()
+        with self._lock:
+            day = self.days.setdefault(today, dict(_empty_counters(), by_file_type={}))
+            per_type = day['by_file_type'].setdefault(file_type or 'bilinmiyor', _empty_counters())
+            for counters in (day, per_type):
+                counters['calls'] += 1
+                counters['errors'] += 0 if success else 1
+                counters['input_tokens'] += input_tokens
+                counters['output_tokens'] += output_tokens
+                counters['latency_total'] += latency
+            self._dirty += 1
+            should_save = (self._dirty >= SAVE_EVERY_RECORDS
+                           or time.monotonic() - self._last_save >= SAVE_INTERVAL_SECONDS)
+        if should_save:
+            self.save()
+
+    def record_response(self, file_type: str, response, latency: float,
+                        estimated_input: int, estimated_output: int, share: float = 1.0):
+        """
+        Yanıttaki usage_metadata'dan token sayılarını okuyup kaydeder
+
+        Args:
+            share: Toplu isteklerde bu dosyaya düşen pay (0-1)
+        """
+        usage = getattr(response, 'usage_metadata', None)
+        input_tokens = getattr(usage, 'prompt_token_count', None) or estimated_input
+        output_tokens = getattr(usage, 'candidates_token_count', None) or estimated_output
+        self.record(file_type, round(input_tokens * share), round(output_tokens * share), latency * share)
+
+    def tokens_used_today(self) -> int:
+        day = self.days.get(date.today().isoformat())
+        return day['input_tokens'] + day['output_tokens'] if day else 0
+
+    def is_budget_exhausted(self) -> bool:
+        """Günlük token bütçesi doldu mu (bütçe 0 ise hiçbir zaman)"""
+        if not self.daily_token_budget:
+            return False
+        with self._lock:
+            used = self.tokens_used_today()
+        if used < self.daily_token_budget:
+            return False
+        today = date.today().isoformat()
+        if self._budget_warned_for != today:
+            self._budget_warned_for = today
+            self.logger.warning(
+                f"Günlük AI token bütçesi doldu ({used}/{self.daily_token_budget}), "
+                "bugün için yerel isim önerileri kullanılacak"
+            )
+        return True
+
+    def get_summary(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """Bir günün (varsayılan bugün) kullanım özeti"""
+        day = day or date.today().isoformat()
+        with self._lock:
+            counters = self.days.get(day)
+            counters = json.loads(json.dumps(counters)) if counters else dict(_empty_counters(), by_file_type={})
+            used = counters['input_tokens'] + counters['output_tokens']
+        counters['date'] = day
+        counters['total_tokens'] = used
+        counters['avg_latency'] = counters['latency_total'] / counters['calls'] if counters['calls'] else None
+        counters['daily_budget'] = self.daily_token_budget or None
+        counters['remaining'] = max(0, self.daily_token_budget - used) if self.daily_token_budget else None
+        return counters
+
+    def save(self):
+        """Kullanım verisini atomik olarak diske yazar"""
+        with self._lock:
+            # Eski günleri at
+            for old_day in sorted(self.days)[:-MAX_DAYS_KEPT]:
+                del self.days[old_day]
+            payload = json.dumps({'days': self.days}, indent=2, ensure_ascii=False)
+            self._dirty = 0
+            self._last_save = time.monotonic()
+        try:
+            self.usage_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.usage_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(temp_file, self.usage_file)
+        except Exception as e:
+            self.logger.error(f"AI kullanım verisi kaydedilirken hata: {e}")
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Arşiv Çıkarıcıları - Arşiv üyelerini açmadan listeleyip özetler
+
+ZIP için yalnızca dosya sonundaki merkezi dizin (central directory) okunur,
+TAR için yalnızca üye başlıkları okunur; hiçbir üyenin içeriği açılmaz.
+İncelenecek üye sayısı ve sıkıştırılmış TAR'da açılacak veri miktarı
+sınırlıdır (zip-bomb / milyonlarca girdi koruması).
+"""
+
+import os
+import bz2
+import gzip
+import lzma
+import struct
+import logging
+import tarfile
+from collections import Counter
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Optional, Tuple
+
+from office_extractors import collect_text
+from utils import format_size
+
+logger = logging.getLogger(__name__)
+
+# ZIP yapı imzaları ve biçimleri
+ZIP_EOCD_SIGNATURE = b'PK\x05\x06'
+ZIP_EOCD_STRUCT = struct.Struct('<4s4H2LH')
+ZIP64_LOCATOR_SIGNATURE = b'PK\x06\x07'
+ZIP64_LOCATOR_STRUCT = struct.Struct('<4sLQL')
+ZIP64_EOCD_SIGNATURE = b'PK\x06\x06'
+ZIP64_EOCD_STRUCT = struct.Struct('<4sQ2H2L4Q')
+ZIP_CENTRAL_SIGNATURE = b'PK\x01\x02'
+ZIP_CENTRAL_STRUCT = struct.Struct('<4s6H3L5H2L')
+ZIP_MAX_COMMENT = 0xFFFF
+ZIP_UTF8_FLAG = 0x800
+
+# Özette gösterilecek en fazla uzantı ve örnek dosya sayısı
+SUMMARY_TOP_EXTENSIONS = 8
+SUMMARY_SAMPLE_NAMES = 10
+
+# Sıkıştırılmış TAR biçimleri: (sihirli baytlar, açıcı)
+TAR_COMPRESSIONS = (
+    (b'\x1f\x8b', lambda f: gzip.GzipFile(fileobj=f, mode='rb')),
+    (b'BZh', bz2.BZ2File),
+    (b'\xfd7zXZ\x00', lzma.LZMAFile),
+)
+
+# (ad, açılmış boyut, dizin mi)
+ArchiveMember = Tuple[str, int, bool]
+
+
+class ArchiveLimitExceeded(Exception):
+    """Sıkıştırılmış akıştan açılan veri limiti aştı"""
+
+
+class _CappedReader:
+    """Açılan (decompressed) baytları sayar, limit aşılınca okumayı keser"""
+
+    def __init__(self, fileobj, max_bytes: int):
+        self._fileobj = fileobj
+        self._remaining = max_bytes
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            raise ArchiveLimitExceeded()
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fileobj.read(size)
+        self._remaining -= len(data)
+        return data
+
+
+def _zip_central_directory(f) -> Tuple[int, int, int]:
+    """EOCD kaydını bulup (merkezi dizin konumu, boyutu, girdi sayısı) döndürür"""
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+    tail_size = min(file_size, ZIP_EOCD_STRUCT.size + ZIP_MAX_COMMENT)
+    f.seek(file_size - tail_size)
+    tail = f.read(tail_size)
+
+    eocd_index = tail.rfind(ZIP_EOCD_SIGNATURE)
+    if eocd_index < 0:
+        raise ValueError("ZIP merkezi dizin sonu bulunamadı")
+    eocd_pos = file_size - tail_size + eocd_index
+    (_, _, _, _, entry_count, cd_size, cd_offset, _) = ZIP_EOCD_STRUCT.unpack_from(tail, eocd_index)
+
+    # ZIP64: gerçek değerler ayrı bir kayıtta
+    if entry_count == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+        locator_pos = eocd_pos - ZIP64_LOCATOR_STRUCT.size
+        if locator_pos >= 0:
+            f.seek(locator_pos)
+            locator = f.read(ZIP64_LOCATOR_STRUCT.size)
+            if locator[:4] == ZIP64_LOCATOR_SIGNATURE:
+                _, _, eocd64_offset, _ = ZIP64_LOCATOR_STRUCT.unpack(locator)
+                f.seek(eocd64_offset)
+                record = f.read(ZIP64_EOCD_STRUCT.size)
+                if record[:4] == ZIP64_EOCD_SIGNATURE:
+                    (_, _, _, _, _, _, _, entry_count, cd_size, cd_offset) = ZIP64_EOCD_STRUCT.unpack(record)
+                    eocd_pos = locator_pos - ZIP64_EOCD_STRUCT.size
+
+    # Başına veri eklenmiş arşivler (ör. kendiliğinden açılan .exe) için kaydırma
+    prefix = max(eocd_pos - cd_size - cd_offset, 0)
+    return cd_offset + prefix, cd_size, entry_count
+
+
+def _zip64_uncompressed_size(extra: bytes, size: int) -> int:
+    """ZIP64 ek alanından gerçek açılmış boyutu okur"""
+    index = 0
+    while index + 4 <= len(extra):
+        header_id, data_size = struct.unpack_from('<2H', extra, index)
+        if header_id == 0x0001 and data_size >= 8:
+            return struct.unpack_from('<Q', extra, index + 4)[0]
+        index += 4 + data_size
+    return size
+
+
+def iter_zip_members(file_path: Path, max_members: int, max_bytes: int) -> Iterator[ArchiveMember]:
+    """
+    ZIP merkezi dizinindeki girdileri yerel başlıklara veya verilere dokunmadan üretir.
+
+    Args:
+        file_path: ZIP dosya yolu
+        max_members: İncelenecek maksimum girdi sayısı
+        max_bytes: Merkezi dizinden okunacak maksimum bayt sayısı
+
+    Yields:
+        (ad, açılmış boyut, dizin mi) demetleri
+    """
+    with open(file_path, 'rb') as f:
+        cd_offset, cd_size, entry_count = _zip_central_directory(f)
+        f.seek(cd_offset)
+        remaining = min(cd_size, max_bytes)
+        for _ in range(min(entry_count, max_members)):
+            if remaining < ZIP_CENTRAL_STRUCT.size:
+                break
+            header = f.read(ZIP_CENTRAL_STRUCT.size)
+            if len(header) < ZIP_CENTRAL_STRUCT.size or header[:4] != ZIP_CENTRAL_SIGNATURE:
+                break
+            fields = ZIP_CENTRAL_STRUCT.unpack(header)
+            flags, uncompressed_size = fields[3], fields[9]
+            name_length, extra_length, comment_length = fields[10], fields[11], fields[12]
+
+            raw_name = f.read(name_length)
+            extra = f.read(extra_length)
+            f.seek(comment_length, os.SEEK_CUR)
+            remaining -= ZIP_CENTRAL_STRUCT.size + name_length + extra_length + comment_length
+
+            name = raw_name.decode('utf-8' if flags & ZIP_UTF8_FLAG else 'cp437', errors='replace')
+            if uncompressed_size == 0xFFFFFFFF:
+                uncompressed_size = _zip64_uncompressed_size(extra, uncompressed_size)
+            yield name, uncompressed_size, name.endswith('/')
+
+
+def iter_tar_members(file_path: Path, max_members: int, max_stream_bytes: int) -> Iterator[ArchiveMember]:
+    """
+    TAR üye başlıklarını üretir.
+
+    Sıkıştırılmamış TAR'da üye verileri seek ile atlanır. Sıkıştırılmış
+    TAR'da (.tar.gz vb.) sonraki başlığa ulaşmak için üye verisinin de
+    açılması gerekir; bu yüzden akış sırayla okunur ve toplam açılan veri
+    max_stream_bytes ile sınırlanır (tek dev üyeli arşiv izleyiciyi kilitlemez).
+    Limit aşılınca o ana kadar okunan üyelerle yetinilir.
+    """
+    with open(file_path, 'rb') as raw:
+        magic = raw.read(6)
+        raw.seek(0)
+        opener = next((opener for prefix, opener in TAR_COMPRESSIONS if magic.startswith(prefix)), None)
+        if opener is None:
+            tar = tarfile.open(fileobj=raw, mode='r:')
+        else:
+            tar = tarfile.open(fileobj=_CappedReader(opener(raw), max_stream_bytes), mode='r|')
+        with tar:
+            try:
+                for index, member in enumerate(tar):
+                    if index >= max_members:
+                        break
+                    yield member.name, member.size, member.isdir()
+            except ArchiveLimitExceeded:
+                logger.debug(f"TAR açma limiti ({format_size(max_stream_bytes)}) aşıldı, "
+                             f"kalan üyeler atlanıyor: {file_path.name}")
+
+
+def iter_7z_members(file_path: Path, max_members: int) -> Iterator[ArchiveMember]:
+    """7z başlığındaki girdileri py7zr ile üretir (sadece başlık açılır, opsiyonel bağımlılık)"""
+    try:
+        import py7zr
+    except ImportError:
+        logger.debug("py7zr yüklü değil, 7z içeriği listelenemiyor")
+        return
+    with py7zr.SevenZipFile(str(file_path), mode='r') as archive:
+        for index, info in enumerate(archive.list()):
+            if index >= max_members:
+                break
+            yield info.filename, info.uncompressed or 0, info.is_directory
+
+
+def iter_rar_members(file_path: Path, max_members: int) -> Iterator[ArchiveMember]:
+    """RAR başlıklarındaki girdileri rarfile ile üretir (opsiyonel bağımlılık, listeleme için unrar gerekmez)"""
+    try:
+        import rarfile
+    except ImportError:
+        logger.debug("rarfile yüklü değil, RAR içeriği listelenemiyor")
+        return
+    with rarfile.RarFile(str(file_path)) as archive:
+        for index, info in enumerate(archive.infolist()):
+            if index >= max_members:
+                break
+            yield info.filename, info.file_size, info.is_dir()
+
+
+def _gzip_original_name(file_path: Path) -> Optional[str]:
+    """Tek dosyalık .gz başlığındaki özgün dosya adını (FNAME) okur"""
+    with open(file_path, 'rb') as f:
+        header = f.read(10)
+        if len(header) < 10 or header[:2] != b'\x1f\x8b' or not header[3] & 0x08:
+            return None
+        if header[3] & 0x04:  # FEXTRA
+            extra_length = struct.unpack('<H', f.read(2))[0]
+            f.seek(extra_length, os.SEEK_CUR)
+        name = bytearray()
+        while len(name) < 1024:
+            char = f.read(1)
+            if not char or char == b'\x00':
+                break
+            name += char
+        return name.decode('latin-1') or None
+
+
+def summarize_members(members: Iterator[ArchiveMember], max_members: int) -> Optional[str]:
+    """
+    Arşiv üyelerini "34 .jpg, 2 .pdf" biçiminde özetler.
+
+    Args:
+        members: (ad, boyut, dizin mi) üreteci
+        max_members: Uygulanan üye limiti (özetteki uyarı için)
+
+    Returns:
+        Çok satırlı özet metni veya arşiv boşsa None
+    """
+    extension_counts = Counter()
+    top_level = Counter()
+    sample_names = []
+    file_count = 0
+    dir_count = 0
+    total_size = 0
+    inspected = 0
+
+    for name, size, is_dir in members:
+        inspected += 1
+        path = PurePosixPath(name.replace('\\', '/'))
+        if path.parts and len(path.parts) > 1:
+            top_level[path.parts[0]] += 1
+        if is_dir:
+            dir_count += 1
+            continue
+        file_count += 1
+        total_size += size
+        extension_counts[path.suffix.lower() or '(uzantısız)'] += 1
+        if len(sample_names) < SUMMARY_SAMPLE_NAMES:
+            sample_names.append(path.name)
+
+    if inspected == 0:
+        return None
+
+    lines = [f"Arşiv içeriği: {file_count} dosya, {dir_count} klasör, açılmış boyut {format_size(total_size)}"]
+    if inspected >= max_members:
+        lines[0] += f" (ilk {max_members} girdi incelendi)"
+    if extension_counts:
+        lines.append(', '.join(f"{count} {ext}" for ext, count in extension_counts.most_common(SUMMARY_TOP_EXTENSIONS)))
+    if top_level:
+        lines.append(f"Klasörler: {', '.join(name for name, _ in top_level.most_common(5))}")
+    if sample_names:
+        lines.append(f"Örnek dosyalar: {', '.join(sample_names)}")
+    return '\n'.join(lines)
+
+
+def extract_archive_summary(file_path: Path, max_chars: int, max_bytes: int, max_members: int = 5000,
+                            max_stream_bytes: int = 64 * 1024 * 1024) -> Optional[str]:
+    """
+    Arşiv türüne göre üyeleri listeler ve özet metni döndürür.
+
+    Args:
+        file_path: Arşiv dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: ZIP merkezi dizini için okunacak maksimum bayt sayısı
+        max_members: İncelenecek maksimum üye sayısı
+        max_stream_bytes: Sıkıştırılmış TAR'da açılacak maksimum veri
+
+    Returns:
+        Özet metni veya None
+    """
+    name = file_path.name.lower()
+    extension = file_path.suffix.lower()
+
+    if extension == '.zip':
+        members = iter_zip_members(file_path, max_members, max_bytes)
+    elif extension == '.7z':
+        members = iter_7z_members(file_path, max_members)
+    elif extension == '.rar':
+        members = iter_rar_members(file_path, max_members)
+    elif extension in ('.tar', '.tgz', '.tbz2', '.txz') or '.tar.' in name:
+        members = iter_tar_members(file_path, max_members, max_stream_bytes)
+    elif extension in ('.gz', '.bz2', '.xz'):
+        # Tek dosya sıkıştırması; sadece .gz başlığında özgün ad bulunur
+        original_name = _gzip_original_name(file_path) if extension == '.gz' else None
+        inner_name = original_name or file_path.stem
+        return f"Sıkıştırılmış tek dosya: {inner_name}"
+    else:
+        return None
+
+    return collect_text([summarize_members(members, max_members) or ''], max_chars)
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Toplu Organizasyon - Bir klasörü tek seferde organize eder
+
+İzleyiciyi beklemeden herhangi bir klasördeki (ör. eski bir ağ paylaşımı)
+dosyaları üç aşamada işler:
+
+    1. Tarama: alt klasörler thread havuzunda paralel os.scandir ile taranır
+    2. Planlama: uzantı/isim sınıflandırması; isim önerisi istenirse içerik
+       process havuzunda paralel çıkarılır (yerel kurallar veya toplu AI)
+    3. Uygulama: taşımalar hedef klasöre göre gruplanmış toplu çağrılarla yapılır
+
+Planlama ve uygulama ayrı da çalıştırılabilir: plan komutu kararları
+incelenebilir bir plan dosyasına yazar, apply bu planı sonradan uygular.
+
+Kullanım:
+    python main.py organize ~/Eski_Paylasim --recursive
+    python main.py organize ~/Downloads --action copy --rename local --workers 8
+    python main.py plan ~/Eski_Paylasim -r --rename ai -o plan.jsonl
+    python main.py apply plan.jsonl
+"""
+
+import os
+import time
+import logging
+import concurrent.futures
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from colorama import Fore, Style
+
+from config import Config
+from file_classifier import FileClassifier
+from file_manager import FileManager
+from content_extractors import ContentExtractor
+from move_journal import get_move_journal
+from plan_file import PlanWriter, read_plan, validate_entries
+
+logger = logging.getLogger(__name__)
+
+RENAME_MODES = ('none', 'local', 'ai')
+
+# Process havuzunda her işçiye bir kerede verilen dosya sayısı
+EXTRACT_CHUNK_SIZE = 16
+
+_worker_extractor = None
+
+
+def _init_extract_worker():
+    """Her işçi process'te bir kez içerik çıkarıcı oluşturur"""
+    global _worker_extractor
+    _worker_extractor = ContentExtractor()
+
+
+def _extract_in_worker(path: str, max_chars: int) -> Tuple[str, Optional[str]]:
+    """İşçi process'te içerik çıkarır; başarısızsa None döner"""
+    try:
+        result = _worker_extractor.extract_content(Path(path), max_chars=max_chars)
+    except Exception:
+        return path, None
+    return path, result['content'] if result['success'] else None
+
+
+def _scan_one(directory: str) -> Tuple[List[Path], List[str]]:
+    """Tek klasörü tarar: (dosyalar, alt klasörler)"""
+    files, subdirs = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append(Path(entry.path))
+    except OSError as e:
+        logger.warning(f"Klasör taranamadı '{directory}': {e}")
+    return files, subdirs
+
+
+def scan_directory(root: Path, recursive: bool, workers: int, exclude: Set[str]) -> List[Path]:
+    """
+    Klasörü (recursive ise tüm alt klasörleriyle) paralel tarar
+
+    Args:
+        exclude: Taranmayacak klasörler (normcase mutlak yol), ör. Organize hedefleri
+    """
+    files: List[Path] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as executor:
+        pending = {executor.submit(_scan_one, str(root))}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                dir_files, subdirs = future.result()
+                files.extend(dir_files)
+                if not recursive:
+                    continue
+                for subdir in subdirs:
+                    if os.path.normcase(os.path.abspath(subdir)) not in exclude:
+                        pending.add(executor.submit(_scan_one, subdir))
+    return files
+
+
+class BulkOrganizer:
+    """Bir klasörü tarar, planlar ve toplu olarak organize eder"""
+
+    def __init__(self, action: str = 'move', rename: str = 'none', workers: Optional[int] = None,
+                 batch_size: int = 500, dry_run: bool = False):
+        self.config = Config()
+        self.logger = logging.getLogger(__name__)
+        self.action = action
+        self.rename = rename
+        self.workers = workers or os.cpu_count() or 4
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+        self.file_classifier = FileClassifier()
+        self.file_manager = FileManager()
+        self.content_extractor = ContentExtractor()
+        self.ai_renamer = None
+        self.timings: Dict[str, float] = {}
+
+    def _timed(self, phase: str, started: float):
+        self.timings[phase] = time.perf_counter() - started
+
+    def scan(self, root: Path, recursive: bool) -> List[Path]:
+        """Organize hedeflerini hariç tutarak dosyaları listeler"""
+        started = time.perf_counter()
+        exclude = {os.path.normcase(os.path.abspath(path)) for path in self.config.CATEGORIES.values()}
+        files = scan_directory(root, recursive, max(4, self.workers * 2), exclude)
+        self._timed('scan', started)
+        return files
+
+    def plan(self, files: List[Path]) -> List[Dict[str, Any]]:
+        """
+        Her dosya için kategori ve (istenirse) yeni isim belirler
+
+        Returns:
+            [{'source': Path, 'category': str | None, 'name': str | None}, ...]
+        """
+        started = time.perf_counter()
+        entries = []
+        for file_path in files:
+            category = self.file_classifier.classify_file(file_path)
+            if category not in self.config.CATEGORIES:
+                category = None  # Sınıflandırılamadı veya hedef klasörü olmayan anahtar kelime kategorisi
+            entries.append({'source': file_path, 'category': category, 'name': None})
+        self._timed('classify', started)
+
+        if self.rename != 'none':
+            self._suggest_names([entry for entry in entries if entry['category']])
+        return entries
+
+    def _suggest_names(self, entries: List[Dict[str, Any]]):
+        """İçerikleri process havuzunda çıkarır, yerel kurallarla veya toplu AI ile isim önerir"""
+        from ai_renamer import AIFileRenamer
+
+        started = time.perf_counter()
+        supported = [entry for entry in entries if self.content_extractor.is_supported(entry['source'])]
+        contents: Dict[str, str] = {}
+        if supported:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers,
+                                                        initializer=_init_extract_worker) as executor:
+                paths = [str(entry['source']) for entry in supported]
+                for path, content in executor.map(_extract_in_worker, paths,
+                                                  [self.config.CONTENT_MAX_CHARS] * len(paths),
+                                                  chunksize=EXTRACT_CHUNK_SIZE):
+                    if content:
+                        contents[path] = content
+        self._timed('extract', started)
+
+        started = time.perf_counter()
+        self.ai_renamer = AIFileRenamer()
+        names: Dict[str, Optional[str]] = {}
+        if self.rename == 'ai' and self.ai_renamer.is_available() and contents:
+            names = self.ai_renamer.generate_filenames_batch(
+                [(path, content, Path(path).suffix.lower().lstrip('.')) for path, content in contents.items()])
+        for entry in supported:
+            path = str(entry['source'])
+            content = contents.get(path)
+            if not content:
+                continue
+            name = names.get(path) or self.ai_renamer.generate_local_filename(
+                content, entry['source'].suffix.lower().lstrip('.'))
+            if name and name + entry['source'].suffix != entry['source'].name:
+                entry['name'] = name + entry['source'].suffix
+        self._timed('name', started)
+
+    def apply(self, entries: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Planı uygular: taşımalar batch_size'lık toplu çağrılarla, kopyalar tek tek
+
+        Satırda 'action' varsa (plan dosyasından) o, yoksa organizer'ın eylemi kullanılır.
+        """
+        started = time.perf_counter()
+        counts = {'moved': 0, 'copied': 0, 'skipped': 0, 'failed': 0}
+        actionable = [entry for entry in entries if entry['category']]
+        moves = [entry for entry in actionable if entry.get('action', self.action) == 'move']
+        copies = [entry for entry in actionable if entry.get('action', self.action) != 'move']
+
+        for offset in range(0, len(moves), self.batch_size):
+            batch = moves[offset:offset + self.batch_size]
+            results = self.file_manager.move_files(
+                [(entry['source'], entry['category'], entry['name']) for entry in batch])
+            for result in results.values():
+                if result['skipped']:
+                    counts['skipped'] += 1
+                elif result['success']:
+                    counts['moved'] += 1
+                else:
+                    counts['failed'] += 1
+        for entry in copies:
+            if self.file_manager.copy_file(entry['source'], entry['category'], entry['name']):
+                counts['copied'] += 1
+            else:
+                counts['failed'] += 1
+        self._timed('apply', started)
+        return counts
+
+    def run(self, root: Path, recursive: bool = False) -> Dict[str, Any]:
+        """Tarama + planlama + uygulama; özet döndürür"""
+        started = time.perf_counter()
+        files = self.scan(root, recursive)
+        entries = self.plan(files)
+
+        categories: Dict[str, int] = {}
+        for entry in entries:
+            key = entry['category'] or 'sınıflandırılamadı'
+            categories[key] = categories.get(key, 0) + 1
+
+        counts = {'moved': 0, 'copied': 0, 'skipped': 0, 'failed': 0}
+        if not self.dry_run:
+            counts = self.apply(entries)
+        elapsed = time.perf_counter() - started
+
+        return {
+            'files': len(files),
+            'categories': categories,
+            'renamed': sum(1 for entry in entries if entry['name']),
+            'counts': counts,
+            'timings': dict(self.timings),
+            'elapsed': elapsed,
+            'entries': entries
+        }
+
+
+def print_summary(summary: Dict[str, Any], dry_run: bool):
+    """Kategori dağılımı, aşama süreleri ve verimi yazdırır"""
+    print(f"\n{Fore.CYAN}=== Toplu Organizasyon Özeti ==={Style.RESET_ALL}")
+    print(f"Taranan dosya: {summary['files']}")
+    for category, count in sorted(summary['categories'].items(), key=lambda item: -item[1]):
+        print(f"  {category}: {count}")
+    if summary['renamed']:
+        print(f"Yeni isim önerilen: {summary['renamed']}")
+
+    counts = summary['counts']
+    if dry_run:
+        print(f"{Fore.YELLOW}Deneme modu: hiçbir dosya taşınmadı{Style.RESET_ALL}")
+    else:
+        print(f"{Fore.GREEN}Taşınan: {counts['moved']}  Kopyalanan: {counts['copied']}  "
+              f"Atlanan: {counts['skipped']}{Style.RESET_ALL}  {Fore.RED}Başarısız: {counts['failed']}{Style.RESET_ALL}")
+
+    phases = '  '.join(f"{phase}: {seconds:.2f} sn" for phase, seconds in summary['timings'].items())
+    print(f"Aşamalar: {phases}")
+    elapsed = summary['elapsed']
+    rate = summary['files'] / elapsed if elapsed else 0
+    print(f"Toplam süre: {elapsed:.2f} sn  Verim: {rate:.0f} dosya/sn")
+    if not dry_run and counts['moved']:
+        print(f"{Fore.BLUE}💡 Geri almak için: python main.py undo --minutes {max(1, int(elapsed / 60) + 1)}{Style.RESET_ALL}")
+
+
+def _add_scan_arguments(parser):
+    """organize ve plan alt komutlarının ortak argümanları"""
+    parser.add_argument('directory', type=Path, help='Organize edilecek klasör')
+    parser.add_argument('--recursive', '-r', action='store_true', help='Alt klasörleri de tara')
+    parser.add_argument('--action', choices=('move', 'copy'), default='move', help='Dosyalara uygulanacak işlem')
+    parser.add_argument('--rename', choices=RENAME_MODES, default='none',
+                        help="İsim önerisi: yok, yerel kurallar veya toplu AI (AI yoksa yerel)")
+    parser.add_argument('--workers', type=int, default=None, help='Paralel işçi sayısı (varsayılan: CPU sayısı)')
+
+
+def add_organize_arguments(parser):
+    """organize alt komutunun argümanları"""
+    _add_scan_arguments(parser)
+    parser.add_argument('--batch-size', type=int, default=500, help='Toplu taşıma grubu boyutu')
+    parser.add_argument('--dry-run', action='store_true', help='Sadece planla, dosyalara dokunma')
+
+
+def add_plan_arguments(parser):
+    """plan alt komutunun argümanları"""
+    _add_scan_arguments(parser)
+    parser.add_argument('--output', '-o', type=Path, required=True, help='Yazılacak plan dosyası (JSONL)')
+
+
+def add_apply_arguments(parser):
+    """apply alt komutunun argümanları"""
+    parser.add_argument('plan', type=Path, help='Uygulanacak plan dosyası')
+    parser.add_argument('--batch-size', type=int, default=500, help='Toplu taşıma grubu boyutu')
+
+
+def _close_journal():
+    journal = get_move_journal()
+    if journal is not None:
+        journal.close()  # Bekleyen günlük kayıtlarını diske yaz
+
+
+def run_organize(args) -> int:
+    """organize alt komutu"""
+    directory = args.directory.expanduser()
+    if not directory.is_dir():
+        print(f"{Fore.RED}Klasör bulunamadı: {directory}{Style.RESET_ALL}")
+        return 1
+
+    organizer = BulkOrganizer(action=args.action, rename=args.rename, workers=args.workers,
+                              batch_size=args.batch_size, dry_run=args.dry_run)
+    print(f"{Fore.CYAN}Toplu organizasyon: {directory}{' (alt klasörlerle)' if args.recursive else ''}{Style.RESET_ALL}")
+    summary = organizer.run(directory, recursive=args.recursive)
+    _close_journal()
+    print_summary(summary, args.dry_run)
+    return 0 if not summary['counts']['failed'] else 1
+
+
+def run_plan(args) -> int:
+    """plan alt komutu: tarar, sınıflandırır, isim önerir ve planı dosyaya yazar"""
+    directory = args.directory.expanduser()
+    if not directory.is_dir():
+        print(f"{Fore.RED}Klasör bulunamadı: {directory}{Style.RESET_ALL}")
+        return 1
+
+    organizer = BulkOrganizer(action=args.action, rename=args.rename, workers=args.workers, dry_run=True)
+    print(f"{Fore.CYAN}Plan hazırlanıyor: {directory}{' (alt klasörlerle)' if args.recursive else ''}{Style.RESET_ALL}")
+    summary = organizer.run(directory, recursive=args.recursive)
+    output = args.output.expanduser()
+    with PlanWriter(output, root=directory) as writer:
+        written = writer.write_entries(summary['entries'], args.action)
+    print_summary(summary, dry_run=True)
+    print(f"{Fore.GREEN}📝 Plan yazıldı: {output} ({written} dosya){Style.RESET_ALL}")
+    print(f"{Fore.BLUE}💡 İnceleyip uygulamak için: python main.py apply {output}{Style.RESET_ALL}")
+    return 0
+
+
+def run_apply(args) -> int:
+    """apply alt komutu: planı parmak izlerini doğrulayarak toplu uygular"""
+    plan_path = args.plan.expanduser()
+    try:
+        header, entries = read_plan(plan_path)
+    except (OSError, ValueError) as e:
+        print(f"{Fore.RED}Plan okunamadı: {e}{Style.RESET_ALL}")
+        return 1
+
+    organizer = BulkOrganizer(batch_size=args.batch_size)
+    started = time.perf_counter()
+    valid, skipped = validate_entries(entries, organizer.config.CATEGORIES)
+    organizer._timed('validate', started)
+    created = datetime.fromtimestamp(header.get('created') or 0).strftime('%Y-%m-%d %H:%M')
+    print(f"{Fore.CYAN}Plan uygulanıyor: {plan_path} ({created}, {len(entries)} satır){Style.RESET_ALL}")
+    if any(skipped.values()):
+        print(f"{Fore.YELLOW}Atlanan satırlar - değişmiş: {skipped['changed']}  kaybolmuş: {skipped['missing']}  "
+              f"geçersiz: {skipped['invalid']}{Style.RESET_ALL}")
+
+    counts = organizer.apply(valid)
+    _close_journal()
+    categories: Dict[str, int] = {}
+    for entry in valid:
+        categories[entry['category']] = categories.get(entry['category'], 0) + 1
+    print_summary({
+        'files': len(entries),
+        'categories': categories,
+        'renamed': sum(1 for entry in valid if entry.get('name')),
+        'counts': counts,
+        'timings': dict(organizer.timings),
+        'elapsed': time.perf_counter() - started,
+        'entries': valid
+    }, dry_run=False)
+    return 0 if not counts['failed'] else 1
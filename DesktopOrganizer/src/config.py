@@ -44,6 +44,50 @@ class Config:
         # Dosya çakışması çözümü
         self.CONFLICT_RESOLUTION = 'rename'  # 'rename', 'overwrite', 'skip'
         
+        # Hedef klasör düzeni (.env'den okunur), ör. '{category}/{yyyy}/{mm}' veya '{category}/{hash2}'
+        self.TARGET_LAYOUT = os.getenv('TARGET_LAYOUT', '{category}')
+        self.RESHARD_ENABLED = os.getenv('RESHARD_ENABLED', 'true').lower() == 'true'  # Düz klasörleri arka planda yeni düzene taşı
+        self.RESHARD_BATCH_SIZE = int(os.getenv('RESHARD_BATCH_SIZE', '200'))  # Her adımda taşınan dosya sayısı
+        self.RESHARD_PAUSE = float(os.getenv('RESHARD_PAUSE', '0.5'))  # Adımlar arası bekleme (saniye)
+        
+        # Kopyalama motoru ayarları (.env'den okunur)
+        self.COPY_STRATEGY = os.getenv('COPY_STRATEGY', 'copy').lower()  # 'hardlink', 'reflink', 'symlink', 'copy' (desteklenmezse tam kopyaya düşer)
+        self.COPY_REFLINK_ENABLED = os.getenv('COPY_REFLINK_ENABLED', 'true').lower() == 'true'  # btrfs/XFS'te FICLONE dene
+        self.COPY_CHUNK_SIZE_MB = int(os.getenv('COPY_CHUNK_SIZE_MB', '64'))  # copy_file_range/sendfile parça boyutu
+        self.COPY_RESUME_MIN_MB = int(os.getenv('COPY_RESUME_MIN_MB', '256'))  # Bu boyuttan büyük kopyalar kaldığı yerden devam edebilir
+        self.COPY_CHECKPOINT_MB = int(os.getenv('COPY_CHECKPOINT_MB', '256'))  # Kaç MB'da bir kontrol noktası yazılır
+        self.COPY_VERIFY = os.getenv('COPY_VERIFY', 'false').lower() == 'true'  # Kopyayı hash ile doğrula
+        
+        # Dosya durum deposu ayarları (.env'den okunur)
+        self.FILE_STATE_MEMORY_ENTRIES = int(os.getenv('FILE_STATE_MEMORY_ENTRIES', '1024'))  # Bellekteki (LRU) en fazla durum
+        self.FILE_STATE_RETENTION_DAYS = int(os.getenv('FILE_STATE_RETENTION_DAYS', '30'))  # 'done' kayıtlarının saklanma süresi (gün)
+        self.FILE_STATE_MAX_ENTRIES = int(os.getenv('FILE_STATE_MAX_ENTRIES', '100000'))  # Diskteki en fazla kayıt
+        
+        # İşlem günlüğü ayarları (.env'den okunur)
+        self.JOURNAL_ENABLED = os.getenv('JOURNAL_ENABLED', 'true').lower() == 'true'  # Taşıma günlüğü ve geri alma
+        self.JOURNAL_GROUP_COMMIT_MS = int(os.getenv('JOURNAL_GROUP_COMMIT_MS', '50'))  # Grup fsync aralığı (milisaniye)
+        self.JOURNAL_GROUP_COMMIT_RECORDS = int(os.getenv('JOURNAL_GROUP_COMMIT_RECORDS', '256'))  # Bu kadar kayıtta hemen fsync
+        self.JOURNAL_RETENTION_DAYS = int(os.getenv('JOURNAL_RETENTION_DAYS', '30'))  # Günlükte saklanan gün (0: sınırsız)
+        
+        # Tekrar eden dosya kontrolü (.env'den okunur)
+        self.DEDUP_POLICY = os.getenv('DEDUP_POLICY', 'report').lower()  # 'off', 'report' (sadece logla), 'skip' (yerleştirme), 'hardlink' (mevcut kopyaya bağla)
+        
+        # Metrik ayarları (.env'den okunur)
+        self.METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'  # Aşama süresi metriklerini dışa aktar
+        self.METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')  # Prometheus uç noktasının dinlediği adres
+        self.METRICS_PORT = int(os.getenv('METRICS_PORT', '9464'))  # /metrics portu (0: HTTP uç noktası kapalı)
+        self.METRICS_SNAPSHOT_INTERVAL = float(os.getenv('METRICS_SNAPSHOT_INTERVAL', '60'))  # JSON anlık görüntü aralığı (sn, 0: kapalı)
+        self.METRICS_SNAPSHOT_FILE = Path(os.getenv('METRICS_SNAPSHOT_FILE', str(self.DATA_DIR / "metrics.json")))  # JSON anlık görüntü dosyası
+        
+        # İzleme ayarları (.env'den okunur)
+        self.TRACE_ENABLED = os.getenv('TRACE_ENABLED', 'true').lower() == 'true'  # Dosya başına span izlerini yaz
+        self.TRACE_FILE = Path(os.getenv('TRACE_FILE', str(self.LOGS_DIR / "trace.jsonl")))  # Dönen (rotating) JSONL iz dosyası
+        self.TRACE_MAX_MB = int(os.getenv('TRACE_MAX_MB', '10'))  # Bu boyuta ulaşınca yeni dosyaya geçilir
+        self.TRACE_BACKUP_COUNT = int(os.getenv('TRACE_BACKUP_COUNT', '3'))  # Saklanan eski iz dosyası sayısı
+        
+        # Plan dosyası (.env'den okunur)
+        self.LOG_ONLY_PLAN_FILE = Path(os.getenv('LOG_ONLY_PLAN_FILE', str(self.DATA_DIR / "log_only_plan.jsonl")))  # Sadece loglama modunda kararların yazıldığı plan
+        
         # Log ayarları
         self.LOG_LEVEL = 'INFO'
         self.LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
@@ -59,9 +103,45 @@ class Config:
         self.FILE_STABILITY_CHECK_INTERVAL = float(os.getenv('FILE_STABILITY_CHECK_INTERVAL', '0.5'))  # Varsayılan 0.5 saniye
         self.FILE_STABILITY_CHECKS = int(os.getenv('FILE_STABILITY_CHECKS', '3'))  # Varsayılan 3 kez kontrol
         
+        # İçerik çıkarma ayarları (.env'den okunur)
+        self.CONTENT_MAX_CHARS = int(os.getenv('CONTENT_MAX_CHARS', '20000'))  # Dosya başına en fazla çıkarılacak karakter
+        self.CONTENT_MAX_READ_BYTES = int(os.getenv('CONTENT_MAX_READ_BYTES', str(256 * 1024)))  # Tablo/sunum/metin için okuma limiti
+        self.CONTENT_SAMPLE_ROWS = int(os.getenv('CONTENT_SAMPLE_ROWS', '20'))  # Tablolardan alınacak örnek satır (başlık dahil)
+        self.ARCHIVE_MAX_MEMBERS = int(os.getenv('ARCHIVE_MAX_MEMBERS', '5000'))  # Arşivlerde incelenecek en fazla girdi (zip-bomb koruması)
+        self.ARCHIVE_MAX_STREAM_MB = int(os.getenv('ARCHIVE_MAX_STREAM_MB', '64'))  # Sıkıştırılmış TAR'da başlıklara ulaşmak için açılacak en fazla veri (MB)
+        self.PLAIN_TEXT_EXTENSIONS = [
+            'txt', 'md', 'log', 'json', 'xml', 'yaml', 'yml', 'ini',
+            'py', 'ipynb', 'js', 'ts', 'html', 'css', 'java', 'cpp', 'c', 'h', 'php', 'rb', 'go', 'rs', 'sql', 'sh'
+        ]
+        
         # AI Rename ayarları (.env'den okunur)
         self.AI_RENAME_ENABLED = os.getenv('AI_RENAME_ENABLED', 'true').lower() == 'true'
         self.AI_RENAME_ASK_USER = os.getenv('AI_RENAME_ASK_USER', 'true').lower() == 'true'  # AI rename için kullanıcıya sor
+        self.AI_PROMPT_TOKEN_BUDGET = int(os.getenv('AI_PROMPT_TOKEN_BUDGET', '400'))  # AI'ya gönderilecek içerik kesiti (yaklaşık token)
+        self.AI_BATCH_TOKEN_BUDGET = int(os.getenv('AI_BATCH_TOKEN_BUDGET', '6000'))  # Tek toplu istekteki girdi tokenı
+        self.AI_BATCH_MAX_FILES = int(os.getenv('AI_BATCH_MAX_FILES', '20'))  # Tek toplu istekteki en fazla dosya
+        self.AI_BATCH_WINDOW = float(os.getenv('AI_BATCH_WINDOW', '0'))  # İzleyiciden bu kadar saniye içinde gelen istekler toplu istekte birleştirilir (0: kapalı; her isteğe bu kadar gecikme ekler)
+        self.AI_MAX_IN_FLIGHT = int(os.getenv('AI_MAX_IN_FLIGHT', '4'))  # Aynı anda en fazla AI isteği
+        self.AI_REQUESTS_PER_MINUTE = int(os.getenv('AI_REQUESTS_PER_MINUTE', '15'))  # Dakikada en fazla istek
+        self.AI_TOKENS_PER_MINUTE = int(os.getenv('AI_TOKENS_PER_MINUTE', '1000000'))  # Dakikada en fazla token
+        self.AI_MAX_RETRIES = int(os.getenv('AI_MAX_RETRIES', '2'))  # 429/5xx sonrası tekrar deneme sayısı
+        self.AI_SUGGESTION_WAIT_TIMEOUT = float(os.getenv('AI_SUGGESTION_WAIT_TIMEOUT', '20'))  # Onay penceresi öncesi AI önerisi için en fazla bekleme
+        self.AI_REQUEST_TIMEOUT = float(os.getenv('AI_REQUEST_TIMEOUT', '15'))  # Tek AI isteği için en fazla süre (saniye)
+        self.AI_BREAKER_FAILURE_THRESHOLD = int(os.getenv('AI_BREAKER_FAILURE_THRESHOLD', '5'))  # Art arda bu kadar hatada AI devre dışı kalır
+        self.AI_BREAKER_COOLDOWN = float(os.getenv('AI_BREAKER_COOLDOWN', '60'))  # Devre dışı kalma süresi (saniye)
+        self.AI_HEDGE_ENABLED = os.getenv('AI_HEDGE_ENABLED', 'false').lower() == 'true'  # Yavaş isteklere ikinci (yedek) istek gönder
+        self.AI_HEDGE_DELAY = float(os.getenv('AI_HEDGE_DELAY', '2'))  # Yedek istek öncesi bekleme; yeterli ölçüm varsa p95 gecikme kullanılır
+        self.AI_DAILY_TOKEN_BUDGET = int(os.getenv('AI_DAILY_TOKEN_BUDGET', '0'))  # Günlük token bütçesi, dolunca yerel isim kullanılır (0: sınırsız)
+        self.AI_USAGE_FILE = Path(os.getenv('AI_USAGE_FILE', str(self.DATA_DIR / "ai_usage.json")))  # Günlük token kullanım kaydı
+        self.AI_PREFETCH_ENABLED = os.getenv('AI_PREFETCH_ENABLED', 'true').lower() == 'true'  # Dosya kararlı hale gelirken AI önerisini önceden iste
+        self.AI_PREFETCH_MAX_CHARS = int(os.getenv('AI_PREFETCH_MAX_CHARS', '4000'))  # Ön getirmede çıkarılacak içerik (yaklaşık ilk sayfa)
+        self.AI_PREFETCH_WORKERS = int(os.getenv('AI_PREFETCH_WORKERS', '2'))  # Ön getirme için çıkarma thread'i sayısı
+        self.GEMINI_BASE_URL = os.getenv('GEMINI_BASE_URL', '')  # Boş değilse Gemini yerine bu adres kullanılır (ör. mock_gemini_server)
+        self.AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'true').lower() == 'true'  # Aynı içerik için önerileri önbellekten ver
+        self.AI_CACHE_FILE = Path(os.getenv('AI_CACHE_FILE', str(self.DATA_DIR / "ai_cache.sqlite3")))  # Önbellek veritabanı
+        self.AI_CACHE_TTL_DAYS = float(os.getenv('AI_CACHE_TTL_DAYS', '30'))  # Önbellek kaydının geçerlilik süresi
+        self.AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '10000'))  # Diskteki en fazla kayıt
+        self.AI_CACHE_MEMORY_ENTRIES = int(os.getenv('AI_CACHE_MEMORY_ENTRIES', '512'))  # Bellekteki (LRU) en fazla kayıt
         
         # Başlangıç ayarları (.env'den okunur)
         self.SHOW_STARTUP_PREFERENCES = os.getenv('SHOW_STARTUP_PREFERENCES', 'true').lower() == 'true'
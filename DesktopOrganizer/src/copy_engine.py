@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Kopyalama Motoru - Büyük dosyalar için çekirdek hızlandırmalı, devam ettirilebilir kopyalama
+
+Yöntemler sırayla denenir:
+    1. FICLONE (reflink, btrfs/XFS): veri kopyalanmaz, anında biter
+    2. os.copy_file_range: veri çekirdekte kalır (Linux)
+    3. os.sendfile: dosyadan dosyaya çekirdek içi kopya (Linux)
+    4. Tamponlu okuma/yazma (her platformda)
+
+COPY_RESUME_MIN_MB'dan büyük dosyalar önce gizli bir ".isim.partial"
+dosyasına yazılır; her COPY_CHECKPOINT_MB'da veri fsync edilir ve ilerleme
+".isim.partial.json" kontrol noktasına kaydedilir. Kopya yarıda kalırsa
+(uygulama kapandı, disk çıkarıldı) bir sonraki denemede kaynak değişmemişse
+kaldığı yerden devam edilir. Bitince partial dosya hedefin üzerine yazmadan
+yerine taşınır.
+"""
+
+import os
+import json
+import errno
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Dict, Any
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
+from config import Config
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+BUFFER_SIZE = 1024 * 1024
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+MB = 1024 * 1024
+
+# Bu hatalar yöntemin desteklenmediğini gösterir; bir sonraki yönteme geçilir
+UNSUPPORTED_ERRNOS = {errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EXDEV, errno.EBADF,
+                      getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), getattr(errno, 'ENOTTY', errno.EINVAL)}
+
+ProgressCallback = Callable[[int, int], None]
+
+# Kopyalama stratejisi -> sırayla denenecek yöntemler; hepsi sonunda tam kopyaya düşer
+STRATEGY_FALLBACKS = {
+    'hardlink': ('hardlink', 'reflink', 'copy'),
+    'reflink': ('reflink', 'copy'),
+    'symlink': ('symlink', 'copy'),
+    'copy': ('copy',),
+}
+
+
+class CopyVerificationError(OSError):
+    """Kopyanın hash'i kaynakla eşleşmiyor"""
+
+
+class CopyEngine:
+    """Dosya kopyalama; yöntem seçimi, ilerleme, kontrol noktası ve doğrulama"""
+
+    def __init__(self):
+        self.config = Config()
+        self.logger = logging.getLogger(__name__)
+
+        self.reflink_enabled = self.config.COPY_REFLINK_ENABLED and fcntl is not None
+        self.chunk_size = max(1, self.config.COPY_CHUNK_SIZE_MB) * MB
+        self.resume_min_size = self.config.COPY_RESUME_MIN_MB * MB
+        self.checkpoint_interval = max(1, self.config.COPY_CHECKPOINT_MB) * MB
+        self.verify_default = self.config.COPY_VERIFY
+
+        # Desteklenmediği görülen yöntemler bir daha denenmez
+        self._copy_file_range_ok = hasattr(os, 'copy_file_range')
+        self._sendfile_ok = hasattr(os, 'sendfile') and os.name != 'nt'
+
+        self._lock = threading.Lock()
+        self.stats = {'hardlink': 0, 'symlink': 0, 'reflink': 0, 'copy_file_range': 0, 'sendfile': 0,
+                      'buffered': 0, 'fallbacks': 0, 'resumed': 0, 'verified': 0, 'bytes': 0}
+
+    def copy(self, source: Path, target: Path, exclusive: bool = True,
+             progress: Optional[ProgressCallback] = None, verify: Optional[bool] = None) -> str:
+        """
+        Dosyayı meta verileriyle birlikte kopyalar
+
+        Args:
+            source: Kaynak dosya
+            target: Hedef dosya
+            exclusive: True ise hedef varsa FileExistsError verilir (O_EXCL / no-replace)
+            progress: (kopyalanan, toplam) bayt ile çağrılan fonksiyon
+            verify: Kopyayı hash ile doğrula (None: COPY_VERIFY ayarı)
+
+        Returns:
+            Kullanılan yöntem adı
+
+        Raises:
+            FileExistsError: exclusive ve hedef zaten var
+            CopyVerificationError: Doğrulama başarısız (hedef silinir)
+        """
+        source = Path(source)
+        target = Path(target)
+        size = source.stat().st_size
+
+        if progress is None and size >= self.resume_min_size:
+            progress = self._log_progress(source.name)
+
+        with tracing.span('copy_data', bytes=size) as span:
+            if size >= self.resume_min_size:
+                method = self._copy_resumable(source, target, size, exclusive, progress)
+            else:
+                method = self._copy_direct(source, target, size, exclusive, progress)
+            span.set(method=method)
+
+        if verify if verify is not None else self.verify_default:
+            try:
+                self.verify(source, target)
+            except CopyVerificationError:
+                target.unlink(missing_ok=True)
+                raise
+
+        with self._lock:
+            self.stats[method] += 1
+            self.stats['bytes'] += size
+        return method
+
+    def copy_with_strategy(self, source: Path, target: Path, strategy: str = 'copy',
+                           exclusive: bool = True) -> str:
+        """
+        Dosyayı seçilen stratejiyle hedefe yerleştirir; dosya sistemi
+        desteklemiyorsa bir sonraki yönteme (en sonunda tam kopyaya) düşer.
+
+        hardlink: aynı diskte bayt kopyalanmaz; iki yol aynı veriyi paylaşır
+                  (birinde yapılan değişiklik diğerinde de görünür)
+        reflink:  btrfs/XFS/APFS'te yazıldığında ayrışan paylaşımlı kopya
+        symlink:  hedefte kaynağa işaret eden sembolik bağlantı
+
+        Returns:
+            Kullanılan yöntem adı
+        """
+        methods = STRATEGY_FALLBACKS.get(strategy)
+        if methods is None:
+            self.logger.warning(f"Bilinmeyen kopyalama stratejisi '{strategy}', tam kopya kullanılıyor")
+            methods = STRATEGY_FALLBACKS['copy']
+
+        source = Path(source)
+        target = Path(target)
+        for method in methods:
+            if method == 'copy':
+                break
+            try:
+                self._place_shared(source, target, method, exclusive)
+            except (FileExistsError, FileNotFoundError):
+                raise
+            except OSError as e:
+                self.logger.debug(f"{method} kullanılamadı ({source.name}: {e}), sonraki yönteme geçiliyor")
+                with self._lock:
+                    self.stats['fallbacks'] += 1
+                continue
+            with self._lock:
+                self.stats[method] += 1
+            return method
+        return self.copy(source, target, exclusive=exclusive)
+
+    def _place_shared(self, source: Path, target: Path, method: str, exclusive: bool):
+        """Veriyi kopyalamadan hedef oluşturur; exclusive değilse geçici isimden os.replace ile"""
+        path = target if exclusive else target.with_name(f".{target.name}.{method}.tmp")
+        if method == 'hardlink':
+            os.link(source, path)
+        elif method == 'symlink':
+            os.symlink(os.path.abspath(source), path)
+        else:
+            self._reflink_file(source, path)
+        if not exclusive:
+            try:
+                if os.path.lexists(target) and os.path.samestat(os.lstat(path), os.lstat(target)):
+                    os.unlink(path)  # Hedef zaten aynı inode (rename hiçbir şey yapmaz)
+                    return
+                os.replace(path, target)
+            except BaseException:
+                os.unlink(path)
+                raise
+
+    def _reflink_file(self, source: Path, target: Path):
+        """Sadece FICLONE ile kopyalar; desteklenmiyorsa hedefi silip OSError verir"""
+        if fcntl is None:
+            raise OSError(errno.EOPNOTSUPP, "reflink bu platformda desteklenmiyor")
+        with open(source, 'rb') as src, open(target, 'xb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except BaseException:
+                dst.close()
+                os.unlink(target)
+                raise
+        self._copy_metadata(source, target)
+
+    def _copy_direct(self, source: Path, target: Path, size: int, exclusive: bool,
+                     progress: Optional[ProgressCallback]) -> str:
+        """Küçük dosyalar: doğrudan hedefe yazılır, hata olursa hedef silinir"""
+        with open(source, 'rb') as src, open(target, 'xb' if exclusive else 'wb') as dst:
+            try:
+                method = self._transfer(src, dst, 0, size, progress)
+            except BaseException:
+                dst.close()
+                os.unlink(target)
+                raise
+        self._copy_metadata(source, target)
+        return method
+
+    def _copy_resumable(self, source: Path, target: Path, size: int, exclusive: bool,
+                        progress: Optional[ProgressCallback]) -> str:
+        """Büyük dosyalar: partial dosyaya kontrol noktalarıyla yazılır, bitince yerine taşınır"""
+        if exclusive and os.path.lexists(target):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(target))
+
+        partial = target.with_name(f".{target.name}.partial")
+        checkpoint_file = target.with_name(f".{target.name}.partial.json")
+        source_stat = source.stat()
+        identity = {'source': str(source.resolve()), 'size': size, 'mtime_ns': source_stat.st_mtime_ns}
+
+        offset = self._load_checkpoint(checkpoint_file, partial, identity)
+        if offset:
+            self.logger.info(f"Yarım kalan kopya devam ediyor: {source.name} ({offset // MB}/{size // MB} MB)")
+            with self._lock:
+                self.stats['resumed'] += 1
+
+        def save_checkpoint(copied: int, dst):
+            # Önce veri diske, sonra kontrol noktası: kayıtlı ofset her zaman kalıcı veriyi gösterir
+            dst.flush()
+            os.fsync(dst.fileno())
+            self._write_checkpoint(checkpoint_file, dict(identity, copied=copied))
+
+        with open(source, 'rb') as src, open(partial, 'r+b' if offset else 'wb') as dst:
+            dst.truncate(offset)
+            method = self._transfer(src, dst, offset, size, progress, save_checkpoint)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        self._copy_metadata(source, partial)
+        if exclusive:
+            from name_index import rename_noreplace
+            rename_noreplace(partial, target)
+        else:
+            os.replace(partial, target)
+        checkpoint_file.unlink(missing_ok=True)
+        return method
+
+    def _load_checkpoint(self, checkpoint_file: Path, partial: Path, identity: Dict[str, Any]) -> int:
+        """Geçerli kontrol noktası varsa devam edilecek ofseti, yoksa 0 döndürür"""
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            copied = int(checkpoint.get('copied', 0))
+            if all(checkpoint.get(key) == value for key, value in identity.items()) \
+                    and partial.stat().st_size >= copied:
+                return copied
+            self.logger.info(f"Kontrol noktası geçersiz (kaynak değişmiş), kopya baştan başlıyor: {partial.name}")
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    @staticmethod
+    def _write_checkpoint(checkpoint_file: Path, data: Dict[str, Any]):
+        temp_file = checkpoint_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_file, checkpoint_file)
+
+    def _transfer(self, src, dst, offset: int, size: int, progress: Optional[ProgressCallback],
+                  checkpoint: Optional[Callable] = None) -> str:
+        """
+        offset'ten size'a kadar veriyi aktarır; yöntemler sırayla denenir.
+        Bir yöntem desteklenmiyorsa kalan veri bir sonrakiyle aktarılır.
+        """
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+
+        if offset == 0 and size and self.reflink_enabled and self._reflink(src_fd, dst_fd):
+            if progress:
+                progress(size, size)
+            return 'reflink'
+
+        state = {'copied': offset, 'next_checkpoint': offset + self.checkpoint_interval}
+
+        def advance(count: int):
+            state['copied'] += count
+            if progress:
+                progress(state['copied'], size)
+            if checkpoint and state['copied'] >= state['next_checkpoint']:
+                checkpoint(state['copied'], dst)
+                state['next_checkpoint'] = state['copied'] + self.checkpoint_interval
+
+        for method, transfer in (('copy_file_range', self._transfer_copy_file_range),
+                                 ('sendfile', self._transfer_sendfile),
+                                 ('buffered', self._transfer_buffered)):
+            try:
+                finished = transfer(src, dst, src_fd, dst_fd, state, size, advance)
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS or method == 'buffered':
+                    raise
+                self.logger.debug(f"{method} desteklenmiyor ({e}), sonraki yönteme geçiliyor")
+                self._disable(method)
+                continue
+            if finished:
+                if state['copied'] != size:
+                    raise OSError(errno.EIO, f"Kaynak kopyalama sırasında değişti ({state['copied']}/{size} bayt)")
+                return method
+        raise OSError(errno.EIO, "Hiçbir kopyalama yöntemi kullanılamadı")
+
+    def _reflink(self, src_fd: int, dst_fd: int) -> bool:
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return True
+        except OSError as e:
+            if e.errno in UNSUPPORTED_ERRNOS:
+                return False  # Dosya sistemi desteklemiyor veya farklı disk
+            raise
+
+    def _disable(self, method: str):
+        if method == 'copy_file_range':
+            self._copy_file_range_ok = False
+        elif method == 'sendfile':
+            self._sendfile_ok = False
+
+    def _transfer_copy_file_range(self, src, dst, src_fd, dst_fd, state, size, advance) -> bool:
+        if not self._copy_file_range_ok:
+            return False
+        while state['copied'] < size:
+            position = state['copied']
+            count = os.copy_file_range(src_fd, dst_fd, min(self.chunk_size, size - position),
+                                       offset_src=position, offset_dst=position)
+            if count == 0:
+                break  # Kaynak beklenenden kısa
+            advance(count)
+        return True
+
+    def _transfer_sendfile(self, src, dst, src_fd, dst_fd, state, size, advance) -> bool:
+        if not self._sendfile_ok:
+            return False
+        os.lseek(dst_fd, state['copied'], os.SEEK_SET)
+        while state['copied'] < size:
+            position = state['copied']
+            count = os.sendfile(dst_fd, src_fd, position, min(self.chunk_size, size - position))
+            if count == 0:
+                break
+            advance(count)
+        return True
+
+    def _transfer_buffered(self, src, dst, src_fd, dst_fd, state, size, advance) -> bool:
+        src.seek(state['copied'])
+        dst.seek(state['copied'])
+        buffer = bytearray(BUFFER_SIZE)
+        view = memoryview(buffer)
+        while state['copied'] < size:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            dst.write(view[:count])
+            advance(count)
+        dst.flush()
+        return True
+
+    @staticmethod
+    def _copy_metadata(source: Path, target: Path):
+        try:
+            shutil.copystat(source, target)
+        except OSError as e:
+            logger.debug(f"Meta veriler kopyalanamadı ({target.name}): {e}")
+
+    @staticmethod
+    def file_hash(path: Path) -> str:
+        """Dosyanın SHA-256 özetini akış halinde hesaplar"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+        return digest.hexdigest()
+
+    def verify(self, source: Path, target: Path) -> str:
+        """
+        Kaynak ve kopyanın özetlerini karşılaştırır
+
+        Returns:
+            Ortak SHA-256 özeti
+
+        Raises:
+            CopyVerificationError: Özetler farklı
+        """
+        source_hash = self.file_hash(source)
+        target_hash = self.file_hash(target)
+        if source_hash != target_hash:
+            raise CopyVerificationError(errno.EIO, f"Kopya doğrulanamadı: {source.name}", str(target))
+        with self._lock:
+            self.stats['verified'] += 1
+        return source_hash
+
+    def _log_progress(self, name: str) -> ProgressCallback:
+        """Büyük kopyalar için %10'da bir ilerleme loglayan callback"""
+        state = {'next_percent': 10}
+
+        def report(copied: int, total: int):
+            percent = copied * 100 // total if total else 100
+            if percent >= state['next_percent']:
+                self.logger.info(f"Kopyalanıyor: {name} %{percent} ({copied // MB}/{total // MB} MB)")
+                state['next_percent'] = percent // 10 * 10 + 10
+
+        return report
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+_default_engine = None
+_default_lock = threading.Lock()
+
+
+def get_copy_engine() -> CopyEngine:
+    """Uygulama genelinde paylaşılan kopyalama motoru"""
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            _default_engine = CopyEngine()
+        return _default_engine
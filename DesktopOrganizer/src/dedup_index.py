@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Tekrar Eden Dosya İndeksi - Organize klasörlerinde içerik özetine göre kopya tespiti
+
+Organize ağacındaki dosyalar SQLite'ta (yol, boyut, mtime, kısmi özet, tam
+özet) olarak tutulur. Başlangıçta ağaç sadece stat ile taranır; özetler ilk
+ihtiyaçta hesaplanıp saklanır, dosya değişmedikçe (boyut/mtime aynı) bir
+daha okunmaz. Yeni dosya için üç aşamalı kontrol yapılır:
+
+    1. Boyut: aynı boyutta dosya yoksa kopya değildir (disk okuması yok)
+    2. Kısmi özet: ilk ve son 64 KB (+ boyut) karşılaştırılır
+    3. Tam özet: sadece kısmi özeti eşleşen adaylar için akış halinde SHA-256
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+from config import Config
+from copy_engine import CopyEngine
+
+logger = logging.getLogger(__name__)
+
+# Kısmi özet için baştan ve sondan okunan bayt
+PARTIAL_BYTES = 64 * 1024
+
+# Bu boyuta kadar kısmi özet zaten tüm dosyayı kapsar
+SMALL_FILE_LIMIT = 2 * PARTIAL_BYTES
+
+# Hesaplanıp henüz indekse yazılmamış kaynak özetleri için üst sınır
+MAX_PENDING_HASHES = 1000
+
+
+def partial_hash(path: Path, size: int) -> str:
+    """Boyut + ilk ve son PARTIAL_BYTES baytın SHA-256 özeti"""
+    if size <= SMALL_FILE_LIMIT:
+        return CopyEngine.file_hash(path)
+    digest = hashlib.sha256(str(size).encode('ascii'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(PARTIAL_BYTES))
+        f.seek(-PARTIAL_BYTES, os.SEEK_END)
+        digest.update(f.read(PARTIAL_BYTES))
+    return digest.hexdigest()
+
+
+class DedupIndex:
+    """Organize ağacının kalıcı içerik özeti indeksi; thread-safe"""
+
+    def __init__(self, db_path: Path, roots: Iterable[Path]):
+        self.db_path = Path(db_path)
+        self.roots = [Path(root) for root in roots]
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[int, int, str, Optional[str]]] = {}
+        self._refresh_thread = None
+
+        self.size_rejects = 0
+        self.partial_rejects = 0
+        self.duplicates_found = 0
+        self.hashed_bytes = 0
+
+        self._conn = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                "partial_hash TEXT, full_hash TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_size ON files(size)")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Kopya indeksi veritabanı açılamadı, kopya kontrolü devre dışı: {e}")
+            self._conn = None
+
+    def is_available(self) -> bool:
+        return self._conn is not None
+
+    def start_refresh(self):
+        """Organize ağacını arka planda (sadece stat ile) tarar"""
+        if self._conn is None or (self._refresh_thread and self._refresh_thread.is_alive()):
+            return
+        self._refresh_thread = threading.Thread(target=self.refresh, name="dedup-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def refresh(self):
+        """
+        İndeksi diskle eşitler: yeni dosyalar eklenir, değişenlerin özetleri
+        silinir, kaybolanlar çıkarılır. Hiçbir dosya okunmaz.
+        """
+        if self._conn is None:
+            return
+        seen = {}
+        walked = []
+        for root in self.roots:
+            if os.path.isdir(root):
+                walked.append(os.path.join(str(root), ''))
+            for directory, _, files in os.walk(root):
+                for name in files:
+                    if name.startswith('.'):
+                        continue  # .partial gibi geçici dosyalar
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path, follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if os.path.islink(path):
+                        continue
+                    seen[path] = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            try:
+                known = {row[0]: (row[1], row[2]) for row in
+                         self._conn.execute("SELECT path, size, mtime_ns FROM files")}
+                # Tarama kilitsiz yapıldı; bu arada add() ile eklenenler silinmemeli
+                removed = [(path,) for path in known
+                           if path not in seen and path.startswith(tuple(walked)) and not os.path.lexists(path)]
+                changed = [(size, mtime_ns, path) for path, (size, mtime_ns) in seen.items()
+                           if known.get(path) != (size, mtime_ns)]
+                self._conn.executemany("DELETE FROM files WHERE path = ?", removed)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files (size, mtime_ns, path, partial_hash, full_hash) "
+                    "VALUES (?, ?, ?, NULL, NULL)", changed
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.error(f"Kopya indeksi güncellenemedi: {e}")
+                return
+        self.logger.info(f"Kopya indeksi güncellendi: {len(seen)} dosya, {len(changed)} yeni/değişmiş, {len(removed)} silinmiş")
+
+    def find_duplicate(self, source: Path) -> Optional[Path]:
+        """
+        Organize ağacında kaynakla bayt bayt aynı bir dosya arar
+
+        Returns:
+            Kopyanın yolu; yoksa None
+        """
+        if self._conn is None:
+            return None
+        stat = source.stat()
+        size = stat.st_size
+        source_key = str(source)
+
+        with self._lock:
+            try:
+                candidates = [row[0] for row in self._conn.execute(
+                    "SELECT path FROM files WHERE size = ? AND path != ?", (size, source_key))]
+            except sqlite3.Error as e:
+                self.logger.error(f"Kopya indeksi okunamadı: {e}")
+                return None
+        if not candidates:
+            self.size_rejects += 1
+            return None
+
+        source_partial = partial_hash(source, size)
+        self.hashed_bytes += min(size, 2 * PARTIAL_BYTES)
+        source_full = source_partial if size <= SMALL_FILE_LIMIT else None
+        self._remember_pending(source_key, size, stat.st_mtime_ns, source_partial, source_full)
+
+        matches = [path for path in candidates if self._candidate_hash(path, size, 'partial_hash') == source_partial]
+        if not matches:
+            self.partial_rejects += 1
+            return None
+
+        if source_full is None:
+            source_full = CopyEngine.file_hash(source)
+            self.hashed_bytes += size
+            self._remember_pending(source_key, size, stat.st_mtime_ns, source_partial, source_full)
+
+        for path in matches:
+            if self._candidate_hash(path, size, 'full_hash') == source_full:
+                self.duplicates_found += 1
+                return Path(path)
+        return None
+
+    def _candidate_hash(self, path: str, size: int, column: str) -> Optional[str]:
+        """Adayın kayıtlı özetini döndürür; yoksa veya dosya değişmişse hesaplayıp saklar"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, partial_hash, full_hash FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.remove(Path(path))
+            return None
+
+        mtime_ns, partial, full = row
+        if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+            # Dosya indekslendikten sonra değişmiş: eski özetler geçersiz
+            self._store(path, stat.st_size, stat.st_mtime_ns, None, None)
+            if stat.st_size != size:
+                return None
+            partial = full = None
+
+        if column == 'partial_hash':
+            if partial is None:
+                partial = partial_hash(Path(path), size)
+                self.hashed_bytes += min(size, 2 * PARTIAL_BYTES)
+                if size <= SMALL_FILE_LIMIT:
+                    full = partial
+                self._store(path, size, stat.st_mtime_ns, partial, full)
+            return partial
+
+        if full is None:
+            full = CopyEngine.file_hash(Path(path))
+            self.hashed_bytes += size
+            self._store(path, size, stat.st_mtime_ns, partial, full)
+        return full
+
+    def _store(self, path: str, size: int, mtime_ns: int, partial: Optional[str], full: Optional[str]):
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, partial_hash, full_hash) "
+                    "VALUES (?, ?, ?, ?, ?)", (path, size, mtime_ns, partial, full)
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.error(f"Kopya indeksi yazma hatası: {e}")
+
+    def _remember_pending(self, source_key: str, size: int, mtime_ns: int, partial: str, full: Optional[str]):
+        """Kaynak için hesaplanan özetleri, dosya hedefe yerleşince kullanmak üzere tutar"""
+        with self._lock:
+            if len(self._pending) >= MAX_PENDING_HASHES:
+                self._pending.clear()
+            self._pending[source_key] = (size, mtime_ns, partial, full)
+
+    def add(self, path: Path, source: Optional[Path] = None):
+        """
+        Organize ağacına yerleşen dosyayı indekse ekler
+
+        Args:
+            path: Dosyanın yeni yolu
+            source: Dosyanın önceki yolu (find_duplicate'te hesaplanan özetler yeniden kullanılır)
+        """
+        if self._conn is None:
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            pending = self._pending.pop(str(source), None) if source is not None else None
+        partial = full = None
+        if pending is not None and pending[0] == stat.st_size:
+            _, _, partial, full = pending
+        self._store(str(path), stat.st_size, stat.st_mtime_ns, partial, full)
+
+    def remove(self, path: Path):
+        """Dosyayı indeksten çıkarır"""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM files WHERE path = ?", (str(path),))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.error(f"Kopya indeksi silme hatası: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """İndeks ve kontrol sayaçlarını döndürür"""
+        entries = 0
+        if self._conn is not None:
+            with self._lock:
+                try:
+                    entries = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        return {
+            'entries': entries,
+            'size_rejects': self.size_rejects,
+            'partial_rejects': self.partial_rejects,
+            'duplicates_found': self.duplicates_found,
+            'hashed_bytes': self.hashed_bytes
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_dedup_index() -> DedupIndex:
+    """Uygulama genelinde paylaşılan kopya indeksi; ilk kullanımda Organize ağacını arka planda tarar"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            config = Config()
+            _default_index = DedupIndex(config.DATA_DIR / "dedup_index.db", config.CATEGORIES.values())
+            _default_index.start_refresh()
+        return _default_index
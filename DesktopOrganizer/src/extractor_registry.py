@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Çıkarıcı Kayıt Modülü - Dosya türlerini içerik çıkarıcılarına eşler
+
+Her çıkarıcı desteklediği uzantıları/MIME türlerini, maliyet sınıfını ve
+akışlı çalışıp çalışmadığını bir ExtractorSpec ile bildirir. Çıkarıcının
+kendisi "modul:fonksiyon" hedefi olarak tutulur ve eşleşen ilk dosya
+geldiğinde içe aktarılır; ağır bağımlılıklar (pdfminer, Pillow...) uygulama
+açılışında yüklenmez.
+
+Harici paketler 'desktop_organizer.extractors' giriş noktası grubuna bir
+ExtractorSpec (veya listesi) kaydederek yeni türler ekleyebilir ya da
+yerleşik bir uzantıyı (pdf, docx...) devralabilir. Giriş noktaları ilk
+aramada, eşleşmeye bakılmadan önce bir kez taranır; spec modülü hafif
+tutulmalı, ağır kod hedef modülde olmalıdır.
+"""
+
+import logging
+import mimetypes
+import threading
+from importlib import import_module
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'desktop_organizer.extractors'
+
+# Maliyet sınıfları: toplu işlemlerde sıralama ve paralellik kararları için
+COST_CHEAP = 'cheap'            # Sadece başlık/meta veri okur (arşiv listesi)
+COST_MODERATE = 'moderate'      # Sınırlı ayrıştırma (ofis XML, metin)
+COST_EXPENSIVE = 'expensive'    # Tüm dosyayı işler (PDF yerleşimi, OCR)
+COST_CLASSES = (COST_CHEAP, COST_MODERATE, COST_EXPENSIVE)
+
+
+class ExtractorSpec:
+    """
+    Bir içerik çıkarıcısının bildirimi.
+
+    Hedef fonksiyon imzası: func(file_path: Path, max_chars: int, max_bytes: int, **options) -> Optional[str]
+    """
+
+    def __init__(self, name: str, target: str, extensions: Iterable[str] = (),
+                 mime_types: Iterable[str] = (), cost: str = COST_MODERATE,
+                 streaming: bool = False, options: Optional[Dict] = None):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Geçersiz maliyet sınıfı: {cost}")
+        if ':' not in target:
+            raise ValueError(f"Hedef 'modul:fonksiyon' biçiminde olmalı: {target}")
+        self.name = name
+        self.target = target
+        self.extensions = tuple(ext.lower().lstrip('.') for ext in extensions)
+        self.mime_types = tuple(mime.lower() for mime in mime_types)
+        self.cost = cost
+        self.streaming = streaming
+        self.options = dict(options or {})
+
+    def __repr__(self):
+        return f"ExtractorSpec({self.name!r}, {self.target!r}, cost={self.cost!r}, streaming={self.streaming})"
+
+
+class ExtractorRegistry:
+    """Uzantı/MIME -> çıkarıcı eşlemesi, tembel yükleme ve giriş noktası keşfi"""
+
+    def __init__(self, discover_entry_points: bool = True):
+        self._by_extension: Dict[str, ExtractorSpec] = {}
+        self._by_mime: Dict[str, ExtractorSpec] = {}
+        self._loaded: Dict[str, Optional[Callable]] = {}
+        self._lock = threading.Lock()
+        self._discovery_lock = threading.Lock()
+        self._entry_points_discovered = not discover_entry_points
+
+    def register(self, spec: ExtractorSpec):
+        """Çıkarıcıyı kaydeder; aynı uzantı için sonradan kaydedilen öncekini geçersiz kılar"""
+        with self._lock:
+            for extension in spec.extensions:
+                previous = self._by_extension.get(extension)
+                if previous and previous.name != spec.name:
+                    logger.info(f"'.{extension}' için çıkarıcı değişti: {previous.name} -> {spec.name}")
+                self._by_extension[extension] = spec
+            for mime in spec.mime_types:
+                self._by_mime[mime] = spec
+
+    def register_many(self, specs: Iterable[ExtractorSpec]):
+        """Birden fazla çıkarıcıyı kaydeder"""
+        for spec in specs:
+            self.register(spec)
+
+    def _discover_entry_points(self):
+        """
+        Harici paketlerin giriş noktalarındaki çıkarıcı bildirimlerini yükler (bir kez)
+
+        Tarama bitene kadar diğer aramalar bekler; aksi halde eşzamanlı bir arama
+        harici çıkarıcı kaydedilmeden yerleşiği döndürebilirdi.
+        """
+        if self._entry_points_discovered:
+            return
+        with self._discovery_lock:
+            if self._entry_points_discovered:
+                return
+            try:
+                self._load_entry_points()
+            finally:
+                self._entry_points_discovered = True
+
+    def _load_entry_points(self):
+        try:
+            discovered = entry_points(group=ENTRY_POINT_GROUP)
+        except Exception as e:
+            logger.error(f"Çıkarıcı giriş noktaları okunamadı: {e}")
+            return
+
+        for entry_point in discovered:
+            try:
+                declared = entry_point.load()
+                specs = declared() if callable(declared) and not isinstance(declared, ExtractorSpec) else declared
+                if isinstance(specs, ExtractorSpec):
+                    specs = [specs]
+                for spec in specs:
+                    self.register(spec)
+                    logger.info(f"Harici çıkarıcı kaydedildi: {spec.name} ({', '.join(spec.extensions)})")
+            except Exception as e:
+                logger.error(f"Çıkarıcı giriş noktası yüklenemedi ({entry_point.name}): {e}")
+
+    def find(self, file_path: Path) -> Optional[ExtractorSpec]:
+        """
+        Dosya için uygun çıkarıcı bildirimini bulur.
+
+        Önce uzantıya, sonra tahmin edilen MIME türüne bakılır. Giriş noktaları
+        ilk aramadan önce taranır; böylece yerleşik uzantıyı devralan harici
+        çıkarıcı, aranan dosya türünden bağımsız olarak her zaman geçerlidir.
+        """
+        self._discover_entry_points()
+        return self._lookup(file_path)
+
+    def _lookup(self, file_path: Path) -> Optional[ExtractorSpec]:
+        extension = file_path.suffix.lower().lstrip('.')
+        spec = self._by_extension.get(extension)
+        if spec is None:
+            mime, _ = mimetypes.guess_type(file_path.name)
+            if mime:
+                spec = self._by_mime.get(mime.lower())
+        return spec
+
+    def load(self, spec: ExtractorSpec) -> Optional[Callable]:
+        """Çıkarıcı fonksiyonunu ilk kullanımda içe aktarır ve önbelleğe alır"""
+        if spec.target in self._loaded:
+            return self._loaded[spec.target]
+
+        module_name, _, attribute = spec.target.partition(':')
+        try:
+            func = import_module(module_name)
+            for part in attribute.split('.'):
+                func = getattr(func, part)
+            logger.debug(f"Çıkarıcı yüklendi: {spec.name} -> {spec.target}")
+        except Exception as e:
+            logger.error(f"Çıkarıcı yüklenemedi ({spec.name} -> {spec.target}): {e}")
+            func = None
+
+        with self._lock:
+            self._loaded[spec.target] = func
+        return func
+
+    def extract(self, spec: ExtractorSpec, file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+        """Bildirilen çıkarıcıyı çalıştırır"""
+        func = self.load(spec)
+        if func is None:
+            return None
+        with tracing.span('extractor', name=spec.name, target=spec.target) as span:
+            content = func(file_path, max_chars, max_bytes, **spec.options)
+            span.set(chars=len(content) if content else 0)
+        return content
+
+    def is_supported(self, file_path: Path) -> bool:
+        """Dosya için bir çıkarıcı kayıtlı mı"""
+        return self.find(file_path) is not None
+
+    def extensions(self) -> List[str]:
+        """Kayıtlı tüm uzantıları döndürür"""
+        self._discover_entry_points()
+        return list(self._by_extension.keys())
+
+    def specs(self) -> List[ExtractorSpec]:
+        """Kayıtlı (benzersiz) çıkarıcı bildirimlerini döndürür"""
+        self._discover_entry_points()
+        unique = {}
+        for spec in list(self._by_extension.values()) + list(self._by_mime.values()):
+            unique[spec.name] = spec
+        return list(unique.values())
+
+
+def builtin_extractor_specs(config) -> List[ExtractorSpec]:
+    """Uygulamayla gelen çıkarıcıların bildirimleri"""
+    sample_rows = {'sample_rows': config.CONTENT_SAMPLE_ROWS}
+    return [
+        ExtractorSpec('pdf', 'pdf_extractors:extract_pdf',
+                      extensions=['pdf'], mime_types=['application/pdf'],
+                      cost=COST_EXPENSIVE),
+        ExtractorSpec('docx', 'office_extractors:extract_docx',
+                      extensions=['docx', 'doc'],
+                      mime_types=['application/vnd.openxmlformats-officedocument.wordprocessingml.document'],
+                      streaming=True),
+        ExtractorSpec('ocr', 'image_extractors:extract_image_text',
+                      extensions=['jpg', 'jpeg', 'png', 'bmp', 'tiff', 'gif'],
+                      mime_types=['image/jpeg', 'image/png', 'image/bmp', 'image/tiff', 'image/gif'],
+                      cost=COST_EXPENSIVE),
+        ExtractorSpec('xlsx', 'office_extractors:extract_xlsx',
+                      extensions=['xlsx', 'xlsm'],
+                      mime_types=['application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'],
+                      streaming=True, options=sample_rows),
+        ExtractorSpec('csv', 'text_extractors:extract_csv',
+                      extensions=['csv'], mime_types=['text/csv'],
+                      streaming=True, options=sample_rows),
+        ExtractorSpec('ods', 'office_extractors:extract_ods',
+                      extensions=['ods'], mime_types=['application/vnd.oasis.opendocument.spreadsheet'],
+                      streaming=True, options=sample_rows),
+        ExtractorSpec('pptx', 'office_extractors:extract_pptx',
+                      extensions=['pptx'],
+                      mime_types=['application/vnd.openxmlformats-officedocument.presentationml.presentation'],
+                      streaming=True),
+        ExtractorSpec('odp', 'office_extractors:extract_odp',
+                      extensions=['odp'], mime_types=['application/vnd.oasis.opendocument.presentation'],
+                      streaming=True),
+        ExtractorSpec('odt', 'office_extractors:extract_odt',
+                      extensions=['odt'], mime_types=['application/vnd.oasis.opendocument.text'],
+                      streaming=True),
+        ExtractorSpec('rtf', 'text_extractors:extract_rtf',
+                      extensions=['rtf'], mime_types=['application/rtf', 'text/rtf'],
+                      streaming=True),
+        ExtractorSpec('archive', 'archive_extractors:extract_archive_summary',
+                      extensions=['zip', 'tar', 'gz', 'tgz', 'bz2', 'xz', '7z', 'rar'],
+                      mime_types=['application/zip', 'application/x-tar', 'application/gzip',
+                                  'application/x-7z-compressed', 'application/vnd.rar'],
+                      cost=COST_CHEAP, streaming=True,
+                      options={'max_members': config.ARCHIVE_MAX_MEMBERS,
+                               'max_stream_bytes': config.ARCHIVE_MAX_STREAM_MB * 1024 * 1024}),
+        ExtractorSpec('text', 'text_extractors:extract_plain_text',
+                      extensions=config.PLAIN_TEXT_EXTENSIONS, mime_types=['text/plain'],
+                      streaming=True),
+    ]
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_registry(config) -> ExtractorRegistry:
+    """Yerleşik çıkarıcılarla doldurulmuş paylaşılan kayıt nesnesini döndürür"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            registry = ExtractorRegistry()
+            registry.register_many(builtin_extractor_specs(config))
+            _default_registry = registry
+    return _default_registry
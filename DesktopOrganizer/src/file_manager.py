@@ -5,11 +5,19 @@ Dosya Yönetim Modülü - Dosyaları taşıma, kopyalama ve organizasyon işleml
 """
 
 import os
-import shutil
+import time
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Tuple, Any
 from config import Config # config.py dosyasından Config sınıfını içe aktar
+from name_index import get_name_index
+from copy_engine import get_copy_engine
+from dedup_index import get_dedup_index
+from move_journal import journaled
+from target_layout import TargetLayout
+from metrics import observe_stage
+import tracing
 
 class FileManager:
     """Dosya yönetimi sınıfı"""
@@ -21,66 +29,229 @@ class FileManager:
         """
         self.config = Config()
         self.logger = logging.getLogger(__name__)
+        # Klasör başına isim indeksi: çakışmada sıradaki boş ismi O(1) ayırır
+        self.name_index = get_name_index()
+        self.copy_engine = get_copy_engine()
+        # Kategori içi alt klasör düzeni (TARGET_LAYOUT)
+        self.layout = TargetLayout(self.config.TARGET_LAYOUT)
+        # İçerik özetine göre kopya kontrolü (DEDUP_POLICY 'off' değilse)
+        self.dedup_index = get_dedup_index() if self.config.DEDUP_POLICY != 'off' else None
 
     def move_file(self, source_path: Path, category: str) -> bool:
         """
         Belirtilen dosyayı (source_path) hedef kategoriye taşır.
 
+        Args:
+            source_path (Path): Taşınacak dosyanın tam yolu.
+            category (str): Dosyanın ait olduğu kategori adı.
+
+        Returns:
+            bool: Taşındıysa veya çakışma nedeniyle atlandıysa True, aksi takdirde False.
         """
-        import traceback
-        self.logger.warning(f"MOVE_FILE ÇAĞRILDI: {source_path.name} -> {category}")
-        self.logger.warning(f"CALL STACK:\n{''.join(traceback.format_stack())}")
-        
-        try:
-            # Hedef dizini belirle
+        return self.move_files([(source_path, category)])[source_path]['success']
+
+    def move_files(self, items: List[Tuple]) -> Dict[Path, Dict[str, Any]]:
+        """
+        Birden fazla dosyayı kategorilerine toplu olarak taşır.
+
+        Hedef klasör TARGET_LAYOUT şablonuyla hesaplanır (ör. Belgeler/2024/05).
+        Dosyalar hedef klasöre göre gruplanır; her klasör bir kez oluşturulur ve
+        st_dev değeri bir kez okunur. Kaynakla aynı diskteki dosyalar atomik
+        rename ile, diğerleri kopyala + sil ile taşınır.
+
+        Args:
+            items (List[Tuple]): (kaynak yol, kategori) veya (kaynak yol, kategori, yeni ad) listesi.
+
+        Returns:
+            Dict[Path, Dict]: Her kaynak için {'success': bool, 'target': Path | None,
+                              'skipped': bool, 'error': str | None}.
+        """
+        started = time.perf_counter()
+        results = {}
+        groups: Dict[Path, List[Tuple[Path, str]]] = {}
+        for source_path, category, *new_name in items:
             target_dir = self.config.CATEGORIES.get(category)
             if not target_dir:
                 self.logger.error(f"Bilinmeyen kategori: {category} için hedef dizin bulunamadı.")
-                return False
-            
-            # Hedef dizini Path objesine dönüştür (eğer config'den string olarak gelirse)
-            target_dir_path = Path(target_dir)
+                results[source_path] = self._move_result(False, error=f"Bilinmeyen kategori: {category}")
+                continue
+            try:
+                target_dir_path = self.layout.resolve(Path(target_dir), source_path,
+                                                      name=new_name[0] if new_name else None)
+            except FileNotFoundError:
+                self.logger.error(f"Taşınacak dosya bulunamadı: {source_path}")
+                results[source_path] = self._move_result(False, error="Dosya bulunamadı")
+                continue
+            groups.setdefault(target_dir_path, []).append((source_path, new_name[0] if new_name else None))
 
-            # Hedef dizini oluştur (varsa hata vermez)
-            target_dir_path.mkdir(parents=True, exist_ok=True)
-            
-            # Dosya adını al
-            file_name = source_path.name
-            
-            # Hedef yolu oluştur
-            target_path = target_dir_path / file_name
-            
-            # Dosya çakışması kontrolü ve çözüm stratejisi uygulama
-            resolved_target_path = self._handle_file_conflict(target_path)
-            
-            if resolved_target_path is None: # Strateji 'skip' ise
-                self.logger.info(f"Dosya atlandı (çakışma): {source_path}")
-                return True # Atlandıysa da işlem başarılı sayılabilir, çünkü istenen bu
-            
-            # Dosyayı taşı
-            shutil.move(str(source_path), str(resolved_target_path)) # shutil string path bekler
+        moved = skipped = failed = 0
+        for target_dir_path, sources in groups.items():
+            try:
+                # Hedef dizini bir kez oluştur ve diskini öğren
+                target_dir_path.mkdir(parents=True, exist_ok=True)
+                target_device = target_dir_path.stat().st_dev
+            except OSError as e:
+                self.logger.error(f"Hedef klasör hazırlanamadı '{target_dir_path}': {e}")
+                for source_path, _ in sources:
+                    results[source_path] = self._move_result(False, error=str(e))
+                failed += len(sources)
+                continue
 
-            self.logger.info(f"Dosya taşındı: '{source_path.name}' -> '{resolved_target_path}'")
-            return True
+            for source_path, new_name in sources:
+                move_started = time.perf_counter()
+                with tracing.span('move', file=source_path.name, target_dir=str(target_dir_path)) as span:
+                    result = self._move_one(source_path, target_dir_path, target_device, new_name)
+                    span.set(target=str(result['target']) if result['target'] else None,
+                             skipped=result['skipped'], error=result['error'])
+                results[source_path] = result
+                if result['skipped']:
+                    skipped += 1
+                    outcome = 'skipped'
+                elif result['success']:
+                    moved += 1
+                    outcome = 'ok'
+                else:
+                    failed += 1
+                    outcome = 'failed'
+                observe_stage('move', time.perf_counter() - move_started, outcome)
+
+        elapsed = time.perf_counter() - started
+        self.logger.info(
+            "Toplu taşıma: %d taşındı, %d atlandı, %d başarısız, %d klasör, %.2f sn",
+            moved, skipped, failed, len(groups), elapsed
+        )
+        return results
+
+    def _move_one(self, source_path: Path, target_dir_path: Path, target_device: int,
+                  new_name: str = None) -> Dict[str, Any]:
+        """Tek dosyayı hazırlanmış hedef klasöre (verilmişse yeni adıyla) taşır"""
+        file_name = new_name or source_path.name
+        try:
+            same_device = source_path.stat().st_dev == target_device
+            strategy = self.config.CONFLICT_RESOLUTION
+
+            duplicate_result = self._apply_dedup_policy(source_path, target_dir_path, remove_source=True, file_name=file_name)
+            if duplicate_result is not None:
+                return duplicate_result
+
+            if strategy == 'rename':
+                # Boş isim ayırma ve hedefin üzerine yazmayan taşıma tek adımda
+                resolved_target_path = self.name_index.move(source_path, target_dir_path, file_name, same_device)
+            else:
+                # Dosya çakışması kontrolü ve çözüm stratejisi uygulama
+                resolved_target_path = self._handle_file_conflict(target_dir_path / file_name)
+
+                if resolved_target_path is None: # Strateji 'skip' ise
+                    self.logger.info(f"Dosya atlandı (çakışma): {source_path}")
+                    return self._move_result(True, skipped=True) # Atlandıysa da işlem başarılı sayılabilir, çünkü istenen bu
+
+                if same_device:
+                    journaled('move', os.replace)(source_path, resolved_target_path) # Aynı disk: atomik
+                else:
+                    journaled('move', self._copy_and_unlink)(source_path, resolved_target_path)
+
+            if self.dedup_index is not None:
+                self.dedup_index.add(resolved_target_path, source=source_path)
+            self.logger.debug("Dosya taşındı: %s -> %s (aynı disk: %s)", source_path.name, resolved_target_path, same_device)
+            return self._move_result(True, target=resolved_target_path)
 
         except FileNotFoundError:
             self.logger.error(f"Taşınacak dosya bulunamadı: {source_path}")
-            return False
+            return self._move_result(False, error="Dosya bulunamadı")
         except Exception as e:
-            self.logger.error(f"Dosya taşıma hatası '{source_path.name}' -> '{target_dir}': {e}", exc_info=True)
-            return False
+            self.logger.error(f"Dosya taşıma hatası '{source_path.name}' -> '{target_dir_path}': {e}")
+            return self._move_result(False, error=str(e))
+
+    def _copy_and_unlink(self, source_path: Path, target_path: Path):
+        """Farklı diskler arası taşıma: hedefin üzerine yazarak kopyala, sonra kaynağı sil"""
+        self.copy_engine.copy(source_path, target_path, exclusive=False)
+        os.unlink(source_path)
+
+    def _copy_overwrite(self, source_path: Path, target_path: Path):
+        """COPY_STRATEGY'ye göre link/reflink veya meta verilerle tam kopya (üzerine yazar)"""
+        self.copy_engine.copy_with_strategy(source_path, target_path, self.config.COPY_STRATEGY, exclusive=False)
+
+    def _apply_dedup_policy(self, source_path: Path, target_dir_path: Path, remove_source: bool,
+                            file_name: str = None) -> Dict[str, Any] | None:
+        """
+        Organize ağacında kaynakla aynı içerikte dosya varsa DEDUP_POLICY'yi uygular.
 
-    def copy_file(self, source_path: Path, category: str) -> bool:
+        Args:
+            source_path (Path): Yerleştirilecek dosya.
+            target_dir_path (Path): Hedef klasör.
+            remove_source (bool): Taşıma işlemi mi (hardlink sonrası kaynak silinir).
+            file_name (str): Hedefteki dosya adı (verilmezse kaynağın adı).
+
+        Returns:
+            Dict | None: Politika işlemi tamamladıysa sonuç; normal taşıma/kopyalama
+                         yapılacaksa None.
+        """
+        if self.dedup_index is None:
+            return None
+        try:
+            with tracing.span('dedup_check') as span:
+                duplicate = self.dedup_index.find_duplicate(source_path)
+                span.set(duplicate=str(duplicate) if duplicate else None)
+        except OSError as e:
+            self.logger.warning(f"Kopya kontrolü yapılamadı '{source_path.name}': {e}")
+            return None
+        if duplicate is None:
+            return None
+
+        policy = self.config.DEDUP_POLICY
+        if policy == 'skip':
+            self.logger.info(f"Dosya atlandı (aynı içerik zaten var): '{source_path.name}' = '{duplicate}'")
+            return self._move_result(True, target=duplicate, skipped=True)
+
+        if policy == 'hardlink':
+            # Bayt kopyalamadan mevcut dosyaya bağlantı; isim çakışırsa sıradaki boş isim
+            if remove_source:
+                # Taşıma olarak günlüğe yazılır: geri alınınca dosya kaynağın yerine döner
+                def link_and_unlink(source: Path, target: Path):
+                    os.link(duplicate, target)
+                    os.unlink(source)
+                source, operation = source_path, journaled('move', link_and_unlink)
+            else:
+                source, operation = duplicate, journaled('link', os.link)
+            try:
+                target = self.name_index.place(source, target_dir_path, file_name or source_path.name, operation)
+            except OSError as e:
+                self.logger.warning(f"Kopya için hard link oluşturulamadı, normal işleme devam ediliyor: {e}")
+                return None
+            if remove_source and source_path.parent != target_dir_path:
+                self.name_index.release(source_path.parent, source_path.name)
+            self.dedup_index.add(target, source=source_path)
+            self.logger.info(f"Aynı içerik bağlandı: '{source_path.name}' -> '{target}' (= '{duplicate}')")
+            return self._move_result(True, target=target)
+
+        self.logger.warning(f"Aynı içerikte dosya zaten var: '{source_path.name}' = '{duplicate}'")
+        return None
+
+    @staticmethod
+    def _move_result(success: bool, target: Path = None, skipped: bool = False, error: str = None) -> Dict[str, Any]:
+        return {'success': success, 'target': target, 'skipped': skipped, 'error': error}
+
+    def copy_file(self, source_path: Path, category: str, new_name: str = None) -> bool:
         """
         Belirtilen dosyayı (source_path) hedef kategoriye kopyalar.
 
         Args:
             source_path (Path): Kopyalanacak dosyanın tam yolu.
             category (str): Dosyanın ait olduğu kategori adı.
+            new_name (str): Hedefteki dosya adı (verilmezse kaynağın adı).
 
         Returns:
             bool: Dosya kopyalama işlemi başarılıysa True, aksi takdirde False.
         """
+        started = time.perf_counter()
+        with tracing.span('copy', file=source_path.name, category=category) as span:
+            success = self._copy_file(source_path, category, new_name)
+            span.set(success=success)
+        observe_stage('copy', time.perf_counter() - started, 'ok' if success else 'failed')
+        return success
+
+    def _copy_file(self, source_path: Path, category: str, new_name: str = None) -> bool:
+        """copy_file'ın asıl işi (süre ölçümü dışında)"""
         try:
             # Hedef dizini belirle
             target_dir = self.config.CATEGORIES.get(category)
@@ -88,28 +259,40 @@ class FileManager:
                 self.logger.error(f"Bilinmeyen kategori: {category} için hedef dizin bulunamadı.")
                 return False
             
-            # Hedef dizini Path objesine dönüştür
-            target_dir_path = Path(target_dir)
+            # Hedef dizini düzen şablonuna göre belirle (ör. Belgeler/2024/05)
+            target_dir_path = self.layout.resolve(Path(target_dir), source_path, name=new_name)
 
             # Hedef dizini oluştur
             target_dir_path.mkdir(parents=True, exist_ok=True)
             
             # Dosya adını al
-            file_name = source_path.name
-            
-            # Hedef yolu oluştur
-            target_path = target_dir_path / file_name
-            
-            # Dosya çakışması kontrolü
-            resolved_target_path = self._handle_file_conflict(target_path)
-            
-            if resolved_target_path is None: # Strateji 'skip' ise
-                self.logger.info(f"Dosya atlandı (çakışma): {source_path}")
-                return True
+            file_name = new_name or source_path.name
+
+            duplicate_result = self._apply_dedup_policy(source_path, target_dir_path, remove_source=False,
+                                                        file_name=file_name)
+            if duplicate_result is not None:
+                return duplicate_result['success']
             
-            # Dosyayı kopyala (meta verilerle birlikte)
-            shutil.copy2(str(source_path), str(resolved_target_path))
+            if self.config.CONFLICT_RESOLUTION == 'rename':
+                # Boş isim ayırma ve O_EXCL ile kopyalama (COPY_STRATEGY: link/reflink/tam kopya)
+                resolved_target_path = self.name_index.copy(source_path, target_dir_path, file_name,
+                                                            self.config.COPY_STRATEGY)
+            else:
+                # Hedef yolu oluştur
+                target_path = target_dir_path / file_name
+                
+                # Dosya çakışması kontrolü
+                resolved_target_path = self._handle_file_conflict(target_path)
+                
+                if resolved_target_path is None: # Strateji 'skip' ise
+                    self.logger.info(f"Dosya atlandı (çakışma): {source_path}")
+                    return True
+                
+                # Dosyayı kopyala (COPY_STRATEGY'ye göre link/reflink veya meta verilerle tam kopya)
+                journaled('copy', self._copy_overwrite)(source_path, resolved_target_path)
 
+            if self.dedup_index is not None:
+                self.dedup_index.add(resolved_target_path, source=source_path)
             self.logger.info(f"Dosya kopyalandı: '{source_path.name}' -> '{resolved_target_path}'")
             return True
 
@@ -143,26 +326,11 @@ class FileManager:
         strategy = self.config.CONFLICT_RESOLUTION # config'den stratejiyi al
 
         if strategy == 'rename':
-            # Yeni bir isim bul (örn: dosya_1.txt, dosya_2.txt)
-            counter = 1
-            while True:
-                new_name = f"{file_stem}_{counter}{file_suffix}"
-                new_path = file_dir / new_name # Path objesi ile yol birleştirme
-                
-                if not new_path.exists():
-                    self.logger.info(f"Dosya çakışması 'yeniden adlandır' stratejisiyle çözüldü: '{new_path.name}'")
-                    return new_path
-                
-                counter += 1
-                
-                # Sonsuz döngüden korunma (aşırı deneme durumunda zaman damgasına geç)
-                if counter > 1000:
-                    self.logger.warning(
-                        f"1000'den fazla yeniden adlandırma denemesi başarısız oldu. '{target_path.name}' için zaman damgası eklenecek."
-                    )
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    new_name = f"{file_stem}_{timestamp}{file_suffix}"
-                    return file_dir / new_name
+            # İndeksten sıradaki boş ismi ayır (örn: dosya_1.txt, dosya_2.txt).
+            # Yarışa karşı güvenli taşıma için name_index.move/copy kullanılmalı.
+            new_path = self.name_index.allocate(file_dir, target_path.name)
+            self.logger.info(f"Dosya çakışması 'yeniden adlandır' stratejisiyle çözüldü: '{new_path.name}'")
+            return new_path
 
         elif strategy == 'overwrite':
             # Mevcut dosyanın üzerine yaz
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Dosya Durum Deposu - Masaüstü dosyalarının işlenme durumları
+
+Her dosya (tam yol) için son durum SQLite'ta (WAL) tutulur, sık okunanlar
+bellekteki sınırlı bir LRU'da önbelleklenir:
+
+    seen            izleyici dosyayı gördü
+    stabilizing     yazma işleminin bitmesi bekleniyor
+    extracting      içerik çıkarılıyor / AI önerisi isteniyor
+    awaiting_user   onay penceresi açık
+    done            işlendi (taşındı, kopyalandı veya atlandı)
+    kept_on_desktop kullanıcı masaüstünde kalmasını istedi; tekrar işlenmez
+
+Bir dosyayı aynı anda tek bir işçinin işlemesi begin()/release() ile
+sağlanır; anahtar başına kilitler sabit sayıda kilide dağıtılır (striping),
+böylece bellek dosya sayısıyla büyümez. "kept_on_desktop" yeniden
+başlatmadan sonra da geçerlidir; yarım kalan etkin durumlar açılışta silinir.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+SEEN = 'seen'
+STABILIZING = 'stabilizing'
+EXTRACTING = 'extracting'
+AWAITING_USER = 'awaiting_user'
+DONE = 'done'
+KEPT_ON_DESKTOP = 'kept_on_desktop'
+
+STATES = (SEEN, STABILIZING, EXTRACTING, AWAITING_USER, DONE, KEPT_ON_DESKTOP)
+ACTIVE_STATES = (SEEN, STABILIZING, EXTRACTING, AWAITING_USER)
+
+# Anahtar kilitleri bu kadar kilide dağıtılır
+LOCK_STRIPES = 64
+
+# Temizlik her bu kadar yazmada bir çalışır
+EVICTION_INTERVAL = 200
+
+
+class FileStateStore:
+    """Thread-safe, kalıcı dosya durum deposu"""
+
+    def __init__(self, db_path: Path, memory_entries: int = 1024,
+                 retention_days: int = 30, max_entries: int = 100000):
+        self.db_path = Path(db_path)
+        self.memory_entries = memory_entries
+        self.retention_seconds = retention_days * 86400
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._db_lock = threading.Lock()
+        self._memory = OrderedDict()  # anahtar -> durum
+        self._claimed = set()         # şu an bir işçinin işlediği anahtarlar
+        self._writes = 0
+
+        self._conn = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_states ("
+                "key TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_file_states_updated ON file_states(state, updated)")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Dosya durum veritabanı açılamadı, durumlar sadece bellekte tutulacak: {e}")
+            self._conn = None
+
+    def lock(self, key: str) -> threading.Lock:
+        """Anahtarın kilidi (aynı kilidi paylaşan başka anahtarlar olabilir)"""
+        return self._stripes[hash(key) % LOCK_STRIPES]
+
+    def reset_active(self) -> int:
+        """Önceki çalışmadan kalan etkin durumları siler (açılışta çağrılır)"""
+        with self._db_lock:
+            self._memory.clear()
+            if self._conn is None:
+                return 0
+            try:
+                cursor = self._conn.execute(
+                    f"DELETE FROM file_states WHERE state IN ({','.join('?' * len(ACTIVE_STATES))})", ACTIVE_STATES)
+                self._conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                self.logger.error(f"Dosya durumları sıfırlanamadı: {e}")
+                return 0
+
+    def get_state(self, key: str) -> Optional[str]:
+        """Anahtarın son durumu; kaydı yoksa None"""
+        with self._db_lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute("SELECT state FROM file_states WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                self.logger.error(f"Dosya durumu okunamadı: {e}")
+                return None
+            state = row[0] if row else None
+            if state is not None:
+                self._remember(key, state)
+            return state
+
+    def set_state(self, key: str, state: str):
+        """Anahtarın durumunu kaydeder"""
+        if state not in STATES:
+            raise ValueError(f"Bilinmeyen dosya durumu: {state}")
+        now = time.time()
+        with self._db_lock:
+            self._remember(key, state)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO file_states (key, state, updated) VALUES (?, ?, ?)", (key, state, now))
+                self._conn.commit()
+                self._writes += 1
+                if self._writes % EVICTION_INTERVAL == 0:
+                    self._evict(now)
+            except sqlite3.Error as e:
+                self.logger.error(f"Dosya durumu yazılamadı: {e}")
+
+    def note(self, key: str, state: str):
+        """İzleyiciden gelen durumu (seen/stabilizing) dosya işlenmiyorsa kaydeder"""
+        with self.lock(key):
+            if key in self._claimed or self.get_state(key) == KEPT_ON_DESKTOP:
+                return
+            self.set_state(key, state)
+
+    def begin(self, key: str) -> Optional[str]:
+        """
+        Dosyayı işlemek için sahiplenir
+
+        Returns:
+            None: sahiplenildi (iş bitince release çağrılmalı)
+            durum: işlenemez; başka bir işçi işliyor (etkin durum) veya
+                   kullanıcı masaüstünde kalmasını istemiş (kept_on_desktop)
+        """
+        with self.lock(key):
+            state = self.get_state(key)
+            if state == KEPT_ON_DESKTOP:
+                return state
+            with self._db_lock:
+                if key in self._claimed:
+                    return state or SEEN
+                self._claimed.add(key)
+            if state not in (SEEN, STABILIZING):
+                self.set_state(key, SEEN)
+            return None
+
+    def release(self, key: str):
+        """Sahipliği bırakır; durum hâlâ etkinse 'done' yapılır"""
+        with self.lock(key):
+            with self._db_lock:
+                self._claimed.discard(key)
+            if self.get_state(key) in ACTIVE_STATES:
+                self.set_state(key, DONE)
+
+    def is_processing(self, key: str) -> bool:
+        with self._db_lock:
+            return key in self._claimed
+
+    def forget(self, key: str):
+        """Dosya silindi: kaydı tamamen kaldırır"""
+        with self.lock(key):
+            with self._db_lock:
+                self._memory.pop(key, None)
+                self._claimed.discard(key)
+                if self._conn is None:
+                    return
+                try:
+                    self._conn.execute("DELETE FROM file_states WHERE key = ?", (key,))
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    self.logger.error(f"Dosya durumu silinemedi: {e}")
+
+    def _remember(self, key: str, state: str):
+        """Bellek LRU'suna ekler (_db_lock altında çağrılır)"""
+        self._memory[key] = state
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        """
+        Eski 'done' kayıtlarını, dosyası artık olmayan 'kept_on_desktop'
+        kayıtlarını ve max_entries üstünü siler (_db_lock altında çağrılır)
+        """
+        self._conn.execute("DELETE FROM file_states WHERE state = ? AND updated < ?",
+                           (DONE, now - self.retention_seconds))
+        missing = [(key,) for (key,) in self._conn.execute(
+            "SELECT key FROM file_states WHERE state = ?", (KEPT_ON_DESKTOP,)) if not os.path.lexists(key)]
+        self._conn.executemany("DELETE FROM file_states WHERE key = ?", missing)
+        self._conn.execute(
+            "DELETE FROM file_states WHERE state != ? AND key IN ("
+            "SELECT key FROM file_states WHERE state != ? ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+            (KEPT_ON_DESKTOP, KEPT_ON_DESKTOP, self.max_entries)
+        )
+        self._conn.commit()
+        for (key,) in missing:
+            self._memory.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Durum başına kayıt sayıları"""
+        stats: Dict[str, Any] = {state: 0 for state in STATES}
+        with self._db_lock:
+            stats['processing'] = len(self._claimed)
+            stats['memory_entries'] = len(self._memory)
+            if self._conn is not None:
+                try:
+                    for state, count in self._conn.execute("SELECT state, COUNT(*) FROM file_states GROUP BY state"):
+                        stats[state] = count
+                except sqlite3.Error:
+                    pass
+        return stats
+
+    def close(self):
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
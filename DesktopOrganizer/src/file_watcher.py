@@ -11,13 +11,18 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
 from config import Config
+from metrics import observe_stage
+import tracing
 
 class FileEventHandler(FileSystemEventHandler):
     """Dosya olaylarını yöneten sınıf"""
     
-    def __init__(self, callback, delete_callback=None):
+    def __init__(self, callback, delete_callback=None, prefetch_callback=None, cancel_prefetch_callback=None):
         self.callback = callback
         self.delete_callback = delete_callback
+        # Kararlılık beklenirken AI önerisini önceden istemek için (isteğe bağlı)
+        self.prefetch_callback = prefetch_callback
+        self.cancel_prefetch_callback = cancel_prefetch_callback
         self.config = Config()
         self.logger = logging.getLogger(__name__)
         
@@ -112,6 +117,15 @@ class FileEventHandler(FileSystemEventHandler):
         Dosyanın kararlı olup olmadığını kontrol et (kopyalama/yazma tamamlandı mı?).
         Belirli bir süre boyunca boyutunun değişmediğini kontrol eder.
         """
+        started = time.perf_counter()
+        with tracing.span('stability', checks=self.config.FILE_STABILITY_CHECKS) as span:
+            stable = self._check_stable(file_path)
+            span.set(stable=stable)
+        observe_stage('event_to_stable', time.perf_counter() - started, 'stable' if stable else 'unstable')
+        return stable
+    
+    def _check_stable(self, file_path: Path) -> bool:
+        """Boyutu FILE_STABILITY_CHECKS kez aralıklarla karşılaştırır"""
         try:
             initial_size = -1
             for _ in range(self.config.FILE_STABILITY_CHECKS):
@@ -135,6 +149,22 @@ class FileEventHandler(FileSystemEventHandler):
             self.logger.error(f"Dosya kararlılık kontrolü hatası ({file_path.name}): {e}", exc_info=True)
             return False
     
+    def _prefetch(self, file_path: Path):
+        """Kararlılık beklenmeden spekülatif içerik çıkarma/AI isteğini başlatır"""
+        if self.prefetch_callback:
+            try:
+                self.prefetch_callback(file_path)
+            except Exception as e:
+                self.logger.error(f"Ön getirme başlatma hatası ({file_path.name}): {e}")
+    
+    def _cancel_prefetch(self, file_path: Path):
+        """Dosya silindi/yeniden adlandırıldı: spekülatif işi iptal eder"""
+        if self.cancel_prefetch_callback:
+            try:
+                self.cancel_prefetch_callback(file_path)
+            except Exception as e:
+                self.logger.error(f"Ön getirme iptal hatası ({file_path.name}): {e}")
+    
     def on_created(self, event):
         """Yeni dosya veya dizin oluşturulduğunda çalışır"""
         if event.is_directory:
@@ -160,12 +190,16 @@ class FileEventHandler(FileSystemEventHandler):
         
         self.logger.info(f"Yeni dosya tespit edildi: {file_path.name}")
         
-        # Dosyanın tamamen yazılmasını bekle
-        if self.is_file_stable(file_path):
-            self.logger.info(f"Dosya kararlı, işleme başlanıyor: {file_path.name}")
-            self.callback(file_path) # Callback'e Path objesini gönder
-        else:
-            self.logger.warning(f"Dosya henüz kararlı değil, işlenmiyor: {file_path.name}")
+        # Kararlılık beklenirken AI önerisini önceden iste
+        self._prefetch(file_path)
+        
+        # Dosyanın tamamen yazılmasını bekle (bekleme ve işleme tek iz altında)
+        with tracing.start_trace('file', path=str(file_path), event='created'):
+            if self.is_file_stable(file_path):
+                self.logger.info(f"Dosya kararlı, işleme başlanıyor: {file_path.name}")
+                self.callback(file_path) # Callback'e Path objesini gönder
+            else:
+                self.logger.warning(f"Dosya henüz kararlı değil, işlenmiyor: {file_path.name}")
     
     # on_modified olayını ekleyelim, çünkü bazı programlar dosyaları 'oluşturmak' yerine 'değiştirir'.
     def on_modified(self, event):
@@ -188,8 +222,10 @@ class FileEventHandler(FileSystemEventHandler):
         # Ancak is_file_stable zaten bir gecikme ve kontrol sağladığı için şimdilik yeterli olabilir.
 
         self.logger.info(f"Mevcut dosya değiştirildi: {file_path.name}")
-        if self.is_file_stable(file_path):
-            self.callback(file_path)
+        self._prefetch(file_path)
+        with tracing.start_trace('file', path=str(file_path), event='modified'):
+            if self.is_file_stable(file_path):
+                self.callback(file_path)
 
     def on_moved(self, event):
         """Dosya taşındığında veya yeniden adlandırıldığında çalışır"""
@@ -202,6 +238,9 @@ class FileEventHandler(FileSystemEventHandler):
         # DEBUG: Her move eventini logla
         self.logger.info(f"MOVE EVENT: {src_path.name} -> {dest_path}")
         
+        # Eski yol için başlatılmış spekülatif iş artık geçersiz
+        self._cancel_prefetch(src_path)
+        
         # Pending new files listesinde bu dosya var mı? (rename işlemi olabilir)
         src_key = str(src_path)
         if src_key in self.pending_new_files:
@@ -219,8 +258,11 @@ class FileEventHandler(FileSystemEventHandler):
             else:
                 # Artık gerçek bir isim, işle
                 self.logger.info(f"Dosya gerçek isim aldı, işleniyor: {dest_path.name}")
-                if dest_path.exists() and self.is_file_stable(dest_path):
-                    self.callback(dest_path)
+                if dest_path.exists():
+                    self._prefetch(dest_path)
+                with tracing.start_trace('file', path=str(dest_path), event='renamed'):
+                    if dest_path.exists() and self.is_file_stable(dest_path):
+                        self.callback(dest_path)
                 return
         
         # Hedef yolu ignore et
@@ -244,8 +286,10 @@ class FileEventHandler(FileSystemEventHandler):
             if src_from_organize:
                 # Organize klasöründen masaüstüne geri taşındı, işle
                 self.logger.info(f"Dosya organize klasöründen masaüstüne taşındı: '{src_path.name}' -> '{dest_path.name}'")
-                if self.is_file_stable(dest_path):
-                    self.callback(dest_path)
+                self._prefetch(dest_path)
+                with tracing.start_trace('file', path=str(dest_path), event='moved_back'):
+                    if self.is_file_stable(dest_path):
+                        self.callback(dest_path)
             else:
                 # Masaüstünde yeniden adlandırılma - bu durumda işleme (zaten organize edildiyse tekrar edilecek)
                 self.logger.debug(f"Dosya masaüstünde yeniden adlandırıldı (tekrar işlenmeyecek): '{src_path.name}' -> '{dest_path.name}'")
@@ -263,6 +307,9 @@ class FileEventHandler(FileSystemEventHandler):
         # DEBUG: Her delete eventini logla
         self.logger.warning(f"DELETE EVENT: {file_path.name} silindi!")
         
+        # Silinen dosya için spekülatif işi iptal et
+        self._cancel_prefetch(file_path)
+        
         # Pending listesinden çıkar (silinmişse)
         file_key = str(file_path)
         if file_key in self.pending_new_files:
@@ -308,10 +355,11 @@ class FileEventHandler(FileSystemEventHandler):
                 self.logger.info(f"Timeout olan dosya işleniyor: {file_path.name}")
                 
                 # Dosyanın kararlı olup olmadığını kontrol et
-                if self.is_file_stable(file_path):
-                    self.callback(file_path)
-                else:
-                    self.logger.warning(f"Timeout olan dosya kararlı değil: {file_path.name}")
+                with tracing.start_trace('file', path=str(file_path), event='pending_timeout'):
+                    if self.is_file_stable(file_path):
+                        self.callback(file_path)
+                    else:
+                        self.logger.warning(f"Timeout olan dosya kararlı değil: {file_path.name}")
             else:
                 self.logger.debug(f"Timeout olan dosya bulunamadı veya ignore listesinde: {file_path.name}")
 
@@ -319,7 +367,7 @@ class FileEventHandler(FileSystemEventHandler):
 class DesktopWatcher:
     """Masaüstünü izleyen ana sınıf"""
     
-    def __init__(self, callback, delete_callback=None):
+    def __init__(self, callback, delete_callback=None, prefetch_callback=None, cancel_prefetch_callback=None):
         self.callback = callback
         self.delete_callback = delete_callback
         self.config = Config()
@@ -327,7 +375,7 @@ class DesktopWatcher:
         
         # Observer ve event handler'ı oluştur
         self.observer = Observer()
-        self.event_handler = FileEventHandler(callback, delete_callback)
+        self.event_handler = FileEventHandler(callback, delete_callback, prefetch_callback, cancel_prefetch_callback)
         
         # İzleme dizinini kontrol et
         # WATCH_DIRECTORY Path objesi olabilir, os.path.exists string bekler
@@ -386,7 +434,8 @@ class DesktopWatcher:
                         
                         # Dosya hala var mı tekrar kontrol et
                         if file_path.exists():
-                            self.callback(file_path) # Callback'e Path objesini gönder
+                            with tracing.start_trace('file', path=str(file_path), event='existing'):
+                                self.callback(file_path) # Callback'e Path objesini gönder
                         else:
                             self.logger.debug(f"Mevcut dosya kayboldu: {file_path.name}")
                     else:
@@ -9,14 +9,21 @@ import json
 import logging
 from pathlib import Path
 from config import Config
+import tracing
 
 class FileConfirmationDialog:
     """Dosya taşıma onay dialogu"""
     
-    def __init__(self, file_path, suggested_category, ai_suggested_name=None):
+    # Arka plandaki AI önerisinin kontrol aralığı (ms)
+    AI_POLL_INTERVAL_MS = 200
+    
+    def __init__(self, file_path, suggested_category, ai_suggested_name=None,
+                 name_source='ai', ai_suggestion_future=None):
         self.file_path = Path(file_path)
         self.suggested_category = suggested_category
         self.ai_suggested_name = ai_suggested_name
+        self.name_source = name_source  # 'ai' veya 'local'
+        self.ai_suggestion_future = ai_suggestion_future
         self.result = None
         self.root = None
         self.config = Config()
@@ -64,9 +71,11 @@ class FileConfirmationDialog:
             ttk.Label(main_frame, text=self.file_path.name, font=('Arial', 9), foreground='gray').grid(row=current_row, column=1, sticky=tk.W)
             current_row += 1
             
-            # AI önerisi
-            ttk.Label(main_frame, text="AI Önerisi:", font=('Arial', 9, 'bold')).grid(row=current_row, column=0, sticky=tk.W, padx=(20, 5))
-            ttk.Label(main_frame, text=self.ai_suggested_name, font=('Arial', 9, 'bold'), foreground='green').grid(row=current_row, column=1, sticky=tk.W)
+            # AI önerisi (yerel öneri gösteriliyorsa AI yanıtı gelince güncellenir)
+            self.name_source_var = tk.StringVar(value=self._source_label())
+            self.suggested_name_var = tk.StringVar(value=self.ai_suggested_name)
+            ttk.Label(main_frame, textvariable=self.name_source_var, font=('Arial', 9, 'bold')).grid(row=current_row, column=0, sticky=tk.W, padx=(20, 5))
+            ttk.Label(main_frame, textvariable=self.suggested_name_var, font=('Arial', 9, 'bold'), foreground='green').grid(row=current_row, column=1, sticky=tk.W)
             current_row += 1
             
             # Dosya adı seçimi
@@ -148,11 +157,38 @@ class FileConfirmationDialog:
         self.root.bind('<Return>', lambda e: self._set_result('move'))
         self.root.bind('<Escape>', lambda e: self._set_result('skip'))
         
+        # Yerel öneri gösteriliyorsa AI önerisini arka planda bekle
+        if self.filename_var and self.name_source == 'local' and self.ai_suggestion_future is not None:
+            self.root.after(self.AI_POLL_INTERVAL_MS, self._poll_ai_suggestion)
+        
         # Dialog'u bekle
         self.root.wait_window()
         
         return self.result
     
+    def _source_label(self):
+        return "AI Önerisi:" if self.name_source == 'ai' else "Yerel Öneri:"
+    
+    def _poll_ai_suggestion(self):
+        """AI önerisi hazırsa yerel önerinin yerine koyar, değilse tekrar kontrol eder"""
+        if self.result is not None:
+            return
+        if not self.ai_suggestion_future.done():
+            self.root.after(self.AI_POLL_INTERVAL_MS, self._poll_ai_suggestion)
+            return
+        try:
+            ai_result = self.ai_suggestion_future.result()
+        except Exception as e:
+            self.logger.error(f"AI önerisi alınamadı: {e}")
+            return
+        if ai_result.get('success') and ai_result.get('suggested_name'):
+            self.ai_suggested_name = ai_result['suggested_name']
+            self.name_source = 'ai'
+            self.suggested_name_var.set(self.ai_suggested_name)
+            self.name_source_var.set(self._source_label())
+            self.logger.info(f"Yerel öneri AI önerisiyle güncellendi: {self.ai_suggested_name}")
+            tracing.annotate(ai_name_arrived=True)
+    
     def _set_result(self, action):
         """Sonucu ayarla ve pencereyi kapat"""
         selected_category = self.category_var.get()
@@ -172,6 +208,7 @@ class FileConfirmationDialog:
             'extension': self.file_path.suffix.lower(),
             'use_ai_name': use_ai_name,
             'final_filename': final_filename,
+            'name_source': self.name_source if use_ai_name else None,
             'keep_on_desktop': action == 'stay_desktop'
         }
         
@@ -556,17 +593,29 @@ def show_startup_preferences(preferences_summary):
         return 'keep'  # Varsayılan olarak tercihleri tut
 
 
-def show_file_confirmation(file_path, suggested_category, ai_suggested_name=None):
-    """Dosya onay dialogunu göster - main fonksiyon"""
+def show_file_confirmation(file_path, suggested_category, ai_suggested_name=None,
+                           name_source='ai', ai_suggestion_future=None):
+    """
+    Dosya onay dialogunu göster - main fonksiyon
+    
+    name_source 'local' ise ai_suggestion_future (varsa) pencere açıkken
+    beklenir ve geldiğinde öneri güncellenir.
+    """
     try:
-        # Tkinter root window oluştur (gizli)
-        root = tk.Tk()
-        root.withdraw()  # Ana pencereyi gizle
-        
-        dialog = FileConfirmationDialog(file_path, suggested_category, ai_suggested_name)
-        result = dialog.show()
-        
-        root.destroy()
+        with tracing.span('user_dialog', category=suggested_category, name_source=name_source,
+                          suggested_name=ai_suggested_name) as span:
+            # Tkinter root window oluştur (gizli)
+            root = tk.Tk()
+            root.withdraw()  # Ana pencereyi gizle
+            
+            dialog = FileConfirmationDialog(file_path, suggested_category, ai_suggested_name,
+                                            name_source, ai_suggestion_future)
+            result = dialog.show()
+            
+            root.destroy()
+            if result:
+                span.set(action=result['action'], chosen_category=result['category'],
+                         final_name_source=dialog.name_source)
         return result
     
     except Exception as e:
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Görsel Çıkarıcısı - Tesseract OCR ile görsellerden metin çıkarma
+
+Pillow ve pytesseract ilk görsel geldiğinde yüklenir.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_ocr = None
+
+
+def _load_ocr():
+    """Pillow ve pytesseract modüllerini ilk kullanımda yükler; yüklenemezse None döndürür"""
+    global _ocr
+    if _ocr is None:
+        try:
+            from PIL import Image
+            import pytesseract
+            # Tesseract OCR motorunun sistem PATH'inde olmaması durumunda aşağıdaki satırı etkinleştirin
+            # ve Tesseract'ın yürütülebilir dosyasının yolunu belirtin.
+            # Örnek (Windows): pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+            # Örnek (Linux/macOS): pytesseract.pytesseract.tesseract_cmd = r'/usr/local/bin/tesseract'
+            _ocr = (Image, pytesseract)
+        except ImportError:
+            logger.warning("Uyarı: 'pytesseract' veya 'Pillow' paketi yüklü değil. Görselden metin çıkarma devre dışı.")
+            _ocr = False
+        except Exception as e:
+            # Tesseract motorunun kendisi bulunamazsa veya başka bir başlatma hatası olursa
+            logger.warning(f"Uyarı: Tesseract OCR motoru veya yapılandırmasında hata oluştu: {e}. Görselden metin çıkarma devre dışı.")
+            _ocr = False
+    return _ocr or None
+
+
+def extract_image_text(file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+    """
+    Görsel dosyasından OCR ile metin çıkarır.
+
+    Args:
+        file_path: Görsel dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: Kullanılmaz (görselin tamamı çözülür)
+
+    Returns:
+        Çıkarılan metin veya None
+    """
+    backend = _load_ocr()
+    if backend is None:
+        return None
+    Image, pytesseract = backend
+
+    # Resmi aç
+    with Image.open(str(file_path)) as image:
+        # OCR ile metin çıkar (Türkçe + İngilizce)
+        # config='--psm 6' genellikle iyi çalışır, metin blokları için
+        # Daha fazla bilgi: https://tesseract-ocr.github.io/tessdoc/Command-Line-Usage.html#page-segmentation-modes
+        text = pytesseract.image_to_string(
+            image,
+            lang='tur+eng',  # Türkçe ve İngilizce
+            config='--psm 6' # Uniform text block (tek bir sütun metin gibi)
+        )
+
+    # Metni temizle
+    if text:
+        # Satır içi fazla boşlukları indirge; satır sonları başlık tespiti için korunur
+        text = '\n'.join(' '.join(line.split()) for line in text.splitlines() if line.strip())
+        return text[:max_chars] if len(text) > 3 else None  # En az 3 karakterden kısa metinleri yok say
+    return None
@@ -7,6 +7,9 @@ import os
 import sys
 import time
 import logging
+import argparse
+import threading
+from datetime import datetime
 from pathlib import Path
 from colorama import init, Fore, Style
 
@@ -18,6 +21,16 @@ from config import Config
 from utils import setup_logging, create_directories
 from content_extractors import ContentExtractor
 from ai_renamer import SmartFileRenamer
+from ai_prefetch import SpeculativePrefetcher
+from move_journal import get_move_journal
+from target_layout import LayoutMigrator
+import file_state
+from file_state import FileStateStore
+from bulk_organizer import (add_organize_arguments, run_organize, add_plan_arguments, run_plan,
+                            add_apply_arguments, run_apply)
+from plan_file import PlanWriter
+import metrics
+import tracing
 from gui_manager import show_file_confirmation, show_startup_preferences, UserPreferences
 
 # Colorama'yı başlat
@@ -32,17 +45,41 @@ class DesktopOrganizer:
         self.content_extractor = ContentExtractor()
         self.ai_renamer = SmartFileRenamer()
         self.user_preferences = UserPreferences()
-        self.watcher = DesktopWatcher(self.on_file_event, self.on_file_deleted)
+        self.prefetcher = SpeculativePrefetcher(self.content_extractor, self.ai_renamer)
+        self.layout_migrator = LayoutMigrator(self.file_manager)
+        self.metrics_exporter = metrics.create_exporter(self.config)
+        self.watcher = DesktopWatcher(
+            self.on_file_event,
+            self.on_file_deleted,
+            self.on_file_seen,
+            self.prefetcher.cancel
+        )
         
-        # İşlenmekte olan dosyaları takip et (çoklu event önlemi)
-        self.processing_files = set()
+        # Dosya başına işlenme durumu (çoklu event önlemi, masaüstünde kalan dosyalar)
+        self.file_states = FileStateStore(
+            self.config.DATA_DIR / "file_state.db",
+            memory_entries=self.config.FILE_STATE_MEMORY_ENTRIES,
+            retention_days=self.config.FILE_STATE_RETENTION_DAYS,
+            max_entries=self.config.FILE_STATE_MAX_ENTRIES
+        )
+        # Önceki çalışmada yarım kalan işlemler artık geçersiz
+        self.file_states.reset_active()
         
-        # Masaüstünde kalması istenen dosyaları takip et (tekrar işlenmemesi için)
-        self.processed_desktop_files = set()  # {file_path_string}
+        # Sadece loglama modunda kararların yazıldığı plan (ilk kararda açılır)
+        self.plan_writer = None
+        self._plan_lock = threading.Lock()
         
         # Gerekli dizinleri oluştur
         create_directories(self.config.CATEGORIES)
         
+        # Önceki çalışmada yarım kalan dosya işlemlerini tamamla veya geri al
+        self.journal = get_move_journal()
+        if self.journal is not None:
+            recovery = self.journal.recover()
+            if recovery['recovered'] or recovery['rolled_back'] or recovery['lost']:
+                print(f"{Fore.YELLOW}🩹 Yarım kalan işlemler: {recovery['recovered']} tamamlandı, "
+                      f"{recovery['rolled_back']} geri alındı, {recovery['lost']} kayıp{Style.RESET_ALL}")
+        
         # AI durumunu kontrol et ve bildir
         ai_status = self.ai_renamer.get_ai_status()
         if ai_status['available']:
@@ -89,35 +126,40 @@ class DesktopOrganizer:
             self.logger.error(f"Startup preferences kontrolü hatası: {e}")
             print(f"{Fore.RED}❌ Tercih kontrolü hatası: {e}{Style.RESET_ALL}")
     
+    def on_file_seen(self, file_path):
+        """İzleyici dosyayı gördü, kararlı hale gelmesi bekleniyor"""
+        file_key = str(file_path.resolve())
+        # Masaüstünde kalan, şu an işlenen veya işlenmiş dosyalar için ücretli ön getirme yapılmaz
+        settled = (self.file_states.is_processing(file_key) or
+                   self.file_states.get_state(file_key) in (file_state.KEPT_ON_DESKTOP, file_state.DONE))
+        self.file_states.note(file_key, file_state.STABILIZING)
+        if not settled:
+            self.prefetcher.start(file_path)
+    
     def on_file_deleted(self, file_path):
         """Dosya silindiğinde çalışacak callback fonksiyonu"""
         file_key = str(file_path.resolve())
         
-        # İşlenmiş dosyalar listesinden çıkar
-        if file_key in self.processed_desktop_files:
-            self.processed_desktop_files.remove(file_key)
-            self.logger.debug(f"Silinen dosya işlenmiş listesinden çıkarıldı: {file_path.name}")
-        
-        # İşlenmekte olan dosyalar listesinden çıkar
-        if file_key in self.processing_files:
-            self.processing_files.remove(file_key)
+        # Durum kaydını kaldır (masaüstünde kalan dosyalar dahil)
+        self.file_states.forget(file_key)
+        self.logger.debug(f"Silinen dosyanın durum kaydı kaldırıldı: {file_path.name}")
         
     def on_file_event(self, file_path):
         """Dosya olayı geldiğinde çalışacak callback fonksiyonu"""
         # Çoklu event önlemi - eğer dosya zaten işleniyorsa atla
         file_key = str(file_path.resolve())
-        if file_key in self.processing_files:
-            self.logger.debug(f"Dosya zaten işleniyor, atlandı: {file_path.name}")
-            return
+        blocking_state = self.file_states.begin(file_key)
         
         # Masaüstünde kalması istenen dosyaları kontrol et
-        if file_key in self.processed_desktop_files:
+        if blocking_state == file_state.KEPT_ON_DESKTOP:
             self.logger.debug(f"Dosya daha önce işlendi ve masaüstünde kalması istendi, atlandı: {file_path.name}")
             return
+        if blocking_state is not None:
+            self.logger.debug(f"Dosya zaten işleniyor ({blocking_state}), atlandı: {file_path.name}")
+            tracing.annotate(blocked_by=blocking_state)
+            return
         
-        # Dosyayı işleme listesine ekle
-        self.processing_files.add(file_key)
-        
+        started = time.perf_counter()
         try:
             # Dosyanın hala var olup olmadığını kontrol et
             if not file_path.exists():
@@ -131,10 +173,14 @@ class DesktopOrganizer:
                 
             # İçerik çıkarma kontrolü
             if self.content_extractor.is_supported(file_path):
+                self.file_states.set_state(file_key, file_state.EXTRACTING)
                 print(f"{Fore.CYAN}İçerik çıkarılıyor: {os.path.basename(file_path)}{Style.RESET_ALL}")
                 
                 # Dosyadan içerik çıkar
+                extract_started = time.perf_counter()
                 extraction_result = self.content_extractor.extract_content(file_path)
+                metrics.observe_stage('extract', time.perf_counter() - extract_started,
+                                      file_path.suffix.lower().lstrip('.'))
                 
                 if extraction_result['success']:
                     content = extraction_result['content']
@@ -142,8 +188,8 @@ class DesktopOrganizer:
                     print(f"{Fore.BLUE}İlk 200 karakter: {content[:200]}...{Style.RESET_ALL}")
                     
                     # İçerik çıkarma sonrası dosya handle'larının bırakılması için kısa bekleme
-                    import time
-                    time.sleep(0.2)
+                    with tracing.span('handle_release_wait'):
+                        time.sleep(0.2)
                     
                     # ÖNEMLİ: Dosya hala var mı HEMEN kontrol et!
                     if not file_path.exists():
@@ -155,7 +201,7 @@ class DesktopOrganizer:
                         for category_path_str in self.config.CATEGORIES.values():
                             category_path = Path(category_path_str)
                             if category_path.exists():
-                                for existing_file in category_path.glob("*"):
+                                for existing_file in category_path.rglob(file_path.name):
                                     if existing_file.name == file_path.name:
                                         print(f"{Fore.BLUE}DOSYA BULUNDU: {existing_file}{Style.RESET_ALL}")
                                         self.logger.info(f"Dosya farklı yerde bulundu: {existing_file}")
@@ -168,21 +214,24 @@ class DesktopOrganizer:
                         
                         return
                     
-                    # AI ile dosya adı önerisi al (sadece önerisi)
-                    ai_suggested_name = None
-                    if self.config.AI_RENAME_ENABLED and self.ai_renamer.get_ai_status()['available']:
-                        print(f"{Fore.MAGENTA}AI ile dosya adı önerisi alınıyor...{Style.RESET_ALL}")
-                        
-                        ai_result = self.ai_renamer.get_ai_name_suggestion(file_path, content)
-                        if ai_result['success']:
-                            ai_suggested_name = ai_result['suggested_name']
-                            print(f"{Fore.GREEN}AI önerisi hazır: {ai_suggested_name}{Style.RESET_ALL}")
-                        else:
-                            print(f"{Fore.YELLOW}AI önerisi alınamadı: {ai_result.get('error', 'Bilinmeyen hata')}{Style.RESET_ALL}")
+                    # AI ile dosya adı önerisini arka planda iste (sadece önerisi)
+                    # Sonuç sadece kullanıcıya sorulacaksa beklenir
+                    ai_suggestion_future = None
+                    local_suggestion = None
+                    if self.config.AI_RENAME_ENABLED:
+                        # Yerel öneri hemen hazır; AI önerisi gelirse onun yerine geçer
+                        local_suggestion = self.ai_renamer.get_local_name_suggestion(file_path, content)
+                        # Kararlılık beklenirken başlatılmış spekülatif istek varsa onu kullan
+                        ai_suggestion_future = self.prefetcher.take(file_path)
+                        tracing.annotate(prefetched=ai_suggestion_future is not None)
+                        if ai_suggestion_future is None and self.ai_renamer.get_ai_status()['available']:
+                            print(f"{Fore.MAGENTA}AI ile dosya adı önerisi isteniyor...{Style.RESET_ALL}")
+                            ai_suggestion_future = self.ai_renamer.request_ai_name_suggestion(file_path, content)
                     
                     self.logger.info(f"İçerik çıkarıldı: {file_path.name} - {len(content)} karakter")
                     
                 else:
+                    metrics.count_error('extract')
                     print(f"{Fore.YELLOW}İçerik çıkarılamadı: {extraction_result['error']}{Style.RESET_ALL}")
                     self.logger.warning(f"İçerik çıkarma hatası: {file_path.name} - {extraction_result['error']}")
             
@@ -195,15 +244,16 @@ class DesktopOrganizer:
             self._process_file_organization(
                 file_path, 
                 content if 'content' in locals() else None,
-                ai_suggested_name if 'ai_suggested_name' in locals() else None
+                ai_suggestion_future if 'ai_suggestion_future' in locals() else None,
+                local_suggestion if 'local_suggestion' in locals() else None
             )
                 
         finally:
-            # İşlem bittiğinde dosyayı processing listesinden çıkar
-            if file_key in self.processing_files:
-                self.processing_files.remove(file_key)
+            # İşlem bittiğinde sahipliği bırak (durum etkinse 'done' olur)
+            self.file_states.release(file_key)
+            metrics.observe_stage('total', time.perf_counter() - started)
     
-    def _process_file_organization(self, file_path, content=None, ai_suggested_name=None):
+    def _process_file_organization(self, file_path, content=None, ai_suggestion_future=None, local_suggestion=None):
         """Dosya organizasyonu kararını ver ve uygula"""
         try:
             # Dosya uzantısını kontrol et - kullanıcı bu uzantıyı devre dışı bırakmış mı?
@@ -214,11 +264,16 @@ class DesktopOrganizer:
                 return
             
             # Dosya türünü belirle
-            suggested_category = self.file_classifier.classify_file(file_path)
+            classify_started = time.perf_counter()
+            with tracing.span('classify') as span:
+                suggested_category = self.file_classifier.classify_file(file_path)
+                span.set(category=suggested_category)
+            metrics.observe_stage('classify', time.perf_counter() - classify_started)
             
             if not suggested_category:
                 print(f"{Fore.YELLOW}❓ {file_path.name} - Kategori belirlenemedi{Style.RESET_ALL}")
                 self.logger.info(f"Sınıflandırılamadı: {file_path.name}")
+                metrics.count_file('unclassified')
                 return
             
             # Kategori devre dışı mı?
@@ -232,11 +287,23 @@ class DesktopOrganizer:
             
             # Hatırlanan seçimi kontrol et
             remembered_choice = self.user_preferences.get_remembered_choice(file_extension)
+            tracing.annotate(mode=user_mode, remembered=bool(remembered_choice))
             
             if user_mode == 'log_only':
-                # Sadece logla, taşıma
-                print(f"{Fore.BLUE}📝 {file_path.name} -> {suggested_category} (Sadece loglama modu){Style.RESET_ALL}")
+                # Sadece logla, taşıma; karar sonradan 'apply' ile uygulanabilsin diye plana yazılır
+                new_name = None
+                if self.config.AI_RENAME_ENABLED:
+                    # Kimse beklemiyor: istenmiş (ve ücreti ödenmiş) AI önerisini bekle, gelmezse yerel öneri
+                    new_name = self._resolve_ai_suggestion(ai_suggestion_future)
+                    if not new_name and local_suggestion and local_suggestion['success']:
+                        new_name = local_suggestion['suggested_name']
+                    if new_name == file_path.name:
+                        new_name = None
+                self._get_plan_writer().write(file_path, suggested_category, new_name, 'move')
+                print(f"{Fore.BLUE}📝 {file_path.name} -> {suggested_category}"
+                      f"{f' ({new_name})' if new_name else ''} (Sadece loglama modu){Style.RESET_ALL}")
                 self.logger.info(f"LOG ONLY: {file_path.name} -> {suggested_category}")
+                metrics.count_file('logged')
                 return
             
             elif user_mode == 'auto' or remembered_choice:
@@ -264,16 +331,27 @@ class DesktopOrganizer:
                     # Kullanıcıya sor modu - tek dialog ile AI önerisi de dahil
                     print(f"{Fore.MAGENTA}❓ {file_path.name} - Kullanıcı onayı bekleniyor...{Style.RESET_ALL}")
                     
+                    # Hazır AI önerisi yoksa yerel öneriyle açılır (istek içerik çıkarıldığında başlatıldı)
+                    ai_suggested_name, name_source = self._resolve_name_suggestion(ai_suggestion_future, local_suggestion)
+                    
                     # AI önerisi varsa onu da dahil et
                     final_ai_name = None
                     if (ai_suggested_name and 
                         self.config.AI_RENAME_ASK_USER and 
                         ai_suggested_name != file_path.name):
                         final_ai_name = ai_suggested_name
-                        print(f"{Fore.CYAN}🤖 AI önerisi: {ai_suggested_name}{Style.RESET_ALL}")
+                        if name_source == 'ai':
+                            print(f"{Fore.CYAN}🤖 AI önerisi: {ai_suggested_name}{Style.RESET_ALL}")
+                        else:
+                            print(f"{Fore.CYAN}📝 Yerel öneri: {ai_suggested_name}{Style.RESET_ALL}")
                     
                     try:
-                        result = show_file_confirmation(file_path, suggested_category, final_ai_name)
+                        self.file_states.set_state(str(file_path.resolve()), file_state.AWAITING_USER)
+                        wait_started = time.perf_counter()
+                        result = show_file_confirmation(file_path, suggested_category, final_ai_name,
+                                                        name_source, ai_suggestion_future)
+                        metrics.observe_stage('user_wait', time.perf_counter() - wait_started,
+                                              result['action'] if result else 'skip')
                         
                         if result and result['action'] != 'skip':
                             # AI rename işlemi
@@ -281,20 +359,15 @@ class DesktopOrganizer:
                             original_file_key = str(file_path.resolve())  # Orijinal path'i sakla
                             
                             if result.get('use_ai_name', False) and final_ai_name:
-                                # AI ismiyle yeniden adlandır
-                                suggested_path = file_path.parent / final_ai_name
-                                
-                                # Çakışma kontrolü
-                                counter = 1
-                                while suggested_path.exists() and suggested_path != file_path:
-                                    name_parts = Path(final_ai_name).stem, Path(final_ai_name).suffix
-                                    suggested_path = file_path.parent / f"{name_parts[0]}_{counter}{name_parts[1]}"
-                                    counter += 1
+                                # Pencere açıkken yerel öneri AI önerisiyle güncellenmiş olabilir
+                                final_ai_name = result.get('final_filename') or final_ai_name
                                 
-                                # Dosyayı yeniden adlandır
+                                # AI ismiyle yeniden adlandır
+                                # Dosyayı yeniden adlandır (isim doluysa indeksten sıradaki numara alınır)
                                 try:
-                                    if suggested_path != file_path:
-                                        file_path.rename(suggested_path)
+                                    if final_ai_name != file_path.name:
+                                        with tracing.span('rename', name=final_ai_name):
+                                            suggested_path = self.file_manager.name_index.rename(file_path, final_ai_name)
                                         final_file_path = suggested_path
                                         print(f"{Fore.GREEN}✅ AI ile yeniden adlandırıldı: {suggested_path.name}{Style.RESET_ALL}")
                                         self.logger.info(f"AI rename: {file_path.name} -> {suggested_path.name}")
@@ -304,13 +377,14 @@ class DesktopOrganizer:
                             
                             # Masaüstünde kalma kontrolü
                             if result.get('keep_on_desktop', False):
-                                # Dosyayı işlenmiş listesine ekle (tekrar işlenmemesi için)
-                                # Hem orijinal hem de yeni path'i ekle (AI rename durumu için)
-                                self.processed_desktop_files.add(original_file_key)
+                                # Dosyayı kalıcı olarak işaretle (yeniden başlatmada da tekrar işlenmez)
+                                # Hem orijinal hem de yeni path'i işaretle (AI rename durumu için)
+                                self.file_states.set_state(original_file_key, file_state.KEPT_ON_DESKTOP)
                                 final_file_key = str(final_file_path.resolve())
-                                self.processed_desktop_files.add(final_file_key)
+                                self.file_states.set_state(final_file_key, file_state.KEPT_ON_DESKTOP)
                                 print(f"{Fore.CYAN}🏠 {final_file_path.name} - Masaüstünde kaldı{Style.RESET_ALL}")
-                                self.logger.info(f"Dosya masaüstünde kaldı ve işlenmiş listesine eklendi: {final_file_path.name}")
+                                self.logger.info(f"Dosya masaüstünde kaldı olarak işaretlendi: {final_file_path.name}")
+                                metrics.count_file('kept_on_desktop')
                                 return  # Organize etme, masaüstünde bırak
                             
                             # Normal organize işlemi
@@ -326,6 +400,7 @@ class DesktopOrganizer:
                         else:
                             print(f"{Fore.YELLOW}⏭️ {file_path.name} - Kullanıcı tarafından atlandı{Style.RESET_ALL}")
                             self.logger.info(f"Kullanıcı tarafından atlandı: {file_path.name}")
+                            metrics.count_file('skipped')
                     
                     except Exception as e:
                         self.logger.error(f"GUI dialog hatası: {e}")
@@ -336,6 +411,46 @@ class DesktopOrganizer:
             self.logger.error(f"Dosya organizasyon hatası: {e}", exc_info=True)
             print(f"{Fore.RED}❌ Hata: {file_path.name} işlenemedi{Style.RESET_ALL}")
     
+    def _resolve_name_suggestion(self, ai_suggestion_future, local_suggestion):
+        """
+        Onay penceresinde gösterilecek ismi seçer
+        
+        Returns:
+            (dosya adı veya None, 'ai' | 'local') tuple'ı
+        """
+        # AI önerisi zaten geldiyse doğrudan kullan
+        if ai_suggestion_future is not None and ai_suggestion_future.done():
+            ai_suggested_name = self._resolve_ai_suggestion(ai_suggestion_future)
+            if ai_suggested_name:
+                return ai_suggested_name, 'ai'
+            ai_suggestion_future = None
+        
+        # Yerel öneri varsa beklemeden göster, AI önerisi pencerede güncellenir
+        if local_suggestion and local_suggestion['success']:
+            return local_suggestion['suggested_name'], 'local'
+        
+        return self._resolve_ai_suggestion(ai_suggestion_future), 'ai'
+    
+    def _resolve_ai_suggestion(self, ai_suggestion_future):
+        """Arka planda istenen AI önerisini bekler, dosya adını veya None döndürür"""
+        if ai_suggestion_future is None:
+            return None
+        
+        ai_result = self.ai_renamer.wait_ai_name_suggestion(ai_suggestion_future, self.config.AI_SUGGESTION_WAIT_TIMEOUT)
+        if ai_result['success']:
+            print(f"{Fore.GREEN}AI önerisi hazır: {ai_result['suggested_name']}{Style.RESET_ALL}")
+            return ai_result['suggested_name']
+        
+        print(f"{Fore.YELLOW}AI önerisi alınamadı: {ai_result.get('error', 'Bilinmeyen hata')}{Style.RESET_ALL}")
+        return None
+    
+    def _get_plan_writer(self):
+        """Sadece loglama modunun plan dosyası (ilk kullanımda açılır, var olana eklenir)"""
+        with self._plan_lock:
+            if self.plan_writer is None:
+                self.plan_writer = PlanWriter(self.config.LOG_ONLY_PLAN_FILE, root=self.config.WATCH_DIRECTORY, append=True)
+            return self.plan_writer
+    
     def _execute_file_action(self, file_path, action, category):
         """Dosya eylemini uygula (taşı, kopyala)"""
         try:
@@ -344,7 +459,9 @@ class DesktopOrganizer:
                 if success:
                     print(f"{Fore.GREEN}✅ Taşındı: {file_path.name} -> {category}{Style.RESET_ALL}")
                     self.logger.info(f"MOVED: {file_path.name} -> {category}")
+                    metrics.count_file('moved')
                 else:
+                    metrics.count_file('failed')
                     print(f"{Fore.RED}❌ Taşıma başarısız: {file_path.name}{Style.RESET_ALL}")
                     self.logger.error(f"MOVE FAILED: {file_path.name}")
             
@@ -353,7 +470,9 @@ class DesktopOrganizer:
                 if success:
                     print(f"{Fore.GREEN}📋 Kopyalandı: {file_path.name} -> {category}{Style.RESET_ALL}")
                     self.logger.info(f"COPIED: {file_path.name} -> {category}")
+                    metrics.count_file('copied')
                 else:
+                    metrics.count_file('failed')
                     print(f"{Fore.RED}❌ Kopyalama başarısız: {file_path.name}{Style.RESET_ALL}")
                     self.logger.error(f"COPY FAILED: {file_path.name}")
                     
@@ -366,6 +485,8 @@ class DesktopOrganizer:
         print(f"{Fore.CYAN}Akıllı Masaüstü Organizatörü Başlatılıyor...{Style.RESET_ALL}")
         print(f"{Fore.BLUE}İzlenen klasör: {self.config.WATCH_DIRECTORY}{Style.RESET_ALL}")
         print(f"{Fore.BLUE}Kategoriler: {', '.join(self.config.CATEGORIES.keys())}{Style.RESET_ALL}")
+        if not self.file_manager.layout.is_flat:
+            print(f"{Fore.BLUE}Klasör düzeni: {self.file_manager.layout.template}{Style.RESET_ALL}")
         
         # Kullanıcı modu bilgisi
         user_mode = self.user_preferences.get_mode()
@@ -394,6 +515,12 @@ class DesktopOrganizer:
         
         try:
             self.watcher.start()
+            # Düz kalmış kategori klasörlerini arka planda yeni düzene taşı
+            self.layout_migrator.start()
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.start()
+                if self.metrics_exporter.url:
+                    print(f"{Fore.BLUE}📊 Metrikler: {self.metrics_exporter.url}{Style.RESET_ALL}")
             self.logger.info("Desktop Organizer başlatıldı")
             
             # Ana döngü
@@ -410,10 +537,85 @@ class DesktopOrganizer:
             
         finally:
             self.watcher.stop()
+            self.layout_migrator.stop()
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.stop()
+            self.prefetcher.shutdown()
+            self.file_states.close()
+            if self.plan_writer is not None:
+                self.plan_writer.close()
+                print(f"{Fore.BLUE}📝 Plan: {self.config.LOG_ONLY_PLAN_FILE} - uygulamak için: python main.py apply {self.config.LOG_ONLY_PLAN_FILE}{Style.RESET_ALL}")
+            self.ai_renamer.shutdown()
+            if self.journal is not None:
+                self.journal.close()
+            tracing.shutdown()
             print(f"{Fore.GREEN}Güvenli şekilde kapatıldı{Style.RESET_ALL}")
 
+def run_undo(args) -> int:
+    """Son işlemleri veya bir zaman aralığını günlükten geri alır"""
+    setup_logging()
+    journal = get_move_journal()
+    if journal is None:
+        print(f"{Fore.RED}İşlem günlüğü kapalı (JOURNAL_ENABLED=false), geri alınacak kayıt yok{Style.RESET_ALL}")
+        return 1
+
+    if not args.dry_run:
+        # İzleyici çalışıyorsa kurtarma atlanır; devam eden işlemleri yarım sanmamak için
+        journal.recover()
+    since = time.time() - args.minutes * 60 if args.minutes is not None else None
+    last = args.last if args.last is not None or since is not None else 1
+    result = journal.undo(last=last, since=since, dry_run=args.dry_run)
+
+    for operation in result['operations']:
+        when = datetime.fromtimestamp(operation['ts']).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"{Fore.BLUE}{when} {operation['op']}: {operation['dst']} -> {operation['src']}{Style.RESET_ALL}")
+
+    if args.dry_run:
+        print(f"{Fore.CYAN}{len(result['operations'])} işlem geri alınabilir (deneme, değişiklik yapılmadı){Style.RESET_ALL}")
+    else:
+        print(f"{Fore.GREEN}✅ {result['undone']} işlem geri alındı{Style.RESET_ALL}"
+              f"{Fore.YELLOW}, {result['missing']} dosya bulunamadı, {result['failed']} hata{Style.RESET_ALL}")
+    journal.close()
+    return 0 if not result['failed'] else 1
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Akıllı Masaüstü Dosya Organizatörü")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('watch', help='Masaüstünü izle ve dosyaları organize et (varsayılan)')
+
+    organize_parser = subparsers.add_parser('organize', help='Bir klasörü tek seferde toplu organize et')
+    add_organize_arguments(organize_parser)
+
+    plan_parser = subparsers.add_parser('plan', help='Bir klasör için incelenebilir plan dosyası hazırla')
+    add_plan_arguments(plan_parser)
+
+    apply_parser = subparsers.add_parser('apply', help='Plan dosyasını toplu uygula (değişmiş dosyalar atlanır)')
+    add_apply_arguments(apply_parser)
+
+    undo_parser = subparsers.add_parser('undo', help='Son dosya işlemlerini geri al')
+    window = undo_parser.add_mutually_exclusive_group()
+    window.add_argument('--last', type=int, help='Geri alınacak son işlem sayısı (varsayılan 1)')
+    window.add_argument('--minutes', type=float, help='Son N dakikadaki tüm işlemleri geri al')
+    undo_parser.add_argument('--dry-run', action='store_true', help='Sadece listele, değişiklik yapma')
+    return parser
+
+
 def main():
     """Ana fonksiyon"""
+    args = build_argument_parser().parse_args()
+    if args.command == 'undo':
+        sys.exit(run_undo(args))
+    if args.command == 'organize':
+        setup_logging()
+        sys.exit(run_organize(args))
+    if args.command == 'plan':
+        setup_logging()
+        sys.exit(run_plan(args))
+    if args.command == 'apply':
+        setup_logging()
+        sys.exit(run_apply(args))
+
     try:
         organizer = DesktopOrganizer()
         organizer.start()
@@ -422,4 +624,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Metrikler - Aşama başına sayaçlar ve gecikme histogramları
+
+Her dosya için şu aşamaların süreleri ölçülür (stage etiketi):
+
+    event_to_stable  olaydan dosyanın kararlı hale gelmesine kadar (kind: stable/unstable)
+    extract          içerik çıkarma (kind: dosya türü)
+    classify         kategori belirleme
+    ai_call          tek bir Gemini API çağrısı (kind: dosya türü veya 'toplu')
+    user_wait        onay penceresinde kullanıcıyı bekleme (kind: seçilen eylem)
+    move / copy      dosya işlemi (kind: ok/skipped/failed)
+    total            dosyanın işlenmesinin tamamı
+
+Kayıt sırasında kilit alınmaz: her thread kendi parçasına (shard) yazar,
+okuma sırasında parçalar toplanır. Bitmiş thread'lerin parçaları toplama
+sırasında kalıcı toplama katılır. Bir gözlem birkaç mikrosaniye sürer.
+
+Değerler MetricsExporter ile yerel bir HTTP uç noktasında Prometheus metin
+biçiminde (/metrics) ve JSON olarak (/metrics.json) sunulur, ayrıca belirli
+aralıklarla JSON anlık görüntü dosyasına yazılır.
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Saniye cinsinden histogram sınırları (1 ms'den 10 dakikaya)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _merge_rows(target: Dict[tuple, List[float]], source: Dict[tuple, List[float]]):
+    for labels, row in source.items():
+        total = target.get(labels)
+        if total is None:
+            target[labels] = list(row)
+        else:
+            for index, value in enumerate(row):
+                total[index] += value
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _ShardedMetric:
+    """Thread başına parçalara yazan metrik tabanı"""
+
+    metric_type = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...], width: int):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._width = width
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, Dict[tuple, List[float]]]] = []
+        self._retired: Dict[tuple, List[float]] = {}
+
+    def _row(self, labels: tuple) -> List[float]:
+        """Bu thread'in etiket satırı; sadece sahibi thread yazar"""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        row = shard.get(labels)
+        if row is None:
+            row = shard[labels] = [0] * self._width
+        return row
+
+    def collect(self) -> Dict[tuple, List[float]]:
+        """Tüm parçaların toplamı: {etiket değerleri: satır}"""
+        totals: Dict[tuple, List[float]] = {}
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    _merge_rows(self._retired, shard)  # Sahibi bitti, artık kimse yazmaz
+            self._shards = alive
+            _merge_rows(totals, self._retired)
+            for _, shard in alive:
+                _merge_rows(totals, dict(shard))
+        return totals
+
+
+class Counter(_ShardedMetric):
+    """Yalnızca artan sayaç"""
+
+    metric_type = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames, 1)
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._row(labels)[0] += amount
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(row[0])}"
+                for labels, row in sorted(self.collect().items())]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{'labels': dict(zip(self.labelnames, labels)), 'value': row[0]}
+                for labels, row in sorted(self.collect().items())]
+
+
+class Histogram(_ShardedMetric):
+    """Sabit sınırlı histogram; satır = [kova sayıları..., +Inf, toplam]"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_labels = [f'le="{bound}"' for bound in self.buckets] + ['le="+Inf"']
+        super().__init__(name, help_text, labelnames, len(self.buckets) + 2)
+
+    def observe(self, value: float, *labels: str):
+        row = self._row(labels)
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, row in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.bucket_labels, row):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, bound)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(row[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+    def quantile(self, row: List[float], q: float) -> Optional[float]:
+        """Kovalar içinde doğrusal ara değerle yaklaşık yüzdelik"""
+        count = sum(row[:-1])
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, row):
+            if bucket_count and cumulative + bucket_count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = bound
+        return self.buckets[-1]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        series = []
+        for labels, row in sorted(self.collect().items()):
+            count = sum(row[:-1])
+            series.append({
+                'labels': dict(zip(self.labelnames, labels)),
+                'count': count,
+                'sum': row[-1],
+                'mean': row[-1] / count if count else None,
+                'p50': self.quantile(row, 0.50),
+                'p95': self.quantile(row, 0.95),
+                'p99': self.quantile(row, 0.99)
+            })
+        return series
+
+
+class MetricsRegistry:
+    """Metriklerin kaydı ve dışa aktarım biçimleri"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _ShardedMetric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _ShardedMetric) -> _ShardedMetric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render_prometheus(self) -> str:
+        """Prometheus metin biçimi (0.0.4)"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON'a yazılabilir anlık görüntü (histogramlar için yaklaşık p50/p95/p99)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            'timestamp': time.time(),
+            'metrics': {metric.name: {'type': metric.metric_type, 'help': metric.help_text,
+                                      'series': metric.snapshot()} for metric in metrics}
+        }
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'desktop_organizer_stage_seconds', 'Dosya işleme aşamalarının süresi (saniye)', ('stage', 'kind'))
+STAGE_ERRORS = REGISTRY.counter(
+    'desktop_organizer_stage_errors_total', 'Hata ile biten aşamalar', ('stage',))
+FILES_TOTAL = REGISTRY.counter(
+    'desktop_organizer_files_total', 'Sonucuna göre işlenen dosyalar', ('outcome',))
+
+
+def observe_stage(stage: str, seconds: float, kind: str = ''):
+    """Aşama süresini kaydeder"""
+    STAGE_SECONDS.observe(seconds, stage, kind)
+
+
+def count_error(stage: str):
+    STAGE_ERRORS.inc(stage)
+
+
+def count_file(outcome: str):
+    """Dosyanın sonucunu sayar (moved, copied, skipped, kept_on_desktop, logged, failed)"""
+    FILES_TOTAL.inc(outcome)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """/metrics (Prometheus) ve /metrics.json uç noktaları"""
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        registry = self.server.registry
+        if path == '/metrics':
+            self._send(200, registry.render_prometheus().encode('utf-8'), PROMETHEUS_CONTENT_TYPE)
+        elif path == '/metrics.json':
+            body = json.dumps(registry.snapshot(), ensure_ascii=False).encode('utf-8')
+            self._send(200, body, 'application/json; charset=UTF-8')
+        else:
+            self._send(404, b'Not found\n', 'text/plain; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class MetricsExporter:
+    """Metrikleri HTTP uç noktasında sunar ve periyodik olarak JSON dosyasına yazar"""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = '127.0.0.1', port: int = 9464,
+                 snapshot_path: Optional[Path] = None, snapshot_interval: float = 60.0):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+        self.logger = logging.getLogger(__name__)
+
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._snapshot_thread = None
+
+    @property
+    def url(self) -> Optional[str]:
+        if self.server is None:
+            return None
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        """HTTP sunucusunu (port 0 değilse) ve anlık görüntü thread'ini başlatır"""
+        if self.port and self.server is None:
+            try:
+                self.server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+            except OSError as e:
+                self.logger.error(f"Metrik uç noktası açılamadı ({self.host}:{self.port}): {e}")
+            else:
+                self.server.daemon_threads = True
+                self.server.registry = self.registry
+                threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+                self.logger.info(f"Metrik uç noktası: {self.url}")
+
+        if self.snapshot_path and self.snapshot_interval > 0 and self._snapshot_thread is None:
+            self._stop.clear()
+            self._snapshot_thread = threading.Thread(target=self._snapshot_loop, name="metrics-snapshot", daemon=True)
+            self._snapshot_thread.start()
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        """Anlık görüntüyü atomik olarak (geçici dosya + rename) yazar"""
+        if not self.snapshot_path:
+            return
+        temp_file = self.snapshot_path.with_suffix('.tmp')
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.registry.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self.snapshot_path)
+        except OSError as e:
+            self.logger.error(f"Metrik anlık görüntüsü yazılamadı: {e}")
+
+    def stop(self):
+        """Sunucuyu kapatır ve son anlık görüntüyü yazar"""
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self._snapshot_thread is not None:
+            self._snapshot_thread = None
+            self.write_snapshot()
+
+
+def create_exporter(config) -> Optional[MetricsExporter]:
+    """Config'e göre dışa aktarıcı oluşturur; METRICS_ENABLED false ise None"""
+    if not config.METRICS_ENABLED:
+        return None
+    return MetricsExporter(REGISTRY, config.METRICS_HOST, config.METRICS_PORT,
+                           config.METRICS_SNAPSHOT_FILE, config.METRICS_SNAPSHOT_INTERVAL)
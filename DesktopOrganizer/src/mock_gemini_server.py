@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Sahte Gemini Sunucusu - API anahtarı ve ağ olmadan AI yolunu test etmek için
+
+Gemini REST API'sinin generateContent uç noktasını taklit eder:
+    POST /v1beta/models/{model}:generateContent
+
+Gecikme dağılımı, hata oranı ve dakikalık istek sınırı (429) ayarlanabilir.
+AIFileRenamer'ı bu sunucuya yönlendirmek için:
+    GEMINI_BASE_URL=http://127.0.0.1:8765 GEMINI_API_KEY=mock python main.py
+
+Kullanım:
+    python mock_gemini_server.py --port 8765 --latency lognormal --latency-ms 400 --error-rate 0.05 --rpm 60
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+GENERATE_PATH_RE = re.compile(r'^/(v1beta|v1|v1alpha)/models/([^/:]+):generateContent$')
+FILE_SECTION_RE = re.compile(r'^### DOSYA (\S+)', re.MULTILINE)
+FILE_TYPE_RE = re.compile(r'DOSYA TÜRÜ:\s*(\S+)')
+
+LATENCY_MODES = ('fixed', 'uniform', 'lognormal')
+
+
+class MockBehavior:
+    """Sunucunun gecikme, hata ve hız sınırı davranışı"""
+
+    def __init__(self, latency: str = 'fixed', latency_ms: float = 200.0, jitter_ms: float = 100.0,
+                 error_rate: float = 0.0, requests_per_minute: int = 0, seed: Optional[int] = None):
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Geçersiz gecikme dağılımı: {latency} ({', '.join(LATENCY_MODES)})")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.random = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._recent = deque()  # son 60 sn içindeki kabul edilen isteklerin zamanları
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0}
+
+    def sample_latency(self) -> float:
+        """Dağılıma göre bir gecikme (saniye) örnekler"""
+        with self._lock:
+            if self.latency == 'fixed':
+                value = self.latency_ms
+            elif self.latency == 'uniform':
+                value = self.random.uniform(max(0.0, self.latency_ms - self.jitter_ms), self.latency_ms + self.jitter_ms)
+            else:
+                # Medyanı latency_ms olan, jitter oranında sağa çarpık (uzun kuyruklu) dağılım
+                sigma = self.jitter_ms / self.latency_ms if self.latency_ms else 0.0
+                value = self.latency_ms * self.random.lognormvariate(0.0, sigma)
+        return value / 1000.0
+
+    def admit(self) -> Optional[int]:
+        """İsteği kabul eder veya döndürülecek hata kodunu (429/500/503) verir"""
+        now = time.monotonic()
+        with self._lock:
+            self.stats['requests'] += 1
+            if self.requests_per_minute:
+                while self._recent and now - self._recent[0] > 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.requests_per_minute:
+                    self.stats['rate_limited'] += 1
+                    return 429
+                self._recent.append(now)
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return self.random.choice((500, 503))
+            self.stats['ok'] += 1
+            return None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+ERROR_STATUS = {
+    429: ('RESOURCE_EXHAUSTED', 'Resource has been exhausted (e.g. check quota).'),
+    500: ('INTERNAL', 'An internal error has occurred.'),
+    503: ('UNAVAILABLE', 'The model is overloaded. Please try again later.'),
+}
+
+
+def build_response(request: Dict[str, Any], model: str) -> Dict[str, Any]:
+    """İsteğe uygun, içerikten türetilmiş sahte bir generateContent yanıtı üretir"""
+    prompt = ''
+    for content in request.get('contents') or []:
+        for part in content.get('parts') or []:
+            prompt += part.get('text') or ''
+
+    generation_config = request.get('generationConfig') or {}
+    if generation_config.get('responseMimeType') == 'application/json':
+        # Toplu mod: her "### DOSYA <id>" bölümü için bir isim
+        sections = FILE_SECTION_RE.split(prompt)[1:]
+        entries = []
+        for file_id, body in zip(sections[0::2], sections[1::2]):
+            entries.append({'id': file_id, 'name': _mock_name(body)})
+        text = json.dumps(entries, ensure_ascii=False)
+    else:
+        text = _mock_name(prompt)
+
+    prompt_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(text) // 4)
+    return {
+        'candidates': [{
+            'content': {'parts': [{'text': text}], 'role': 'model'},
+            'finishReason': 'STOP',
+            'index': 0
+        }],
+        'usageMetadata': {
+            'promptTokenCount': prompt_tokens,
+            'candidatesTokenCount': output_tokens,
+            'totalTokenCount': prompt_tokens + output_tokens
+        },
+        'modelVersion': model
+    }
+
+
+def _mock_name(text: str) -> str:
+    """Aynı içerik için hep aynı ismi verir (önbellek/birleştirme testleri için)"""
+    match = FILE_TYPE_RE.search(text)
+    file_type = match.group(1).lower() if match else 'dosya'
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+    return f"mock_{file_type}_{digest}"
+
+
+class MockGeminiHandler(BaseHTTPRequestHandler):
+    """generateContent isteklerini karşılayan HTTP işleyici"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        match = GENERATE_PATH_RE.match(self.path.split('?', 1)[0])
+        if not match:
+            self._send_json(404, {'error': {'code': 404, 'message': f'Not found: {self.path}', 'status': 'NOT_FOUND'}})
+            return
+
+        behavior = self.server.behavior
+        time.sleep(behavior.sample_latency())
+
+        error_code = behavior.admit()
+        if error_code is not None:
+            status, message = ERROR_STATUS[error_code]
+            self._send_json(error_code, {'error': {'code': error_code, 'message': message, 'status': status}})
+            return
+
+        try:
+            request = json.loads(body or b'{}')
+        except json.JSONDecodeError:
+            self._send_json(400, {'error': {'code': 400, 'message': 'Invalid JSON payload', 'status': 'INVALID_ARGUMENT'}})
+            return
+
+        self._send_json(200, build_response(request, match.group(2)))
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 0, behavior: Optional[MockBehavior] = None) -> ThreadingHTTPServer:
+    """
+    Sunucuyu arka plan thread'inde başlatır
+
+    Args:
+        host: Dinlenecek adres
+        port: Port (0 ise boş bir port seçilir)
+        behavior: Gecikme/hata davranışı
+
+    Returns:
+        Çalışan sunucu; adresi server.base_url, durdurmak için server.shutdown()
+    """
+    server = ThreadingHTTPServer((host, port), MockGeminiHandler)
+    server.daemon_threads = True
+    server.behavior = behavior or MockBehavior()
+    server.base_url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, name="mock-gemini-server", daemon=True)
+    thread.start()
+    return server
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser):
+    """Davranış seçeneklerini (benchmark ile ortak) ekler"""
+    parser.add_argument('--latency', choices=LATENCY_MODES, default='lognormal', help='Gecikme dağılımı')
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='Ortalama/medyan gecikme (ms)')
+    parser.add_argument('--jitter-ms', type=float, default=150.0, help='Gecikme yayılımı (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500/503 döndürülecek istek oranı (0-1)')
+    parser.add_argument('--rpm', type=int, default=0, help='Dakikalık istek sınırı, aşılırsa 429 (0: sınırsız)')
+    parser.add_argument('--seed', type=int, default=None, help='Tekrarlanabilir sonuçlar için rastgele tohum')
+
+
+def behavior_from_args(args) -> MockBehavior:
+    return MockBehavior(args.latency, args.latency_ms, args.jitter_ms, args.error_rate, args.rpm, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel sahte Gemini API sunucusu")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = start_mock_server(args.host, args.port, behavior_from_args(args))
+    print(f"Sahte Gemini sunucusu çalışıyor: {server.base_url}")
+    print(f"Kullanım: GEMINI_BASE_URL={server.base_url} GEMINI_API_KEY=mock python main.py")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\nİstatistikler: {server.behavior.get_stats()}")
+        server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Taşıma Günlüğü - Dosya işlemlerinin çökmeye dayanıklı kaydı ve geri alma
+
+Her taşıma/kopyalama/yeniden adlandırma önce "intent", bitince "done" (veya
+"failed") kaydıyla data/move_journal.jsonl dosyasına eklenir. Satırlar
+O_APPEND ile hemen çekirdeğe yazılır, yani süreç çökse de kaybolmaz;
+fsync ise grup halinde (JOURNAL_GROUP_COMMIT_MS veya
+JOURNAL_GROUP_COMMIT_RECORDS dolunca) arka plan thread'inde yapılır. Böylece
+binlerce dosyalık bir toplu işlemde fsync maliyeti paylaşılır; elektrik
+kesintisinde en fazla son grup kaybolur.
+
+Başlangıçta recover() yarım kalan işlemleri diske bakarak tamamlar veya geri
+alır. Günlüğü kullanan her süreç yanındaki .lock dosyasında paylaşımlı kilit
+tutar; kurtarma ve günlüğün yeniden yazılması (compact) sadece özel kilit
+alınabildiğinde, yani günlüğü kullanan başka süreç yokken yapılır. Böylece
+izleyici çalışırken başlatılan bir komut, izleyicinin devam eden işlemlerini
+yarım kalmış sanıp geri almaz. (Windows'ta paylaşımlı kilit olmadığından
+kilidi ilk alan süreç kurtarmayı yapar.)
+
+undo() son N işlemi veya bir zaman aralığını tek geçişte ters sırayla geri
+alır. 'overwrite' stratejisiyle üzerine yazılan eski dosyalar geri
+getirilemez.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Dict, Any, List
+
+from config import Config
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Bir işlemin son hali bu fazlardan biriyse tamamlanmış sayılır
+COMPLETED_PHASES = ('done', 'recovered')
+TERMINAL_PHASES = ('done', 'recovered', 'failed', 'rolled_back', 'undone')
+
+# Geri alınırken taşınarak geri döndürülen işlem türleri; diğerleri (copy, link) silinir
+MOVE_KINDS = ('move', 'rename', 'reshard')
+
+# Arka plan düzen taşıması kullanıcı işlemi değildir: undo seçmez, sadece
+# daha önce taşınmış dosyanın yeni yerini bulmak için izlenir
+INTERNAL_KINDS = ('reshard',)
+
+
+def _identity(path: Path) -> Optional[List[int]]:
+    """Dosyanın [inode, boyut, mtime_ns] kimliği; yoksa None"""
+    try:
+        stat = os.lstat(path)
+    except OSError:
+        return None
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def _follow(relocated: Dict[str, str], path: str) -> str:
+    """Yolu, sonraki düzen taşımalarını izleyerek dosyanın güncel yerine çevirir"""
+    seen = set()
+    while path in relocated and path not in seen:
+        seen.add(path)
+        path = relocated[path]
+    return path
+
+
+class MoveJournal:
+    """Append-only JSONL işlem günlüğü; grup commit, kurtarma ve geri alma"""
+
+    def __init__(self, journal_path: Path, group_commit_interval: float = 0.05,
+                 group_commit_records: int = 256, retention_days: int = 30):
+        self.journal_path = Path(journal_path)
+        self.group_commit_interval = group_commit_interval
+        self.group_commit_records = group_commit_records
+        self.retention_days = retention_days
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._sync_needed = threading.Condition(self._lock)
+        self._unsynced = 0
+        self._closed = False
+        self._flusher = None
+
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        # Kilit günlüğün kendisinde değil: compact() günlüğü değiştirse de kilit dosyası aynı kalır
+        self._lock_fd = os.open(str(self.journal_path.with_name(self.journal_path.name + '.lock')),
+                                os.O_RDWR | os.O_CREAT, 0o644)
+        self._exclusive = False
+        if fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_SH)  # Başka süreç kurtarma yapıyorsa bitmesini bekler
+        else:
+            self._exclusive = self._try_lock_exclusive()
+        self._fd = os.open(str(self.journal_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _try_lock_exclusive(self) -> bool:
+        """Günlüğü kullanan başka süreç yoksa özel kilidi alır (beklemez)"""
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._lock_fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            if fcntl is not None:
+                # Kilit dönüştürme atomik değil; paylaşımlı kilit bırakılmış olabilir
+                fcntl.flock(self._lock_fd, fcntl.LOCK_SH)
+            return False
+        return True
+
+    def _append(self, record: Dict[str, Any]):
+        """Kaydı tek write() ile ekler; fsync grup halinde yapılır"""
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            if self._closed:
+                return
+            os.write(self._fd, line)
+            self._unsynced += 1
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="journal-fsync", daemon=True)
+                self._flusher.start()
+            if self._unsynced >= self.group_commit_records:
+                self._sync_needed.notify()
+
+    def _take_unsynced(self) -> Optional[int]:
+        """
+        Kilit altında çağrılır: bekleyen kayıt varsa sayacı sıfırlar ve fsync
+        için günlüğün kopya tanımlayıcısını döndürür. fsync kilit dışında bu
+        kopyayla yapılır; böylece eklemeler beklemez, close() veya compact()
+        asıl tanımlayıcıyı kapatsa da fsync geçersiz tanımlayıcıya düşmez.
+        """
+        if not self._unsynced or self._closed:
+            return None
+        self._unsynced = 0
+        return os.dup(self._fd)
+
+    @staticmethod
+    def _fsync(fd: int):
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _flush_loop(self):
+        """Bekleyen kayıtları grup halinde diske yazar"""
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                self._sync_needed.wait(self.group_commit_interval)
+                fd = self._take_unsynced()
+            if fd is not None:
+                self._fsync(fd)
+
+    def commit(self):
+        """Bekleyen tüm kayıtları hemen diske yazar"""
+        with self._lock:
+            fd = self._take_unsynced()
+        if fd is not None:
+            self._fsync(fd)
+
+    def begin(self, kind: str, source: Path, target: Path) -> str:
+        """
+        İşlem niyetini kaydeder ve işlem kimliğini döndürür. Kaynağın ve
+        (varsa) önceden var olan hedefin kimliği de yazılır; kurtarma sadece
+        bu işlemin ürettiği kanıtlanabilen dosyaları siler.
+        """
+        op_id = uuid.uuid4().hex[:16]
+        self._append({'id': op_id, 'phase': 'intent', 'op': kind,
+                      'src': str(source), 'dst': str(target), 'ts': time.time(),
+                      'src_id': _identity(source), 'dst_id': _identity(target)})
+        return op_id
+
+    def finish(self, op_id: str, phase: str, **fields):
+        """İşlemin sonucunu kaydeder (done, failed, recovered, rolled_back, undone)"""
+        self._append(dict({'id': op_id, 'phase': phase, 'ts': time.time()}, **fields))
+
+    def wrap(self, kind: str, operation: Callable[[Path, Path], Any]) -> Callable[[Path, Path], Any]:
+        """operation(kaynak, hedef) çağrısını intent/done/failed kayıtlarıyla sarar"""
+        def journaled(source: Path, target: Path):
+            op_id = self.begin(kind, source, target)
+            try:
+                result = operation(source, target)
+            except BaseException as e:
+                self.finish(op_id, 'failed', error=type(e).__name__)
+                raise
+            self.finish(op_id, 'done')
+            return result
+        return journaled
+
+    def read_operations(self) -> List[Dict[str, Any]]:
+        """
+        Günlüğü okuyup işlem başına birleştirir (intent sırasıyla)
+
+        Returns:
+            [{'id', 'op', 'src', 'dst', 'ts', 'phase', 'finished'}, ...]
+        """
+        operations: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Çökme sırasında yarım kalmış son satır
+                    if record.get('phase') == 'intent':
+                        operations[record['id']] = dict(record, finished=None)
+                        continue
+                    operation = operations.get(record.get('id'))
+                    if operation is None:
+                        continue
+                    operation['phase'] = record['phase']
+                    operation['finished'] = record['ts']
+                    if 'dst' in record:
+                        operation['dst'] = record['dst']
+        except FileNotFoundError:
+            pass
+        return list(operations.values())
+
+    def recover(self) -> Dict[str, int]:
+        """
+        Yarım kalan (intent'i olup sonucu olmayan) işlemleri diskteki duruma
+        göre tamamlar veya geri alır, ardından eski kayıtları temizler.
+        Günlüğü kullanan başka bir süreç varsa hiçbir şey yapılmaz.
+
+        Returns:
+            {'recovered': n, 'rolled_back': n, 'lost': n, 'skipped': bool}
+        """
+        counts = {'recovered': 0, 'rolled_back': 0, 'lost': 0, 'skipped': False}
+        if not self._exclusive and not self._try_lock_exclusive():
+            self.logger.info("İşlem günlüğü başka bir süreç tarafından kullanılıyor, kurtarma atlandı")
+            counts['skipped'] = True
+            return counts
+        self._exclusive = True
+        try:
+            for operation in self.read_operations():
+                if operation['phase'] != 'intent':
+                    continue
+                phase = self._recover_operation(operation)
+                counts[phase] += 1
+                self.finish(operation['id'], 'failed' if phase == 'lost' else phase)
+                self.logger.info(f"Yarım kalan işlem ({operation['op']}) {phase}: {operation['src']} -> {operation['dst']}")
+            self.commit()
+            self.compact()
+        finally:
+            if fcntl is not None:
+                # Diğer süreçler günlüğü kullanabilsin; sonraki kurtarmalar yine özel kilit ister
+                fcntl.flock(self._lock_fd, fcntl.LOCK_SH)
+                self._exclusive = False
+        return counts
+
+    def _recover_operation(self, operation: Dict[str, Any]) -> str:
+        source = Path(operation['src'])
+        target = Path(operation['dst'])
+        source_exists = os.path.lexists(source)
+        target_exists = os.path.lexists(target)
+        if not target_exists:
+            return 'rolled_back' if source_exists else 'lost'
+
+        if operation['op'] in MOVE_KINDS and source_exists and os.path.samefile(source, target):
+            os.unlink(source)  # link + unlink arasında kesilmiş; iki isim aynı dosya
+            return 'recovered'
+
+        # Eski kayıtlarda hedefin önceki durumu bilinmiyor: hiçbir şey silinmez
+        if 'dst_id' not in operation:
+            if not source_exists or operation['op'] not in MOVE_KINDS:
+                return 'recovered'
+            return 'lost'
+
+        written = self._target_origin(operation, target)
+        if written == 'untouched':
+            # İşlem hedefe hiç dokunmamış (ör. üzerine yazmadan önce kesildi)
+            return 'rolled_back' if source_exists else 'lost'
+        if written == 'complete':
+            if source_exists and operation['op'] in MOVE_KINDS:
+                os.unlink(source)  # Kopya tamam, sadece kaynağın silinmesi kalmıştı
+            return 'recovered'
+        if written == 'partial' and source_exists:
+            os.unlink(target)  # İşlemden önce olmayan, yarım kalmış kopya
+            return 'rolled_back'
+        if not source_exists:
+            return 'recovered'
+        # Önceden var olan hedefin üzerine yazılırken kesilmiş: iki dosya da korunur
+        self.logger.warning(f"Yarım kalan işlem güvenle çözülemedi, dosyalara dokunulmadı: {source} -> {target}")
+        return 'lost'
+
+    @staticmethod
+    def _target_origin(operation: Dict[str, Any], target: Path) -> str:
+        """
+        Hedefin bu işlemle ilişkisi:
+            'untouched'  işlemden önce de vardı ve değişmemiş
+            'complete'   kaynağın tam kopyası (boyut ve mtime eşit; meta veriler en son kopyalanır)
+            'partial'    işlemden önce yoktu, sonradan oluştu ama tamamlanmamış
+            'unknown'    önceden vardı ve değişmiş; kimin yazdığı kanıtlanamaz
+        """
+        current = _identity(target)
+        before = operation.get('dst_id')
+        if before is not None and current == before:
+            return 'untouched'
+        source_id = operation.get('src_id')
+        if source_id is not None and current is not None and current[1:] == source_id[1:]:
+            return 'complete'
+        return 'partial' if before is None else 'unknown'
+
+    def select_completed(self, last: Optional[int] = None, since: Optional[float] = None,
+                         operations: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Tamamlanmış kullanıcı işlemlerinden son N tanesini veya since'ten
+        sonrakileri (yeniden eskiye) seçer; düzen taşımaları (reshard) hariç
+        """
+        if operations is None:
+            operations = self.read_operations()
+        operations = [op for op in operations
+                      if op['phase'] in COMPLETED_PHASES and op['op'] not in INTERNAL_KINDS]
+        if since is not None:
+            operations = [op for op in operations if op['ts'] >= since]
+        if last is not None:
+            operations = operations[-last:] if last > 0 else []
+        return list(reversed(operations))
+
+    def undo(self, last: Optional[int] = None, since: Optional[float] = None,
+             dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Seçilen işlemleri ters sırayla geri alır: taşınan/yeniden adlandırılan
+        dosyalar eski yerine (doluysa isim_N) döner, kopyalar silinir.
+
+        Returns:
+            {'undone': n, 'missing': n, 'failed': n, 'operations': [...]}
+        """
+        from name_index import get_name_index, move_exclusive
+
+        name_index = get_name_index()
+        result = {'undone': 0, 'missing': 0, 'failed': 0, 'operations': []}
+        operations = self.read_operations()
+        # Dosya sonradan alt klasöre taşındıysa (reshard) güncel yeri
+        relocated = {op['src']: op['dst'] for op in operations
+                     if op['op'] in INTERNAL_KINDS and op['phase'] in COMPLETED_PHASES}
+        for operation in self.select_completed(last, since, operations):
+            source = Path(operation['src'])
+            target = Path(_follow(relocated, operation['dst']))
+            result['operations'].append(operation)
+            if dry_run:
+                continue
+            if not os.path.lexists(target):
+                result['missing'] += 1
+                self.logger.warning(f"Geri alınamadı, dosya artık yok: {target}")
+                continue
+            try:
+                if operation['op'] in MOVE_KINDS:
+                    restored = name_index.place(target, source.parent, source.name, move_exclusive)
+                    name_index.release(target.parent, target.name)
+                    self.finish(operation['id'], 'undone', restored=str(restored))
+                else:
+                    os.unlink(target)
+                    name_index.release(target.parent, target.name)
+                    self.finish(operation['id'], 'undone')
+                result['undone'] += 1
+            except OSError as e:
+                result['failed'] += 1
+                self.logger.error(f"Geri alma hatası {target} -> {source}: {e}")
+        self.commit()
+        return result
+
+    def compact(self):
+        """
+        retention_days'ten eski işlemleri günlükten atar (atomik yeniden yazma).
+        Sadece özel kilit tutulurken çalışır; aksi halde günlüğe ekleme yapan
+        diğer süreçler eski dosyaya yazmaya devam eder ve kayıtlar kaybolur.
+        """
+        if not self.retention_days or not self._exclusive:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        expired = set()
+        kept = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('phase') == 'intent' and record['ts'] < cutoff:
+                expired.add(record['id'])
+            if record.get('id') not in expired:
+                kept.append(line)
+        if len(kept) == len(lines):
+            return
+
+        temp_file = self.journal_path.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.writelines(kept)
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            os.replace(temp_file, self.journal_path)
+            os.close(self._fd)
+            self._fd = os.open(str(self.journal_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.logger.info(f"İşlem günlüğü temizlendi: {len(lines) - len(kept)} eski kayıt silindi")
+
+    def close(self):
+        """Bekleyenleri diske yazar ve günlüğü kapatır"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True  # Bundan sonra ekleme yapılmaz
+            self._sync_needed.notify_all()
+            flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        with self._lock:
+            # Koşulsuz: sayacı sıfırlayan eşzamanlı bir commit() fsync'i henüz bitirmemiş olabilir
+            os.fsync(self._fd)
+            os.close(self._fd)
+            os.close(self._lock_fd)  # Kilit de bırakılır
+
+
+_default_journal = None
+_default_lock = threading.Lock()
+
+
+def get_move_journal() -> Optional[MoveJournal]:
+    """Uygulama genelinde paylaşılan işlem günlüğü (JOURNAL_ENABLED false ise None)"""
+    global _default_journal
+    with _default_lock:
+        if _default_journal is None:
+            config = Config()
+            if not config.JOURNAL_ENABLED:
+                return None
+            _default_journal = MoveJournal(
+                config.DATA_DIR / "move_journal.jsonl",
+                group_commit_interval=config.JOURNAL_GROUP_COMMIT_MS / 1000,
+                group_commit_records=config.JOURNAL_GROUP_COMMIT_RECORDS,
+                retention_days=config.JOURNAL_RETENTION_DAYS
+            )
+        return _default_journal
+
+
+def journaled(kind: str, operation: Callable[[Path, Path], Any]) -> Callable[[Path, Path], Any]:
+    """Günlük açıksa işlemi günlüğe kaydeden sarmalayıcı, kapalıysa işlemin kendisi"""
+    journal = get_move_journal()
+    return journal.wrap(kind, operation) if journal is not None else operation
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+İsim İndeksi - Hedef klasörlerde çakışmasız dosya adı ayırma
+
+Her klasör ilk kullanımda bir kez taranır (os.scandir); "isim_N.uzanti"
+biçimindeki dosyalardan her temel isim için sıradaki boş sayı tutulur.
+Böylece 900 "scan.pdf" kopyası olan bir klasöre taşıma yüzlerce exists()
+yerine O(1) ayırma ile yapılır.
+
+İndeks sadece bir tahmindir; asıl güvence işlemin kendisidir: taşıma
+renameat2(RENAME_NOREPLACE) (Linux), os.rename (Windows, hedef varsa hata
+verir) veya link+unlink ile, kopyalama ise O_EXCL ile açılan hedefe
+(copy_engine) yapılır.
+Başka bir süreç aynı ismi kaparsa FileExistsError alınır ve sıradaki isim
+denenir; hiçbir durumda mevcut bir dosyanın üzerine yazılmaz.
+"""
+
+import os
+import re
+import sys
+import errno
+import ctypes
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Set, Tuple, Callable, Optional
+
+from copy_engine import get_copy_engine
+from move_journal import journaled
+
+logger = logging.getLogger(__name__)
+
+# Aynı isim için art arda çakışmada en fazla deneme
+MAX_ATTEMPTS = 50
+
+SUFFIX_RE = re.compile(r'^(.*)_(\d+)$')
+
+AT_FDCWD = -100
+RENAME_NOREPLACE = 1
+
+_renameat2 = None
+if sys.platform.startswith('linux'):
+    try:
+        _renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+        _renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+        _renameat2.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _renameat2 = None  # glibc < 2.28
+
+
+def _rename_by_link(source: Path, target: Path):
+    """Hedef yoksa atomik olarak oluşturan link, ardından kaynağı siler"""
+    os.link(source, target)  # hedef varsa FileExistsError
+    os.unlink(source)
+
+
+def rename_noreplace(source: Path, target: Path):
+    """
+    Kaynağı hedefe taşır; hedef varsa üzerine yazmak yerine FileExistsError verir.
+
+    Raises:
+        FileExistsError: Hedef zaten var
+        OSError: errno.EXDEV ise farklı diskler arası taşıma (kopyala+sil gerekir)
+    """
+    if os.name == 'nt':
+        # Windows'ta os.rename hedef varsa zaten hata verir
+        os.rename(source, target)
+        return
+
+    if _renameat2 is not None:
+        result = _renameat2(AT_FDCWD, os.fsencode(str(source)), AT_FDCWD, os.fsencode(str(target)), RENAME_NOREPLACE)
+        if result == 0:
+            return
+        error = ctypes.get_errno()
+        if error == errno.EEXIST:
+            raise FileExistsError(error, os.strerror(error), str(target))
+        if error not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+            raise OSError(error, os.strerror(error), str(source))
+        # Dosya sistemi RENAME_NOREPLACE desteklemiyor, link yöntemine düş
+
+    try:
+        _rename_by_link(source, target)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            raise
+        # Hard link desteklenmiyor (ör. FAT/exFAT): son çare kontrol + rename
+        if os.path.lexists(target):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(target))
+        os.rename(source, target)
+
+
+def copy_exclusive(source: Path, target: Path):
+    """
+    Kaynağı sadece hedef yoksa oluşturarak kopyalar (O_EXCL); meta veriler korunur.
+    Kopyalama motoru reflink/copy_file_range kullanır, büyük dosyalarda devam ettirilebilir.
+
+    Raises:
+        FileExistsError: Hedef zaten var
+    """
+    get_copy_engine().copy(source, target, exclusive=True)
+
+
+def move_across_devices(source: Path, target: Path):
+    """Farklı diskler arası taşıma: O_EXCL kopyala + sil"""
+    copy_exclusive(source, target)
+    os.unlink(source)
+
+
+def move_exclusive(source: Path, target: Path):
+    """Aynı diskte atomik taşıma, farklı diskte O_EXCL kopyala + sil"""
+    try:
+        rename_noreplace(source, target)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        move_across_devices(source, target)
+
+
+class DirectoryNames:
+    """Tek bir klasörün isim kümesi ve temel isim -> sıradaki sayı tablosu"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.names: Set[str] = set()
+        self.next_counter: Dict[Tuple[str, str], int] = {}
+        self.scan()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        # Windows/macOS varsayılan dosya sistemleri büyük/küçük harf duyarsız
+        return os.path.normcase(name) if os.name == 'nt' or sys.platform == 'darwin' else name
+
+    def scan(self):
+        """Klasörü tek geçişte tarar"""
+        self.names.clear()
+        self.next_counter.clear()
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    self.add(entry.name)
+        except FileNotFoundError:
+            pass
+
+    def add(self, name: str):
+        """İsmi dolu olarak işaretler, sayaç tablosunu günceller"""
+        self.names.add(self._key(name))
+        stem, suffix = os.path.splitext(name)
+        match = SUFFIX_RE.match(stem)
+        if match:
+            base = (self._key(match.group(1)), self._key(suffix))
+            counter = int(match.group(2)) + 1
+            if counter > self.next_counter.get(base, 1):
+                self.next_counter[base] = counter
+
+    def discard(self, name: str):
+        self.names.discard(self._key(name))
+
+    def allocate(self, name: str) -> str:
+        """İsim boşsa kendisini, değilse "isim_N" biçiminde sıradaki boş ismi ayırır"""
+        if self._key(name) not in self.names:
+            self.add(name)
+            return name
+        stem, suffix = os.path.splitext(name)
+        base = (self._key(stem), self._key(suffix))
+        counter = self.next_counter.get(base, 1)
+        while True:
+            candidate = f"{stem}_{counter}{suffix}"
+            counter += 1
+            if self._key(candidate) not in self.names:
+                self.next_counter[base] = counter
+                self.add(candidate)
+                return candidate
+
+
+class NameIndex:
+    """Klasör başına isim indeksleri; thread-safe"""
+
+    def __init__(self):
+        self._directories: Dict[str, DirectoryNames] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _get(self, directory: Path) -> DirectoryNames:
+        key = os.path.normcase(os.path.abspath(directory))
+        names = self._directories.get(key)
+        if names is None:
+            names = DirectoryNames(Path(directory))
+            self._directories[key] = names
+        return names
+
+    def allocate(self, directory: Path, name: str) -> Path:
+        """Klasörde boş bir isim ayırır (işlem yapmadan); ayrılan isim dolu sayılır"""
+        with self._lock:
+            return directory / self._get(directory).allocate(name)
+
+    def release(self, directory: Path, name: str):
+        """Kullanılmayan ayrılmış ismi veya klasörden çıkan dosyayı serbest bırakır"""
+        with self._lock:
+            self._get(directory).discard(name)
+
+    def invalidate(self, directory: Path):
+        """Klasörün indeksini bir sonraki kullanımda yeniden taranmak üzere atar"""
+        with self._lock:
+            self._directories.pop(os.path.normcase(os.path.abspath(directory)), None)
+
+    def place(self, source: Path, directory: Path, name: str,
+              operation: Callable[[Path, Path], None]) -> Path:
+        """
+        Dosyayı klasöre çakışmasız bir isimle yerleştirir.
+
+        Args:
+            source: Kaynak dosya
+            directory: Hedef klasör
+            name: İstenen dosya adı
+            operation: Hedef varsa FileExistsError veren işlem (move_exclusive, copy_exclusive)
+
+        Returns:
+            Dosyanın son yolu
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            target = self.allocate(directory, name)
+            if target == source:
+                return source
+            try:
+                operation(source, target)
+            except FileExistsError:
+                # İndeks eski: klasörü yeniden tara ve sıradaki ismi dene
+                self.logger.debug(f"İsim başka bir işlem tarafından alınmış: {target.name}, klasör yeniden taranıyor")
+                self.invalidate(directory)
+                continue
+            except BaseException:
+                self.release(directory, target.name)
+                raise
+            if target.name != name:
+                self.logger.info(f"Dosya çakışması 'yeniden adlandır' stratejisiyle çözüldü: '{target.name}'")
+            return target
+        raise FileExistsError(errno.EEXIST, f"{MAX_ATTEMPTS} denemede boş isim bulunamadı", str(directory / name))
+
+    def move(self, source: Path, directory: Path, name: Optional[str] = None,
+             same_device: Optional[bool] = None, kind: str = 'move') -> Path:
+        """
+        Dosyayı klasöre taşır (aynı diskte atomik, hedefin üzerine asla yazmaz)
+
+        Args:
+            same_device: Çağıran st_dev karşılaştırmasını yaptıysa True/False;
+                         None ise önce rename denenir, EXDEV gelirse kopyalanır
+            kind: Günlükteki işlem türü ('reshard': arka plan düzen taşıması, geri alınmaz)
+        """
+        if same_device is None:
+            operation = move_exclusive
+        else:
+            operation = rename_noreplace if same_device else move_across_devices
+        target = self.place(source, directory, name or source.name, journaled(kind, operation))
+        if target != source and source.parent != directory:
+            self.release(source.parent, source.name)
+        return target
+
+    def copy(self, source: Path, directory: Path, name: Optional[str] = None,
+             strategy: str = 'copy') -> Path:
+        """
+        Dosyayı klasöre kopyalar (hedefin üzerine asla yazmaz)
+
+        Args:
+            strategy: 'copy', 'hardlink', 'reflink' veya 'symlink' (copy_engine.copy_with_strategy)
+        """
+        if strategy == 'copy':
+            operation = copy_exclusive
+        else:
+            engine = get_copy_engine()
+            operation = lambda src, dst: engine.copy_with_strategy(src, dst, strategy, exclusive=True)
+        return self.place(source, directory, name or source.name, journaled('copy', operation))
+
+    def rename(self, source: Path, new_name: str) -> Path:
+        """Dosyayı aynı klasörde yeni isme (doluysa new_name_N) taşır"""
+        target = self.place(source, source.parent, new_name, journaled('rename', rename_noreplace))
+        if target != source:
+            self.release(source.parent, source.name)
+        return target
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_name_index() -> NameIndex:
+    """Uygulama genelinde paylaşılan isim indeksi"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = NameIndex()
+        return _default_index
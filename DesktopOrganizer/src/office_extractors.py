@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Ofis Belgesi Çıkarıcıları - ZIP + XML tabanlı belgelerden akışlı metin çıkarma
+
+DOCX, XLSX, PPTX ve OpenDocument (ODT/ODS/ODP) dosyalarını DOM kurmadan,
+arşivi açıp ilgili XML parçasını iterparse ile okur. Metin parça parça
+üretilir ve karakter bütçesi dolunca okuma durur; bellek kullanımı belgenin
+veya gömülü medyanın boyutundan bağımsızdır.
+"""
+
+import re
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from utils import temporary_copy
+
+logger = logging.getLogger(__name__)
+
+# WordprocessingML isim alanı
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+CT_NS = '{http://schemas.openxmlformats.org/package/2006/content-types}'
+# SpreadsheetML / PresentationML / DrawingML isim alanları
+S_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+P_NS = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+# OpenDocument isim alanları
+TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+TABLE_NS = '{urn:oasis:names:tc:opendocument:xmlns:table:1.0}'
+DRAW_NS = '{urn:oasis:names:tc:opendocument:xmlns:drawing:1.0}'
+PRES_NS = '{urn:oasis:names:tc:opendocument:xmlns:presentation:1.0}'
+
+DOCX_MAIN_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml'
+DOCX_DEFAULT_PART = 'word/document.xml'
+
+
+class BoundedReader:
+    """
+    Dosya benzeri nesneden en fazla belirli sayıda bayt okunmasını sağlar.
+
+    Limit dolunca boş bayt döndürür; yarım kalan XML iterparse tarafından
+    ParseError olarak bildirilir ve çıkarıcılar bunu "bütçe doldu" sayar.
+    """
+
+    def __init__(self, raw, limit: int):
+        self.raw = raw
+        self.remaining = limit
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.raw.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+def _iterparse_bounded(zf: zipfile.ZipFile, part_name: str, max_bytes: int, events=('end',)):
+    """Arşivdeki XML parçasını bayt limitiyle iterparse eder, kesilmeyi sessizce bitirir"""
+    with zf.open(part_name) as raw:
+        try:
+            for item in ET.iterparse(BoundedReader(raw, max_bytes), events=events):
+                yield item
+        except ET.ParseError:
+            # Bayt limiti XML'i ortadan kesti - okunan kadarı yeterli
+            return
+
+
+def collect_text(chunks: Iterable[str], max_chars: int, separator: str = '\n') -> Optional[str]:
+    """
+    Metin parçalarını karakter bütçesi dolana kadar birleştirir.
+
+    Bütçe dolduğunda üreteç kapatılır, böylece kaynak dosya daha fazla okunmaz.
+
+    Args:
+        chunks: Metin parçası üreteci
+        max_chars: Maksimum karakter sayısı
+        separator: Parçalar arası ayraç
+
+    Returns:
+        Birleştirilmiş metin veya hiç metin yoksa None
+    """
+    parts = []
+    total = 0
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            chunk = chunk.strip()
+            if not chunk:
+                continue
+            remaining = max_chars - total
+            if remaining <= 0:
+                break
+            if len(chunk) > remaining:
+                chunk = chunk[:remaining]
+            parts.append(chunk)
+            total += len(chunk) + len(separator)
+            if total >= max_chars:
+                break
+    finally:
+        # Üreteci kapat (zip ve XML akışları finally bloklarında kapanır)
+        close = getattr(iterator, 'close', None)
+        if close:
+            close()
+
+    return separator.join(parts) if parts else None
+
+
+def _find_docx_main_part(zf: zipfile.ZipFile) -> str:
+    """[Content_Types].xml içinden ana belge parçasının adını bulur"""
+    try:
+        with zf.open('[Content_Types].xml') as ct_file:
+            for _, elem in ET.iterparse(ct_file):
+                if elem.tag == f'{CT_NS}Override' and elem.get('ContentType') == DOCX_MAIN_CONTENT_TYPE:
+                    return elem.get('PartName', '').lstrip('/') or DOCX_DEFAULT_PART
+    except (KeyError, ET.ParseError):
+        pass
+    return DOCX_DEFAULT_PART
+
+
+def iter_docx_text(file_path: Path) -> Iterator[str]:
+    """
+    DOCX belgesindeki paragrafları ve tablo satırlarını belge sırasıyla üretir.
+
+    Tablo satırları hücreler ' | ' ile birleştirilerek tek satır olarak döner.
+    İşlenen elemanlar ağaçtan koparılır; bellekte yalnızca açık elemanlar kalır.
+
+    Args:
+        file_path: DOCX dosya yolu
+
+    Yields:
+        Paragraf veya tablo satırı metni
+    """
+    with zipfile.ZipFile(str(file_path)) as zf:
+        part_name = _find_docx_main_part(zf)
+        with zf.open(part_name) as xml_file:
+            stack = []            # Açık elemanlar (ebeveyn bulmak için)
+            paragraph_stack = []  # İç içe paragraflar (metin kutuları) için tamponlar
+            cell_stack = []       # Açık tablo hücrelerinin metinleri
+            row_stack = []        # Açık tablo satırlarının hücreleri
+
+            for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                tag = elem.tag
+
+                if event == 'start':
+                    stack.append(elem)
+                    if tag == f'{W_NS}p':
+                        paragraph_stack.append([])
+                    elif tag == f'{W_NS}tc':
+                        cell_stack.append([])
+                    elif tag == f'{W_NS}tr':
+                        row_stack.append([])
+                    continue
+
+                stack.pop()
+
+                if tag == f'{W_NS}t':
+                    if paragraph_stack and elem.text:
+                        paragraph_stack[-1].append(elem.text)
+                elif tag == f'{W_NS}tab':
+                    if paragraph_stack:
+                        paragraph_stack[-1].append(' ')
+                elif tag == f'{W_NS}p':
+                    text = ''.join(paragraph_stack.pop()).strip()
+                    if text:
+                        if cell_stack:
+                            cell_stack[-1].append(text)
+                        else:
+                            yield text
+                elif tag == f'{W_NS}tc':
+                    cell_text = ' '.join(cell_stack.pop()).strip()
+                    if cell_text and row_stack:
+                        row_stack[-1].append(cell_text)
+                elif tag == f'{W_NS}tr':
+                    row = row_stack.pop()
+                    if row:
+                        row_text = ' | '.join(row)
+                        if cell_stack:
+                            # İç içe tablo: satırı dıştaki hücreye ekle
+                            cell_stack[-1].append(row_text)
+                        else:
+                            yield row_text
+                else:
+                    continue
+
+                # Paragraf/hücre/satır işlendi - ağaçtan kopar
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+
+
+def _extract_docx_dom(file_path: Path, max_chars: int) -> Optional[str]:
+    """DOCX dosyasından python-docx ile metin çıkarır (yedek yöntem)"""
+    try:
+        from docx import Document
+    except ImportError:
+        logger.warning("Uyarı: 'python-docx' paketi yüklü değil. DOCX yedek çıkarma devre dışı.")
+        return None
+
+    # Dosyayı copy edip temp'den oku (kilitleme önlemi)
+    with temporary_copy(file_path) as temp_path:
+        doc = Document(temp_path)
+
+        # Tüm paragrafları birleştir
+        paragraphs = [paragraph.text for paragraph in doc.paragraphs]
+
+        # Tabloları da ekle
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                if row_text:
+                    paragraphs.append(' | '.join(row_text))
+
+    return collect_text(paragraphs, max_chars)
+
+
+def extract_docx(file_path: Path, max_chars: int, max_bytes: int = 0) -> Optional[str]:
+    """
+    DOCX dosyasından karakter bütçesiyle sınırlı metin çıkarır.
+
+    Akışlı okuma başarısız olursa (bozuk XML vb.) python-docx ile tekrar denenir.
+
+    Args:
+        file_path: DOCX dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: Kullanılmaz (akışlı okuma bellekte sabit yer kaplar)
+
+    Returns:
+        Çıkarılan metin veya None
+    """
+    try:
+        return collect_text(iter_docx_text(file_path), max_chars)
+    except (ET.ParseError, KeyError) as e:
+        logger.warning(f"Akışlı DOCX çıkarma başarısız, python-docx deneniyor ({file_path.name}): {e}")
+        return _extract_docx_dom(file_path, max_chars)
+
+
+def _column_index(cell_ref: str) -> int:
+    """'C5' gibi hücre referansından sıfır tabanlı sütun indeksini döndürür"""
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + (ord(char.upper()) - ord('A') + 1)
+    return max(index - 1, 0)
+
+
+def _natural_key(name: str):
+    """slide10.xml'in slide2.xml'den sonra gelmesi için sayısal sıralama anahtarı"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+
+def _xlsx_sheet_names(zf: zipfile.ZipFile) -> list:
+    """Çalışma kitabındaki sayfa adlarını döndürür"""
+    names = []
+    try:
+        for _, elem in _iterparse_bounded(zf, 'xl/workbook.xml', 64 * 1024):
+            if elem.tag == f'{S_NS}sheet':
+                names.append(elem.get('name', ''))
+    except KeyError:
+        pass
+    return names
+
+
+def _xlsx_shared_strings(zf: zipfile.ZipFile, needed: set, max_bytes: int) -> dict:
+    """Sadece ihtiyaç duyulan paylaşılan metinleri, en büyük indekse kadar okur"""
+    strings = {}
+    if not needed:
+        return strings
+    last_needed = max(needed)
+    index = 0
+    try:
+        for _, elem in _iterparse_bounded(zf, 'xl/sharedStrings.xml', max_bytes):
+            if elem.tag != f'{S_NS}si':
+                continue
+            if index in needed:
+                strings[index] = ''.join(t.text or '' for t in elem.iter(f'{S_NS}t'))
+            elem.clear()
+            if index >= last_needed:
+                break
+            index += 1
+    except KeyError:
+        pass
+    return strings
+
+
+def extract_xlsx(file_path: Path, max_chars: int, max_bytes: int, sample_rows: int = 20) -> Optional[str]:
+    """
+    XLSX dosyasının ilk sayfasından başlık satırı ve örnek satırları çıkarır.
+
+    Args:
+        file_path: XLSX dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: Okunacak maksimum (açılmış) XML bayt sayısı
+        sample_rows: Başlık dahil alınacak satır sayısı
+
+    Returns:
+        Sayfa adları ve ' | ' ile ayrılmış satırlar veya None
+    """
+    with zipfile.ZipFile(str(file_path)) as zf:
+        sheet_parts = sorted(
+            (name for name in zf.namelist()
+             if name.startswith('xl/worksheets/sheet') and name.endswith('.xml')),
+            key=_natural_key
+        )
+        if not sheet_parts:
+            return None
+
+        # Hücreleri oku; paylaşılan metinler önce indeks olarak tutulur
+        rows = []
+        current_row = None
+        for _, elem in _iterparse_bounded(zf, sheet_parts[0], max_bytes):
+            if elem.tag == f'{S_NS}c':
+                if current_row is None:
+                    current_row = {}
+                cell_type = elem.get('t')
+                column = _column_index(elem.get('r', ''))
+                if cell_type == 'inlineStr':
+                    value = ''.join(t.text or '' for t in elem.iter(f'{S_NS}t'))
+                else:
+                    v = elem.find(f'{S_NS}v')
+                    value = v.text if v is not None else None
+                    if value is not None and cell_type == 's':
+                        value = int(value)  # Paylaşılan metin indeksi
+                if value not in (None, ''):
+                    current_row[column] = value
+                elem.clear()
+            elif elem.tag == f'{S_NS}row':
+                if current_row:
+                    rows.append(current_row)
+                current_row = None
+                elem.clear()
+                if len(rows) >= sample_rows:
+                    break
+
+        needed = {v for row in rows for v in row.values() if isinstance(v, int)}
+        shared = _xlsx_shared_strings(zf, needed, max_bytes)
+        sheet_names = _xlsx_sheet_names(zf)
+
+    def lines():
+        if sheet_names:
+            yield f"Sayfalar: {', '.join(sheet_names)}"
+        for row in rows:
+            values = [shared.get(v, '') if isinstance(v, int) else v for _, v in sorted(row.items())]
+            yield ' | '.join(str(v).strip() for v in values if str(v).strip())
+
+    return collect_text(lines(), max_chars)
+
+
+def _pptx_slide_title(zf: zipfile.ZipFile, part_name: str, max_bytes: int) -> Optional[str]:
+    """Slayttaki başlık yer tutucusunun metnini, yoksa ilk metin kutusunu döndürür"""
+    first_text = None
+    for _, elem in _iterparse_bounded(zf, part_name, max_bytes):
+        if elem.tag != f'{P_NS}sp':
+            continue
+        text = ' '.join(t.text.strip() for t in elem.iter(f'{A_NS}t') if t.text and t.text.strip())
+        placeholder = elem.find(f'{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph')
+        if text and placeholder is not None and placeholder.get('type') in ('title', 'ctrTitle'):
+            return text
+        if text and first_text is None:
+            first_text = text
+        elem.clear()
+    return first_text
+
+
+def extract_pptx(file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+    """
+    PPTX dosyasındaki slayt başlıklarını sırayla çıkarır.
+
+    Args:
+        file_path: PPTX dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: Tüm slaytlar için okunacak toplam maksimum XML bayt sayısı
+
+    Returns:
+        Her satırda bir slayt başlığı veya None
+    """
+    def titles(zf):
+        slide_parts = sorted(
+            (name for name in zf.namelist()
+             if name.startswith('ppt/slides/slide') and name.endswith('.xml')),
+            key=_natural_key
+        )
+        budget = max_bytes
+        for part_name in slide_parts:
+            if budget <= 0:
+                break
+            # Slayt kalan bütçeden fazlasını okuyamaz; bütçe beyan edilen boyut kadar azalır
+            title = _pptx_slide_title(zf, part_name, budget)
+            budget -= zf.getinfo(part_name).file_size
+            if title:
+                yield title
+
+    with zipfile.ZipFile(str(file_path)) as zf:
+        return collect_text(titles(zf), max_chars)
+
+
+def _odf_element_text(elem) -> str:
+    """ODF elemanındaki tüm metni (text:s boşlukları dahil) birleştirir"""
+    return ' '.join(''.join(elem.itertext()).split())
+
+
+def iter_odt_text(file_path: Path, max_bytes: int) -> Iterator[str]:
+    """ODT belgesindeki başlık ve paragrafları belge sırasıyla üretir"""
+    with zipfile.ZipFile(str(file_path)) as zf:
+        for _, elem in _iterparse_bounded(zf, 'content.xml', max_bytes):
+            if elem.tag in (f'{TEXT_NS}p', f'{TEXT_NS}h'):
+                text = _odf_element_text(elem)
+                elem.clear()
+                if text:
+                    yield text
+
+
+def extract_odt(file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+    """ODT dosyasından karakter ve bayt bütçesiyle sınırlı metin çıkarır"""
+    return collect_text(iter_odt_text(file_path, max_bytes), max_chars)
+
+
+def extract_ods(file_path: Path, max_chars: int, max_bytes: int, sample_rows: int = 20) -> Optional[str]:
+    """ODS dosyasının ilk tablosundan sayfa adı, başlık satırı ve örnek satırları çıkarır"""
+    def lines(zf):
+        row_count = 0
+        for event, elem in _iterparse_bounded(zf, 'content.xml', max_bytes, events=('start', 'end')):
+            if event == 'start':
+                # Tablo adı 'start' olayında okunur, satırlar daha sonra gelir
+                if elem.tag == f'{TABLE_NS}table' and elem.get(f'{TABLE_NS}name'):
+                    yield f"Sayfa: {elem.get(f'{TABLE_NS}name')}"
+                continue
+            if elem.tag == f'{TABLE_NS}table-row':
+                cells = [_odf_element_text(cell) for cell in elem.iter(f'{TABLE_NS}table-cell')]
+                elem.clear()
+                cells = [cell for cell in cells if cell]
+                if cells:
+                    yield ' | '.join(cells)
+                    row_count += 1
+            elif elem.tag == f'{TABLE_NS}table' or row_count >= sample_rows:
+                # Sadece ilk tablo örneklenir
+                break
+
+    with zipfile.ZipFile(str(file_path)) as zf:
+        return collect_text(lines(zf), max_chars)
+
+
+def extract_odp(file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+    """ODP dosyasındaki slayt başlıklarını (yoksa slayt adlarını) çıkarır"""
+    def titles(zf):
+        for _, elem in _iterparse_bounded(zf, 'content.xml', max_bytes):
+            if elem.tag != f'{DRAW_NS}page':
+                continue
+            title = None
+            for frame in elem.iter(f'{DRAW_NS}frame'):
+                if frame.get(f'{PRES_NS}class') == 'title':
+                    title = _odf_element_text(frame)
+                    break
+            if not title:
+                page_name = elem.get(f'{DRAW_NS}name', '')
+                # "page1" gibi otomatik adlar bilgi taşımaz
+                if page_name and not re.fullmatch(r'page\d+', page_name):
+                    title = page_name
+            elem.clear()
+            if title:
+                yield title
+
+    with zipfile.ZipFile(str(file_path)) as zf:
+        return collect_text(titles(zf), max_chars)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+PDF Çıkarıcısı - pdfminer.six ile PDF dosyalarından metin çıkarma
+
+pdfminer ağır bir bağımlılık olduğu için ilk PDF geldiğinde yüklenir.
+"""
+
+import math
+import logging
+from pathlib import Path
+from typing import Optional
+
+from utils import temporary_copy
+
+logger = logging.getLogger(__name__)
+
+_pdfminer = None
+
+# Karakter bütçesinden okunacak sayfa sayısını tahmin etmek için (seyrek sayfalar için düşük tutuldu)
+CHARS_PER_PAGE_ESTIMATE = 1500
+
+
+def _load_pdfminer():
+    """pdfminer.six modüllerini ilk kullanımda yükler; yüklenemezse None döndürür"""
+    global _pdfminer
+    if _pdfminer is None:
+        try:
+            from pdfminer.high_level import extract_text
+            from pdfminer.layout import LAParams
+            _pdfminer = (extract_text, LAParams)
+        except ImportError:
+            logger.warning("Uyarı: 'pdfminer.six' paketi yüklü değil. PDF çıkarma devre dışı.")
+            _pdfminer = False
+    return _pdfminer or None
+
+
+def extract_pdf(file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+    """
+    PDF dosyasından metin çıkarır.
+
+    Args:
+        file_path: PDF dosya yolu
+        max_chars: Maksimum karakter sayısı; sadece bu bütçeye yetecek kadar sayfa işlenir
+        max_bytes: Kullanılmaz (PDF yerleşimi için tüm dosya gerekir)
+
+    Returns:
+        Çıkarılan metin veya None
+    """
+    backend = _load_pdfminer()
+    if backend is None:
+        return None
+    pdf_extract_text, LAParams = backend
+
+    # Dosyayı copy edip temp'den oku (kilitleme önlemi)
+    with temporary_copy(file_path) as temp_path:
+        with open(temp_path, 'rb') as file:
+            # LAParams ile daha iyi metin çıkarma
+            laparams = LAParams(
+                all_texts=True,
+                word_margin=0.1,
+                char_margin=2.0,
+                line_margin=0.5,
+                boxes_flow=0.5
+            )
+
+            # Küçük bütçelerde (ör. ön getirme) sadece ilk sayfalar çözülür
+            max_pages = math.ceil(max_chars / CHARS_PER_PAGE_ESTIMATE) + 1
+            text = pdf_extract_text(file, laparams=laparams, maxpages=max_pages)
+
+    # Metni temizle
+    if text:
+        # Satır içi fazla boşlukları indirge; satır sonları başlık tespiti için korunur
+        text = '\n'.join(' '.join(line.split()) for line in text.splitlines() if line.strip())
+        return text[:max_chars] or None
+    return None
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Plan Dosyası - Kararları önce yaz, incele, sonra toplu uygula
+
+İçerik çıkarma ve AI isim önerisi gibi pahalı işler bir kez yapılır ve
+sonuçları bir plan dosyasına yazılır. Plan elle incelenip düzenlenebilir
+(satır silme, kategori/isim değiştirme), ardından apply ile uygulanır.
+
+Biçim (JSONL): ilk satır başlık, sonraki her satır bir dosyadır ve başlıktaki
+sütun sırasını izler:
+
+    {"plan": 1, "created": 1700000000.0, "root": "...", "columns": [...]}
+    ["/yol/rapor.pdf", "Belgeler", "2024_satis_raporu.pdf", "move", 48213, 1699999999000000000]
+
+Boyut ve mtime_ns dosyanın parmak izidir; uygulama sırasında değişmiş veya
+kaybolmuş dosyalar atlanır. Aynı dosya için birden fazla satır varsa (log_only
+her olayda satır ekler) en son satır geçerlidir.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+PLAN_VERSION = 1
+PLAN_COLUMNS = ('source', 'category', 'name', 'action', 'size', 'mtime_ns')
+PLAN_ACTIONS = ('move', 'copy')
+
+
+def fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """Dosyanın (boyut, mtime_ns) parmak izi; dosya yoksa None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class PlanWriter:
+    """Plan satırlarını dosyaya ekler; thread-safe"""
+
+    def __init__(self, plan_path: Path, root: Optional[Path] = None, append: bool = False):
+        self.plan_path = Path(plan_path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.written = 0
+
+        self.plan_path.parent.mkdir(parents=True, exist_ok=True)
+        has_header = append and self.plan_path.exists() and self.plan_path.stat().st_size > 0
+        self._file = open(self.plan_path, 'a' if append else 'w', encoding='utf-8')
+        if not has_header:
+            header = {'plan': PLAN_VERSION, 'created': time.time(),
+                      'root': str(root) if root else None, 'columns': list(PLAN_COLUMNS)}
+            self._file.write(json.dumps(header, ensure_ascii=False) + '\n')
+
+    def write(self, source: Path, category: str, name: Optional[str] = None, action: str = 'move') -> bool:
+        """
+        Dosya için bir plan satırı yazar (parmak izi şimdi alınır)
+
+        Returns:
+            Dosya artık yoksa False
+        """
+        current = fingerprint(source)
+        if current is None:
+            return False
+        row = [str(source), category, name, action, current[0], current[1]]
+        with self._lock:
+            self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+            self._file.flush()
+            self.written += 1
+        return True
+
+    def write_entries(self, entries: Iterable[Dict[str, Any]], action: str = 'move') -> int:
+        """BulkOrganizer.plan() çıktısını yazar; sınıflandırılamayanlar atlanır"""
+        count = 0
+        for entry in entries:
+            if entry['category'] and self.write(entry['source'], entry['category'], entry['name'],
+                                                entry.get('action', action)):
+                count += 1
+        return count
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_plan(plan_path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Plan dosyasını okur
+
+    Returns:
+        (başlık, [{'source': Path, 'category', 'name', 'action', 'size', 'mtime_ns', 'line'}, ...])
+
+    Raises:
+        ValueError: Başlık yoksa veya sürüm desteklenmiyorsa
+    """
+    entries = []
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get('plan') != PLAN_VERSION:
+            raise ValueError(f"Geçerli bir plan dosyası değil: {plan_path}")
+        columns = header.get('columns') or list(PLAN_COLUMNS)
+
+        for line_number, line in enumerate(f, start=2):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                logger.warning(f"Plan satırı okunamadı ({plan_path}:{line_number}), atlanıyor")
+                continue
+            entry = dict(zip(columns, row)) if isinstance(row, list) else dict(row)
+            if not entry.get('source'):
+                continue
+            entry['source'] = Path(entry['source'])
+            entry['line'] = line_number
+            entries.append(entry)
+    return header, entries
+
+
+def _is_valid_name(name: Any) -> bool:
+    """İsim boş veya yalın bir dosya adı mı (dizin bileşeni içermemeli)"""
+    if name is None or name == '':
+        return True
+    if not isinstance(name, str) or name in ('.', '..') or Path(name).name != name:
+        return False
+    return os.sep not in name and not (os.altsep and os.altsep in name)
+
+
+def validate_entries(entries: List[Dict[str, Any]], categories: Iterable[str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Plan satırlarını uygulamadan hemen önce yeniden doğrular
+
+    Returns:
+        (uygulanacak satırlar, {'missing': n, 'changed': n, 'invalid': n})
+    """
+    categories = set(categories)
+    valid = []
+    skipped = {'missing': 0, 'changed': 0, 'invalid': 0}
+    # Aynı kaynak için yalnız son satır uygulanır; sıra son satırların sırasıdır
+    latest = {}
+    for entry in entries:
+        latest.pop(entry['source'], None)
+        latest[entry['source']] = entry
+    for source, entry in latest.items():
+        if (entry.get('category') not in categories or entry.get('action', 'move') not in PLAN_ACTIONS
+                or not _is_valid_name(entry.get('name'))):
+            skipped['invalid'] += 1
+            logger.warning(f"Geçersiz plan satırı {entry.get('line')}: {source}")
+            continue
+        current = fingerprint(source)
+        if current is None:
+            skipped['missing'] += 1
+            continue
+        if entry.get('size') is not None and current != (entry['size'], entry.get('mtime_ns')):
+            skipped['changed'] += 1
+            logger.info(f"Plandan sonra değişmiş, atlanıyor: {source}")
+            continue
+        valid.append(entry)
+    return valid, skipped
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Önemli Kesit Seçici - AI adlandırma öncesi içerikten en bilgilendirici metni seçer
+
+İçerik satırlara/cümle parçalarına bölünür, her parça tarih, tutar, şirket
+adı, başlık görünümü ve TF-IDF anahtar kelime ağırlığına göre puanlanır.
+En yüksek puanlı parçalar token bütçesine sığacak şekilde seçilip özgün
+sıralarıyla birleştirilir. Tamamen yerel ve hızlıdır (regex'ler modül
+yüklenirken derlenir).
+"""
+
+import re
+import math
+from collections import Counter
+from typing import List, Tuple
+
+# Yaklaşık token hesabı: Gemini için ortalama ~4 karakter/token
+CHARS_PER_TOKEN = 4
+
+# Parça uzunluk sınırları
+MAX_SEGMENT_CHARS = 240
+WINDOW_WORDS = 30
+
+TURKISH_MONTHS = (
+    'ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık|'
+    'january|february|march|april|may|june|july|august|september|october|november|december|'
+    'jan|feb|mar|apr|jun|jul|aug|sep|oct|nov|dec'
+)
+
+DATE_RE = re.compile(
+    r'\b(?:\d{1,2}[./-]\d{1,2}[./-](?:19|20)\d{2}'      # 15.03.2024, 15/03/2024
+    r'|(?:19|20)\d{2}[./-]\d{1,2}[./-]\d{1,2}'           # 2024-03-15
+    rf'|\d{{1,2}}\s+(?:{TURKISH_MONTHS})\s+(?:19|20)\d{{2}}'  # 15 Mart 2024
+    rf'|(?:{TURKISH_MONTHS})\s+\d{{1,2}},?\s+(?:19|20)\d{{2}})\b',
+    re.IGNORECASE
+)
+AMOUNT_RE = re.compile(
+    r'(?:[₺$€£]\s?\d[\d.,]*|\d[\d.,]*\s?(?:TL|TRY|USD|EUR|GBP|₺|\$|€|£))'
+    r'|\b(?:toplam|tutar|total|amount|kdv|vat|ödenecek)\b',
+    re.IGNORECASE
+)
+COMPANY_RE = re.compile(
+    r'\b(?:A\.?\s?Ş\.?|Ltd\.?|Şti\.?|Inc\.?|LLC|GmbH|Corp\.?|Co\.|PLC|S\.A\.'
+    r'|Holding|Şirketi|Bankası|Bank|Üniversitesi|University|Bakanlığı|Belediyesi)(?=\s|$|[,.;])',
+    re.IGNORECASE
+)
+DOC_TYPE_RE = re.compile(
+    r'\b(?:fatura|e-fatura|e-arşiv|makbuz|dekont|invoice|receipt|rapor|report|sözleşme|contract|'
+    r'agreement|teklif|proposal|özgeçmiş|resume|cv|sertifika|certificate|diploma|ödev|assignment|'
+    r'sunum|presentation|tutanak|dilekçe|poliçe|policy|beyanname|bordro|ekstre|statement)\b',
+    re.IGNORECASE
+)
+WORD_RE = re.compile(r'[^\W\d_]{3,}', re.UNICODE)
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?;:])\s+')
+NOISE_RE = re.compile(r'^[\W\d_]+$', re.UNICODE)
+
+# Anahtar kelime hesabında yok sayılan sık kelimeler
+STOPWORDS = frozenset("""
+ve ile için bir bu şu da de ki mi mı mu mü gibi daha çok en olan olarak veya ya ancak ama
+her tüm sayı adet no nolu tarih sayfa page the and for with that this from are was were
+you your our not but all any can will have has had per its their there which
+""".split())
+
+# Puan ağırlıkları
+WEIGHT_DATE = 3.0
+WEIGHT_AMOUNT = 2.0
+WEIGHT_COMPANY = 2.5
+WEIGHT_DOC_TYPE = 3.0
+WEIGHT_HEADING = 1.5
+WEIGHT_KEYWORDS = 1.0
+WEIGHT_POSITION = 1.0
+REPEAT_PENALTY = 0.3
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin yaklaşık token sayısını döndürür"""
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def split_segments(content: str) -> List[str]:
+    """
+    İçeriği puanlanabilir parçalara böler.
+
+    Satır sonu varsa satırlar kullanılır; uzun satırlar (ör. boşlukları
+    birleştirilmiş PDF metni) cümlelere, o da olmazsa kelime pencerelerine bölünür.
+    """
+    segments = []
+    for line in content.splitlines():
+        line = ' '.join(line.split())
+        if not line:
+            continue
+        if len(line) <= MAX_SEGMENT_CHARS:
+            segments.append(line)
+            continue
+        for sentence in SENTENCE_SPLIT_RE.split(line):
+            if len(sentence) <= MAX_SEGMENT_CHARS:
+                segments.append(sentence)
+                continue
+            words = sentence.split()
+            for start in range(0, len(words), WINDOW_WORDS):
+                segments.append(' '.join(words[start:start + WINDOW_WORDS]))
+    return segments
+
+
+def _is_heading(segment: str) -> bool:
+    """Kısa, nokta ile bitmeyen, büyük harfli veya Başlık Düzeninde satır mı"""
+    if len(segment) > 80 or segment.endswith('.'):
+        return False
+    letters = [c for c in segment if c.isalpha()]
+    if len(letters) < 3:
+        return False
+    if sum(c.isupper() for c in letters) / len(letters) > 0.7:
+        return True
+    words = [w for w in segment.split() if w[:1].isalpha()]
+    return len(words) >= 2 and sum(w[0].isupper() for w in words) / len(words) > 0.8
+
+
+def _tokenize(segments: List[str]) -> List[List[str]]:
+    """Parçaları küçük harfli, durak kelimelerden arındırılmış kelime listelerine çevirir"""
+    return [[w for w in WORD_RE.findall(s.lower()) if w not in STOPWORDS] for s in segments]
+
+
+def _term_weights(tokenized: List[List[str]]) -> Counter:
+    """
+    TF-IDF ağırlıkları: her parça bir "belge"; belge içinde sık, parçalar
+    arasında seyrek geçen kelimeler içeriğin ana konusunu temsil eder
+    """
+    document_frequency = Counter()
+    term_frequency = Counter()
+    for words in tokenized:
+        term_frequency.update(words)
+        document_frequency.update(set(words))
+
+    segment_count = len(tokenized)
+    return Counter({
+        term: count * math.log(1 + segment_count / document_frequency[term])
+        for term, count in term_frequency.items()
+    })
+
+
+def extract_keywords(content: str, limit: int = 5) -> List[str]:
+    """
+    İçeriğin baskın anahtar kelimelerini TF-IDF ağırlığına göre döndürür.
+
+    Args:
+        content: Çıkarılmış dosya içeriği
+        limit: En fazla kelime sayısı
+
+    Returns:
+        Ağırlığa göre azalan sırada kelimeler
+    """
+    segments = split_segments(content)
+    if not segments:
+        return []
+    return [term for term, _ in _term_weights(_tokenize(segments)).most_common(limit)]
+
+
+def score_segments(segments: List[str]) -> List[float]:
+    """
+    Her parça için önem puanı hesaplar.
+
+    Args:
+        segments: Metin parçaları
+
+    Returns:
+        Parçalarla aynı sıradaki puan listesi
+    """
+    if not segments:
+        return []
+
+    tokenized = _tokenize(segments)
+    segment_count = len(segments)
+    top_terms = dict(_term_weights(tokenized).most_common(25))
+    max_weight = max(top_terms.values(), default=1.0) or 1.0
+
+    # Sayfa üst/alt bilgisi gibi tekrar eden parçalar
+    repeats = Counter(segments)
+
+    scores = []
+    for index, (segment, words) in enumerate(zip(segments, tokenized)):
+        score = 0.0
+        if DATE_RE.search(segment):
+            score += WEIGHT_DATE
+        if AMOUNT_RE.search(segment):
+            score += WEIGHT_AMOUNT
+        if COMPANY_RE.search(segment):
+            score += WEIGHT_COMPANY
+        if DOC_TYPE_RE.search(segment):
+            score += WEIGHT_DOC_TYPE
+        if _is_heading(segment):
+            score += WEIGHT_HEADING
+        if words:
+            keyword_score = sum(top_terms.get(w, 0.0) for w in set(words)) / max_weight
+            score += WEIGHT_KEYWORDS * min(keyword_score, 3.0)
+        # Belgenin başı genelde başlık/taraf bilgilerini içerir
+        score += WEIGHT_POSITION * (1.0 - index / segment_count)
+        if repeats[segment] > 1:
+            score *= REPEAT_PENALTY / repeats[segment]
+        if NOISE_RE.match(segment):
+            score *= 0.1
+        scores.append(score)
+    return scores
+
+
+def select_snippet(content: str, token_budget: int) -> str:
+    """
+    İçerikten token bütçesine sığan en bilgilendirici kesiti seçer.
+
+    Args:
+        content: Çıkarılmış dosya içeriği
+        token_budget: Kesit için izin verilen yaklaşık token sayısı
+
+    Returns:
+        Seçilen parçaların özgün sırayla birleşimi
+    """
+    if not content:
+        return ''
+    if estimate_tokens(content) <= token_budget:
+        return content.strip()
+
+    segments = split_segments(content)
+    scores = score_segments(segments)
+
+    # Puan yoğunluğuna (puan / token) göre açgözlü seçim; aynı parça bir kez alınır
+    ranked: List[Tuple[float, int]] = sorted(
+        ((score / estimate_tokens(segment), index) for index, (segment, score) in enumerate(zip(segments, scores))),
+        reverse=True
+    )
+    selected = []
+    seen = set()
+    used_tokens = 0
+    for _, index in ranked:
+        segment = segments[index]
+        if segment in seen:
+            continue
+        cost = estimate_tokens(segment) + 1  # +1 satır sonu için
+        if used_tokens + cost > token_budget:
+            continue
+        selected.append(index)
+        seen.add(segment)
+        used_tokens += cost
+        if used_tokens >= token_budget:
+            break
+
+    return '\n'.join(segments[index] for index in sorted(selected))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Hedef Klasör Düzeni - Büyük kategorileri alt klasörlere bölme (sharding)
+
+TARGET_LAYOUT şablonu dosyanın kategori içindeki alt klasörünü belirler:
+
+    {category}                düz (varsayılan)
+    {category}/{yyyy}/{mm}    dosyanın değiştirilme tarihine göre yıl/ay
+    {category}/{yyyy}-{mm}    tek seviye yıl-ay
+    {category}/{hash2}        dosya adı özetinin ilk 2 hex karakteri (256 klasör)
+    {category}/{ext}          uzantıya göre
+
+Kullanılabilir alanlar: category, yyyy, mm, dd, ext, hash1..hash4.
+
+LayoutMigrator düz kalmış (eski) kategori klasörlerini arka planda küçük
+gruplar halinde yeni düzene taşır; her taşıma tek bir atomik rename olduğu
+ve gruplar arasında beklendiği için yeni dosyaların taşınmasını engellemez.
+"""
+
+import os
+import re
+import string
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DATE_FIELDS = {'yyyy', 'mm', 'dd'}
+HASH_FIELD_RE = re.compile(r'^hash([1-4])$')
+
+
+class TargetLayout:
+    """Şablona göre dosyanın hedef klasörünü hesaplar"""
+
+    def __init__(self, template: str = '{category}'):
+        self.logger = logging.getLogger(__name__)
+        template = (template or '{category}').replace('\\', '/').strip('/')
+        try:
+            self.parts = self._parse(template)
+        except ValueError as e:
+            self.logger.error(f"Geçersiz TARGET_LAYOUT '{template}' ({e}), düz düzen kullanılıyor")
+            template, self.parts = '{category}', []
+        self.template = template
+        self.fields = {field for part in self.parts
+                       for _, field, _, _ in string.Formatter().parse(part) if field}
+
+    @staticmethod
+    def _parse(template: str):
+        if not template.startswith('{category}'):
+            raise ValueError("şablon {category} ile başlamalı")
+        parts = [part for part in template[len('{category}'):].split('/') if part]
+        for part in parts:
+            for _, field, _, _ in string.Formatter().parse(part):
+                if field is None:
+                    continue
+                if field == 'category':
+                    raise ValueError("{category} sadece başta kullanılabilir")
+                if field not in DATE_FIELDS and field != 'ext' and not HASH_FIELD_RE.match(field):
+                    raise ValueError(f"bilinmeyen alan {{{field}}}")
+        return parts
+
+    @property
+    def is_flat(self) -> bool:
+        return not self.parts
+
+    def resolve(self, category_dir: Path, file_path: Path, modified: Optional[float] = None,
+                name: Optional[str] = None) -> Path:
+        """
+        Dosyanın hedef klasörünü döndürür
+
+        Args:
+            category_dir: Kategorinin kök klasörü
+            file_path: Yerleştirilecek dosya (tarih alanları için stat edilir)
+            modified: Değiştirilme zamanı (verilirse stat yapılmaz)
+            name: Hedefteki dosya adı (yeniden adlandırılıyorsa; ext/hash alanları için)
+        """
+        if not self.parts:
+            return category_dir
+
+        values: Dict[str, Any] = {}
+        if self.fields & DATE_FIELDS:
+            if modified is None:
+                modified = file_path.stat().st_mtime
+            date = datetime.fromtimestamp(modified)
+            values.update(yyyy=f"{date.year:04d}", mm=f"{date.month:02d}", dd=f"{date.day:02d}")
+        name = name or file_path.name
+        if 'ext' in self.fields:
+            values['ext'] = Path(name).suffix.lstrip('.').lower() or 'uzantisiz'
+        hash_fields = [field for field in self.fields if HASH_FIELD_RE.match(field)]
+        if hash_fields:
+            digest = hashlib.sha1(name.lower().encode('utf-8')).hexdigest()
+            for field in hash_fields:
+                values[field] = digest[:int(field[4:])]
+
+        return category_dir.joinpath(*(part.format(**values) for part in self.parts))
+
+
+class LayoutMigrator:
+    """Kategori köklerindeki düz dosyaları arka planda yeni düzene taşır"""
+
+    def __init__(self, file_manager):
+        self.file_manager = file_manager
+        self.config = file_manager.config
+        self.layout: TargetLayout = file_manager.layout
+        self.logger = logging.getLogger(__name__)
+
+        self.batch_size = self.config.RESHARD_BATCH_SIZE
+        self.pause = self.config.RESHARD_PAUSE
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.moved = 0
+        self.failed = 0
+
+    def start(self):
+        """Düzen düz değilse ve RESHARD_ENABLED açıksa taşımayı arka planda başlatır"""
+        if self.layout.is_flat or not self.config.RESHARD_ENABLED:
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="layout-migrator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        """Her kategori kökünü grup grup boşaltır; kesilirse bir sonraki başlatmada kaldığı yerden sürer"""
+        for category_dir in {Path(path) for path in self.config.CATEGORIES.values()}:
+            while not self._stop.is_set():
+                batch = self._next_batch(category_dir)
+                if not batch:
+                    break
+                if not self._migrate_batch(category_dir, batch):
+                    break  # Kalan dosyalar kökte kalmalı veya taşınamıyor
+                # Yeni dosyaların taşınmasına ve diske nefes aldır
+                self._stop.wait(self.pause)
+        if self.moved or self.failed:
+            self.logger.info(f"Klasör düzeni taşıması bitti: {self.moved} dosya taşındı, {self.failed} hata")
+
+    def _next_batch(self, category_dir: Path):
+        """Kök klasörde doğrudan duran ilk batch_size dosyayı (yol, mtime) olarak döndürür"""
+        batch = []
+        try:
+            with os.scandir(category_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file(follow_symlinks=False):
+                        continue
+                    batch.append((Path(entry.path), entry.stat(follow_symlinks=False).st_mtime))
+                    if len(batch) >= self.batch_size:
+                        break
+        except FileNotFoundError:
+            pass
+        return batch
+
+    def _migrate_batch(self, category_dir: Path, batch) -> int:
+        """Grubu taşır, taşınan dosya sayısını döndürür"""
+        created: Set[Path] = set()
+        name_index = self.file_manager.name_index
+        dedup_index = self.file_manager.dedup_index
+        moved_in_batch = 0
+        for file_path, modified in batch:
+            if self._stop.is_set():
+                break
+            target_dir = self.layout.resolve(category_dir, file_path, modified)
+            if target_dir == category_dir:
+                continue
+            try:
+                if target_dir not in created:
+                    target_dir.mkdir(parents=True, exist_ok=True)
+                    created.add(target_dir)
+                target = name_index.move(file_path, target_dir, file_path.name, kind='reshard')
+            except FileNotFoundError:
+                continue  # Kullanıcı bu arada taşımış/silmiş
+            except OSError as e:
+                self.failed += 1
+                self.logger.error(f"Düzen taşıma hatası '{file_path}': {e}")
+                continue
+            if dedup_index is not None:
+                dedup_index.remove(file_path)
+                dedup_index.add(target)
+            moved_in_batch += 1
+        self.moved += moved_in_batch
+        if moved_in_batch:
+            self.logger.info(f"Düzen taşıması: {category_dir.name} içinden {moved_in_batch} dosya alt klasörlere taşındı")
+        return moved_in_batch
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'moved': self.moved,
+            'failed': self.failed
+        }
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Metin Çıkarıcıları - Düz metin, kod, CSV ve RTF dosyalarından sınırlı okuma
+
+Her çıkarıcı dosyanın yalnızca başından en fazla max_bytes bayt okur.
+Kodlama BOM, katı UTF-8 denemesi, (varsa) charset-normalizer ve Türkçe
+Windows kod sayfası sırasıyla tespit edilir.
+"""
+
+import re
+import csv
+import codecs
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+from office_extractors import collect_text
+
+# Kodlama tespiti (opsiyonel)
+try:
+    from charset_normalizer import from_bytes as detect_charset
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# BOM -> kodlama eşlemesi (uzun BOM'lar önce kontrol edilmeli)
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Son çare kodlamaları: Türkçe Windows, ardından her baytı kabul eden latin-1
+FALLBACK_ENCODINGS = ('cp1254', 'latin-1')
+
+
+def read_head(file_path: Path, max_bytes: int) -> bytes:
+    """Dosyanın başından en fazla max_bytes bayt okur"""
+    with open(file_path, 'rb') as f:
+        return f.read(max_bytes)
+
+
+def detect_encoding(raw: bytes) -> str:
+    """
+    Ham baytların kodlamasını tahmin eder.
+
+    Args:
+        raw: Dosyanın başından okunan baytlar (sonu yarım karakterle bitebilir)
+
+    Returns:
+        Python codec adı
+    """
+    for bom, encoding in BOMS:
+        if raw.startswith(bom):
+            return encoding
+
+    # Katı UTF-8 denemesi; artımlı çözücü sondaki yarım karakteri hata saymaz
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(raw, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best = detect_charset(raw).best()
+        if best is not None:
+            return best.encoding
+
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            raw.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1'
+
+
+def decode_head(raw: bytes) -> Tuple[str, str]:
+    """Baytları tespit edilen kodlamayla çözer; (metin, kodlama) döndürür"""
+    encoding = detect_encoding(raw)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    return decoder.decode(raw, final=False), encoding
+
+
+def extract_plain_text(file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+    """
+    Düz metin veya kaynak kod dosyasından sınırlı metin çıkarır.
+
+    Args:
+        file_path: Dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: Okunacak maksimum bayt sayısı
+
+    Returns:
+        Çıkarılan metin veya None
+    """
+    raw = read_head(file_path, max_bytes)
+    if not raw:
+        return None
+    if b'\x00' in raw[:1024] and not raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        # Metin uzantılı ikili dosya
+        logger.debug(f"İkili içerik tespit edildi, metin çıkarılmadı: {file_path.name}")
+        return None
+
+    text, encoding = decode_head(raw)
+    logger.debug(f"Metin kodlaması: {file_path.name} -> {encoding}")
+    return collect_text(text.splitlines(), max_chars)
+
+
+def extract_csv(file_path: Path, max_chars: int, max_bytes: int, sample_rows: int = 20) -> Optional[str]:
+    """
+    CSV dosyasından başlık satırı ve örnek satırları çıkarır.
+
+    Args:
+        file_path: CSV dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: Okunacak maksimum bayt sayısı
+        sample_rows: Başlık dahil alınacak satır sayısı
+
+    Returns:
+        ' | ' ile ayrılmış satırlar veya None
+    """
+    raw = read_head(file_path, max_bytes)
+    if not raw:
+        return None
+
+    text, _ = decode_head(raw)
+    lines = text.splitlines()
+    if len(raw) == max_bytes and len(lines) > 1:
+        lines = lines[:-1]  # Limit nedeniyle yarım kalmış son satır
+
+    # Ayracı ilk satırlardan tahmin et (Türkçe Excel genelde ';' kullanır)
+    try:
+        dialect = csv.Sniffer().sniff('\n'.join(lines[:5]), delimiters=',;\t|')
+    except csv.Error:
+        dialect = csv.excel
+
+    def rows():
+        for index, row in enumerate(csv.reader(lines, dialect)):
+            if index >= sample_rows:
+                break
+            cells = [cell.strip() for cell in row if cell.strip()]
+            if cells:
+                yield ' | '.join(cells)
+
+    return collect_text(rows(), max_chars)
+
+
+# RTF kontrol kelimeleri, onaltılık kaçışlar ve grup sınırları
+RTF_TOKEN_RE = re.compile(r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\([^a-zA-Z])|([{}])|[\r\n]+|([^\\{}\r\n]+)")
+
+# İçeriği metin olmayan hedef grupları
+RTF_SKIP_DESTINATIONS = {
+    'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'object', 'header', 'footer',
+    'headerl', 'headerr', 'footerl', 'footerr', 'listtable', 'listoverridetable',
+    'rsidtbl', 'generator', 'xmlnstbl', 'themedata', 'colorschememapping', 'latentstyles',
+    'datastore', 'filetbl', 'revtbl', 'pgdsctbl',
+}
+
+RTF_SPECIAL_CHARS = {
+    'par': '\n', 'line': '\n', 'sect': '\n', 'page': '\n', 'row': '\n',
+    'tab': ' ', 'cell': ' | ', 'emdash': '—', 'endash': '–', 'bullet': '•',
+    'lquote': '‘', 'rquote': '’', 'ldblquote': '“', 'rdblquote': '”',
+}
+
+
+def extract_rtf(file_path: Path, max_chars: int, max_bytes: int) -> Optional[str]:
+    """
+    RTF dosyasından kontrol kelimelerini atarak düz metin çıkarır.
+
+    Args:
+        file_path: RTF dosya yolu
+        max_chars: Maksimum karakter sayısı
+        max_bytes: Okunacak maksimum bayt sayısı
+
+    Returns:
+        Çıkarılan metin veya None
+    """
+    raw = read_head(file_path, max_bytes)
+    if not raw.startswith(b'{\\rtf'):
+        return None
+
+    # RTF 7-bit ASCII'dir; 8-bit karakterler \'hh kaçışlarıyla ansicpg kod sayfasında gelir
+    source = raw.decode('latin-1')
+    codepage_match = re.search(r'\\ansicpg(\d+)', source[:2048])
+    codepage = f"cp{codepage_match.group(1)}" if codepage_match else 'cp1254'
+    try:
+        codecs.lookup(codepage)
+    except LookupError:
+        codepage = 'cp1254'
+
+    output = []
+    pending_bytes = bytearray()
+    stack = []
+    skip = False
+    unicode_skip = 1  # \ucN: \uN'den sonra atlanacak yedek karakter sayısı
+    skip_chars = 0
+
+    def flush_bytes():
+        if pending_bytes:
+            output.append(pending_bytes.decode(codepage, errors='replace'))
+            pending_bytes.clear()
+
+    for match in RTF_TOKEN_RE.finditer(source):
+        word, arg, hex_code, symbol, brace, text = match.groups()
+
+        if brace == '{':
+            flush_bytes()
+            stack.append((skip, unicode_skip))
+        elif brace == '}':
+            flush_bytes()
+            if stack:
+                skip, unicode_skip = stack.pop()
+        elif symbol == '*':
+            skip = True  # Bilinmeyen hedef grubu
+        elif skip:
+            continue
+        elif word:
+            flush_bytes()
+            if word in RTF_SKIP_DESTINATIONS:
+                skip = True
+            elif word == 'uc':
+                unicode_skip = int(arg or 1)
+            elif word == 'u' and arg:
+                code = int(arg)
+                output.append(chr(code + 0x10000 if code < 0 else code))
+                skip_chars = unicode_skip
+            elif word in RTF_SPECIAL_CHARS:
+                output.append(RTF_SPECIAL_CHARS[word])
+        elif hex_code:
+            if skip_chars:
+                skip_chars -= 1
+                continue
+            pending_bytes.append(int(hex_code, 16))
+        elif symbol:
+            flush_bytes()
+            if symbol in '\\{}':
+                output.append(symbol)
+            elif symbol == '~':
+                output.append(' ')
+        elif text:
+            flush_bytes()
+            if skip_chars:
+                consumed = min(skip_chars, len(text))
+                text = text[consumed:]
+                skip_chars -= consumed
+            output.append(text)
+
+    flush_bytes()
+    return collect_text(''.join(output).splitlines(), max_chars)
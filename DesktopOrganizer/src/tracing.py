@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+İzleme (Tracing) - Dosya başına iç içe zaman aralıkları (span)
+
+Bir dosyanın işlenmesi tek bir iz (trace) altında toplanır. Modüller bu iz
+altında span açar; her span'ın başlangıcı, süresi ve öznitelikleri kaydedilir:
+
+    file                 iz kökü (izleyici: yol, olay türü)
+      stability          kararlılık döngüsü
+      extract            içerik çıkarma
+        extractor        çıkarıcı (pdf, docx, ocr...)
+          temp_copy      kilit önlemi için geçici kopya
+      classify           kategori belirleme
+      ai_call            Gemini çağrısı (olay döngüsü thread'inde)
+      user_dialog        onay penceresi
+      move / copy        dosya işlemi
+        copy_data        veri kopyalama (disk dışı taşıma, kopya)
+
+Bağlam contextvars ile taşınır; AI olay döngüsüne gönderilen istekler de
+isteği başlatan dosyanın izine bağlanır. Etkin iz yoksa span() hiçbir şey
+yapmaz, yani izlenmeyen işler (ön getirme, toplu organizasyon) maliyet
+ödemez. Biten span'lar kuyruğa atılır ve arka plan thread'i tarafından dönen
+(rotating) JSONL dosyasına yazılır.
+
+İzleri Chrome/Perfetto (chrome://tracing, ui.perfetto.dev) ile açmak için:
+    python tracing.py -o trace.json
+    python tracing.py data/logs/trace.jsonl --min-duration 10 -o yavas.json
+"""
+
+import json
+import time
+import queue
+import random
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Yazıcı thread'inin bir seferde kuyruktan aldığı en fazla span
+WRITE_BATCH_SIZE = 512
+
+
+def _new_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+class Span:
+    """Bir zaman aralığı; bittiğinde izleyiciye verilir"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'attributes', 'start_us', '_started', 'error')
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_us = time.time_ns() // 1000
+        self._started = time.perf_counter_ns()
+        self.error = None
+
+    def set(self, **attributes):
+        """Span'a öznitelik ekler"""
+        self.attributes.update(attributes)
+
+    def to_record(self) -> Dict[str, Any]:
+        record = {
+            'trace': self.trace_id,
+            'span': self.span_id,
+            'parent': self.parent_id,
+            'name': self.name,
+            'ts': self.start_us,
+            'dur': (time.perf_counter_ns() - self._started) / 1000,
+            'thread': threading.current_thread().name,
+            'attrs': self.attributes
+        }
+        if self.error:
+            record['error'] = self.error
+        return record
+
+
+class _NoopSpan:
+    """Etkin iz yokken dönen, hiçbir şey yapmayan span"""
+
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+class Tracer:
+    """Span'ları kuyruk üzerinden arka planda dönen JSONL dosyasına yazar"""
+
+    def __init__(self, trace_path: Path, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        self.trace_path = Path(trace_path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._writer = None
+        self._closed = False
+        self.dropped = 0
+
+    def emit(self, span: Span):
+        """Biten span'ı yazılmak üzere kuyruğa atar (disk işlemi yapmaz)"""
+        if self._closed:
+            self.dropped += 1
+            return
+        self._queue.put(span.to_record())
+        if self._writer is None:
+            self._start_writer()
+
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is not None or self._closed:
+                return
+            self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        handler = None
+        try:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(self.trace_path, maxBytes=self.max_bytes,
+                                          backupCount=self.backup_count, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+        except OSError as e:
+            self.logger.error(f"İz dosyası açılamadı, izler yazılmayacak: {e}")
+
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            while record is not None and len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(record)
+            for record in batch:
+                if record is None:
+                    if handler is not None:
+                        handler.close()
+                    return
+                if handler is not None:
+                    line = json.dumps(record, ensure_ascii=False, default=str)
+                    handler.emit(logging.makeLogRecord({'msg': line, 'args': None}))
+
+    def close(self):
+        """Kuyruktaki span'ları yazar ve dosyayı kapatır"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+        if writer is not None:
+            self._queue.put(None)
+            writer.join(timeout=5)
+
+
+_default_tracer: Optional[Tracer] = None
+_tracer_initialized = False
+_default_lock = threading.Lock()
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Uygulama genelinde paylaşılan izleyici (TRACE_ENABLED false ise None)"""
+    global _default_tracer, _tracer_initialized
+    if _tracer_initialized:
+        return _default_tracer
+    with _default_lock:
+        if not _tracer_initialized:
+            config = Config()
+            if config.TRACE_ENABLED:
+                _default_tracer = Tracer(config.TRACE_FILE, config.TRACE_MAX_MB * 1024 * 1024,
+                                         config.TRACE_BACKUP_COUNT)
+            _tracer_initialized = True
+    return _default_tracer
+
+
+@contextmanager
+def _run_span(span: Span, tracer: Tracer) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.emit(span)
+
+
+@contextmanager
+def start_trace(name: str, /, **attributes) -> Iterator[Any]:
+    """Yeni bir iz başlatır (kök span); izleme kapalıysa hiçbir şey yapmaz"""
+    tracer = get_tracer()
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    with _run_span(Span(_new_id(), None, name, attributes), tracer) as span:
+        yield span
+
+
+@contextmanager
+def span(name: str, /, **attributes) -> Iterator[Any]:
+    """Etkin izin altında bir span açar; etkin iz yoksa hiçbir şey yapmaz"""
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    with _run_span(Span(parent.trace_id, parent.span_id, name, attributes), get_tracer()) as child:
+        yield child
+
+
+def annotate(**attributes):
+    """Etkin span'a öznitelik ekler (yoksa yok sayılır)"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace_id if current is not None else None
+
+
+def shutdown():
+    """Bekleyen izleri diske yazar"""
+    tracer = _default_tracer
+    if tracer is not None:
+        tracer.close()
+
+
+def read_spans(paths: List[Path]) -> List[Dict[str, Any]]:
+    """JSONL iz dosyalarını okur (bozuk satırlar atlanır)"""
+    spans = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        spans.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            logger.warning(f"İz dosyası bulunamadı: {path}")
+    return spans
+
+
+def to_chrome_trace(spans: List[Dict[str, Any]], min_duration: float = 0.0,
+                    trace_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Span'ları Chrome trace event biçimine çevirir; her iz (dosya) ayrı bir
+    süreç satırı olarak gösterilir.
+
+    Args:
+        min_duration: Kök span'ı bundan kısa (saniye) izler atlanır
+        trace_id: Verilirse sadece bu iz
+    """
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for record in spans:
+        if trace_id is None or record.get('trace') == trace_id:
+            traces.setdefault(record.get('trace'), []).append(record)
+
+    events = []
+    for pid, (trace, records) in enumerate(sorted(traces.items(), key=lambda item: min(r['ts'] for r in item[1])), start=1):
+        root = next((record for record in records if record.get('parent') is None), None)
+        if root is not None and root['dur'] < min_duration * 1_000_000:
+            continue
+        label = Path(str((root or {}).get('attrs', {}).get('path', trace))).name
+        events.append({'ph': 'M', 'name': 'process_name', 'pid': pid, 'args': {'name': f"{label} [{trace}]"}})
+
+        thread_ids: Dict[str, int] = {}
+        for record in records:
+            thread = record.get('thread') or 'main'
+            if thread not in thread_ids:
+                thread_ids[thread] = len(thread_ids) + 1
+                events.append({'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': thread_ids[thread],
+                               'args': {'name': thread}})
+            args = dict(record.get('attrs') or {})
+            args.update(span=record['span'], parent=record.get('parent'))
+            if record.get('error'):
+                args['error'] = record['error']
+            events.append({'ph': 'X', 'name': record['name'], 'cat': 'desktop_organizer',
+                           'ts': record['ts'], 'dur': record['dur'], 'pid': pid,
+                           'tid': thread_ids[thread], 'args': args})
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def _default_trace_files() -> List[Path]:
+    """Yapılandırılmış iz dosyası ve yedekleri (eskiden yeniye)"""
+    config = Config()
+    trace_file = Path(config.TRACE_FILE)
+    backups = [Path(f"{trace_file}.{index}") for index in range(config.TRACE_BACKUP_COUNT, 0, -1)]
+    return [path for path in backups if path.exists()] + [trace_file]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL izlerini Chrome/Perfetto biçimine çevirir")
+    parser.add_argument('inputs', nargs='*', type=Path, help='İz dosyaları (varsayılan: TRACE_FILE ve yedekleri)')
+    parser.add_argument('--output', '-o', type=Path, default=Path('trace.json'), help='Yazılacak Chrome trace dosyası')
+    parser.add_argument('--min-duration', type=float, default=0.0, help='Sadece bu kadar saniyeden uzun süren dosyalar')
+    parser.add_argument('--trace', default=None, help='Sadece bu iz kimliği')
+    args = parser.parse_args()
+
+    spans = read_spans(args.inputs or _default_trace_files())
+    chrome_trace = to_chrome_trace(spans, args.min_duration, args.trace)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace, f, ensure_ascii=False)
+    files = sum(1 for event in chrome_trace['traceEvents'] if event['name'] == 'process_name')
+    print(f"{len(spans)} span okundu, {files} dosyanın izi yazıldı: {args.output}")
+    print("Açmak için: chrome://tracing veya https://ui.perfetto.dev")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,16 @@ Yardımcı fonksiyonlar
 """
 
 import os
+import time
+import shutil
 import logging
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+import tracing
+
 def setup_logging():
     """Loglama sistemini kur"""
     # Logs klasörünü oluştur
@@ -45,20 +51,21 @@ def create_directories(categories):
     
     return created_dirs
 
+def format_size(size):
+    """Bayt cinsinden boyutu okunabilir formatta döndür"""
+    if size < 1024:
+        return f"{size} B"
+    elif size < 1024 * 1024:
+        return f"{size/1024:.1f} KB"
+    elif size < 1024 * 1024 * 1024:
+        return f"{size/(1024*1024):.1f} MB"
+    else:
+        return f"{size/(1024*1024*1024):.1f} GB"
+
 def get_file_size_readable(file_path):
     """Dosya boyutunu okunabilir formatta döndür"""
     try:
-        size = os.path.getsize(file_path)
-        
-        # Byte cinsinden boyut
-        if size < 1024:
-            return f"{size} B"
-        elif size < 1024 * 1024:
-            return f"{size/1024:.1f} KB"
-        elif size < 1024 * 1024 * 1024:
-            return f"{size/(1024*1024):.1f} MB"
-        else:
-            return f"{size/(1024*1024*1024):.1f} GB"
+        return format_size(os.path.getsize(file_path))
     except:
         return "Bilinmiyor"
 
@@ -75,3 +82,26 @@ def is_hidden_file(file_path):
     
     return False
 
+
+@contextmanager
+def temporary_copy(file_path):
+    """
+    Dosyanın geçici bir kopyasını oluşturur ve yolunu verir (kilitleme önlemi).
+    Blok bitince kopya silinir.
+    """
+    file_path = Path(file_path)
+    # Orijinal dosyanın uzantısını kullanarak tempfile oluştur
+    with tracing.span('temp_copy', bytes=file_path.stat().st_size):
+        with tempfile.NamedTemporaryFile(suffix=file_path.suffix, delete=False) as temp_file:
+            shutil.copy2(str(file_path), temp_file.name)
+            temp_path = temp_file.name
+    
+    try:
+        yield temp_path
+    finally:
+        try:
+            # Dosya handle'ının tamamen bırakıldığından emin olmak için küçük bir gecikme
+            time.sleep(0.05)
+            Path(temp_path).unlink()
+        except OSError as os_err:
+            logging.getLogger(__name__).warning(f"Geçici dosya silinirken hata oluştu ({temp_path}): {os_err}")
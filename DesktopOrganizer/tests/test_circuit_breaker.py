@@ -0,0 +1,56 @@
+"""CircuitBreaker yarı açık deneme isteği testleri"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from ai_renamer import AsyncAIClient, CircuitBreaker
+
+
+def open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_half_open_allows_single_probe():
+    breaker = open_breaker()
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()  # deneme sürerken ikinci istek reddedilir
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_cancelled_probe_releases_half_open_slot():
+    breaker = open_breaker()
+    config = SimpleNamespace(AI_MAX_IN_FLIGHT=1, AI_MAX_RETRIES=0, AI_HEDGE_ENABLED=False,
+                             AI_HEDGE_DELAY=0, AI_BATCH_WINDOW=0, AI_BATCH_MAX_FILES=1)
+    renamer = SimpleNamespace(
+        config=config,
+        breaker=breaker,
+        usage=SimpleNamespace(is_budget_exhausted=lambda: False),
+        estimate_input_tokens=lambda snippet: 1,
+    )
+    client = AsyncAIClient(renamer)
+    
+    async def hang(snippet, file_type, estimated_tokens):
+        await asyncio.sleep(3600)
+    client._call_once = hang
+    
+    async def cancel_probe():
+        task = asyncio.ensure_future(client._request("fatura", "pdf"))
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    started = time.monotonic()
+    asyncio.run(cancel_probe())
+    assert time.monotonic() - started < 5
+    assert breaker.allow_request()  # iptal edilen deneme yeri kilitli bırakmadı
@@ -0,0 +1,18 @@
+"""Çıkarıcı kaydı giriş noktası testleri"""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import extractor_registry
+from extractor_registry import ExtractorRegistry, ExtractorSpec
+
+
+def test_entry_point_overrides_builtin_on_first_lookup(monkeypatch):
+    plugin = ExtractorSpec('eklenti_pdf', 'eklenti:extract', extensions=['pdf'])
+    monkeypatch.setattr(extractor_registry, 'entry_points',
+                        lambda group: [SimpleNamespace(name='eklenti', load=lambda: plugin)])
+    registry = ExtractorRegistry()
+    registry.register(ExtractorSpec('pdf', 'pdf_extractors:extract_pdf', extensions=['pdf']))
+
+    # Yerleşik eşleşme olsa da giriş noktaları önce taranır
+    assert registry.find(Path('rapor.pdf')) is plugin
@@ -0,0 +1,234 @@
+"""MoveJournal kurtarma ve geri alma testleri"""
+
+import os
+import shutil
+import threading
+
+import pytest
+
+from move_journal import MoveJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = MoveJournal(tmp_path / "journal.jsonl", retention_days=0)
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    desktop = tmp_path / "Desktop"
+    target_dir = tmp_path / "Belgeler"
+    desktop.mkdir()
+    target_dir.mkdir()
+    return desktop, target_dir
+
+
+def write(path, content):
+    path.write_bytes(content)
+    return path
+
+
+def phases(journal):
+    return {op['id']: op['phase'] for op in journal.read_operations()}
+
+
+def test_overwrite_move_interrupted_before_replace_keeps_both_files(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"yeni")
+    target = write(target_dir / "rapor.pdf", b"eski")
+    op_id = journal.begin('move', source, target)  # os.replace'ten önce çöktü
+
+    counts = journal.recover()
+
+    assert counts['rolled_back'] == 1
+    assert source.read_bytes() == b"yeni"
+    assert target.read_bytes() == b"eski"
+    assert phases(journal)[op_id] == 'rolled_back'
+
+
+def test_overwrite_move_interrupted_after_replace_is_recovered(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"yeni")
+    target = write(target_dir / "rapor.pdf", b"eski")
+    journal.begin('move', source, target)
+    os.replace(source, target)
+
+    assert journal.recover()['recovered'] == 1
+    assert target.read_bytes() == b"yeni"
+
+
+def test_cross_device_move_with_complete_copy_removes_source(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"icerik" * 100)
+    target = target_dir / "rapor.pdf"
+    journal.begin('move', source, target)
+    shutil.copy2(source, target)  # kopya bitti, kaynak silinmeden çöktü
+
+    assert journal.recover()['recovered'] == 1
+    assert not source.exists()
+    assert target.read_bytes() == b"icerik" * 100
+
+
+def test_cross_device_move_with_partial_copy_removes_only_new_target(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"icerik" * 100)
+    target = target_dir / "rapor.pdf"
+    journal.begin('move', source, target)
+    write(target, b"icerik")  # yarım kopya
+
+    assert journal.recover()['rolled_back'] == 1
+    assert source.read_bytes() == b"icerik" * 100
+    assert not target.exists()
+
+
+def test_overwrite_copy_interrupted_keeps_existing_target(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"yeni")
+    target = write(target_dir / "rapor.pdf", b"eski")
+    journal.begin('copy', source, target)
+
+    assert journal.recover()['rolled_back'] == 1
+    assert target.read_bytes() == b"eski"
+    assert source.read_bytes() == b"yeni"
+
+
+def test_overwrite_interrupted_mid_write_touches_nothing(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"yeni icerik")
+    target = write(target_dir / "rapor.pdf", b"eski")
+    journal.begin('move', source, target)
+    write(target, b"ye")  # hedef yerinde kesilmiş (aynı inode)
+
+    assert journal.recover()['lost'] == 1
+    assert source.read_bytes() == b"yeni icerik"
+    assert target.exists()
+
+
+def test_recover_skipped_while_another_journal_is_open(tmp_path, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"icerik" * 100)
+    target = target_dir / "rapor.pdf"
+    running = MoveJournal(tmp_path / "journal.jsonl")
+    other = MoveJournal(tmp_path / "journal.jsonl")
+    try:
+        running.begin('move', source, target)
+        write(target, b"icerik")  # izleyici hâlâ kopyalıyor
+
+        assert other.recover()['skipped'] is True
+        assert target.exists()
+        assert source.exists()
+    finally:
+        running.close()
+        other.close()
+
+
+def test_undo_restores_moved_file(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"icerik")
+    target = target_dir / "rapor.pdf"
+    journal.wrap('move', os.replace)(source, target)
+
+    result = journal.undo(last=1)
+
+    assert result['undone'] == 1
+    assert source.read_bytes() == b"icerik"
+    assert not target.exists()
+
+
+def test_undo_dry_run_changes_nothing(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"icerik")
+    target = target_dir / "rapor.pdf"
+    journal.wrap('move', os.replace)(source, target)
+
+    result = journal.undo(last=1, dry_run=True)
+
+    assert len(result['operations']) == 1
+    assert target.exists()
+    assert not source.exists()
+
+
+class FakeDedupIndex:
+    def __init__(self, duplicate):
+        self.duplicate = duplicate
+
+    def find_duplicate(self, source):
+        return self.duplicate
+
+    def add(self, path, source=None):
+        pass
+
+
+def test_undo_of_dedup_hardlink_move_restores_desktop_file(journal, dirs, monkeypatch):
+    import logging
+    import move_journal
+    from file_manager import FileManager
+    from name_index import NameIndex
+
+    desktop, target_dir = dirs
+    duplicate = write(target_dir / "fatura.pdf", b"ayni icerik")
+    source = write(desktop / "fatura_kopya.pdf", b"ayni icerik")
+    monkeypatch.setattr(move_journal, '_default_journal', journal)
+
+    manager = FileManager.__new__(FileManager)
+    manager.config = type('config', (), {'DEDUP_POLICY': 'hardlink'})()
+    manager.logger = logging.getLogger(__name__)
+    manager.name_index = NameIndex()
+    manager.dedup_index = FakeDedupIndex(duplicate)
+
+    result = manager._apply_dedup_policy(source, target_dir, remove_source=True)
+    assert result['success'] and not source.exists()
+    assert os.path.samefile(result['target'], duplicate)
+
+    assert journal.undo(last=1)['undone'] == 1
+    assert source.read_bytes() == b"ayni icerik"
+    assert duplicate.read_bytes() == b"ayni icerik"
+    assert not result['target'].exists()
+
+
+def test_undo_skips_reshard_moves_and_follows_them(journal, dirs):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"icerik")
+    flat = target_dir / "rapor.pdf"
+    sharded = target_dir / "2024" / "rapor.pdf"
+    sharded.parent.mkdir()
+    journal.wrap('move', os.replace)(source, flat)
+    journal.wrap('reshard', os.replace)(flat, sharded)
+
+    result = journal.undo(since=0)
+
+    assert [op['op'] for op in result['operations']] == ['move']
+    assert result['undone'] == 1
+    assert source.read_bytes() == b"icerik"
+    assert not sharded.exists() and not flat.exists()
+
+
+def test_append_does_not_wait_for_group_fsync(tmp_path, dirs, monkeypatch):
+    desktop, target_dir = dirs
+    source = write(desktop / "rapor.pdf", b"icerik")
+    journal = MoveJournal(tmp_path / "journal.jsonl", group_commit_interval=0.01,
+                          group_commit_records=1, retention_days=0)
+    fsync_started = threading.Event()
+    release_fsync = threading.Event()
+    real_fsync = os.fsync
+
+    def slow_fsync(fd):
+        fsync_started.set()
+        release_fsync.wait(5)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, 'fsync', slow_fsync)
+    try:
+        journal.begin('move', source, target_dir / "rapor.pdf")
+        assert fsync_started.wait(5)
+        # Arka plan fsync'i sürerken ekleme kilitte beklememeli
+        appended = threading.Thread(target=journal.begin, args=('move', source, target_dir / "rapor2.pdf"))
+        appended.start()
+        appended.join(1)
+        assert not appended.is_alive()
+    finally:
+        release_fsync.set()
+        journal.close()
+    assert len(journal.read_operations()) == 2
@@ -0,0 +1,47 @@
+"""Plan dosyası doğrulama testleri"""
+
+import os
+
+import pytest
+
+from plan_file import fingerprint, validate_entries
+
+
+def entry(source, name=None, category='Belgeler', line=2):
+    size, mtime_ns = fingerprint(source)
+    return {'source': source, 'category': category, 'name': name, 'action': 'move',
+            'size': size, 'mtime_ns': mtime_ns, 'line': line}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "rapor.pdf"
+    path.write_bytes(b"icerik")
+    return path
+
+
+@pytest.mark.parametrize('name', ['../../.bashrc', 'alt/rapor.pdf', '..', '.', 42, ['rapor.pdf']])
+def test_name_with_directory_component_is_invalid(source, name):
+    valid, skipped = validate_entries([entry(source, name)], ['Belgeler'])
+    assert valid == []
+    assert skipped['invalid'] == 1
+
+
+@pytest.mark.skipif(os.altsep is None, reason="yalnız alternatif ayırıcı olan sistemlerde")
+def test_name_with_altsep_is_invalid(source):
+    valid, _ = validate_entries([entry(source, f"alt{os.altsep}rapor.pdf")], ['Belgeler'])
+    assert valid == []
+
+
+def test_plain_or_empty_name_is_valid(source, tmp_path):
+    other = tmp_path / "fatura.pdf"
+    other.write_bytes(b"fatura")
+    valid, _ = validate_entries([entry(source, '2024_rapor.pdf'), entry(other, None)], ['Belgeler'])
+    assert len(valid) == 2
+
+
+def test_last_row_per_source_wins(source):
+    rows = [entry(source, 'yerel_tahmin.pdf', line=2), entry(source, 'ai_ismi.pdf', line=3)]
+    valid, skipped = validate_entries(rows, ['Belgeler'])
+    assert [row['name'] for row in valid] == ['ai_ismi.pdf']
+    assert skipped == {'missing': 0, 'changed': 0, 'invalid': 0}